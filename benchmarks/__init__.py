@@ -0,0 +1 @@
+"""Performance benchmarks for Wyoming (not run by tests)."""
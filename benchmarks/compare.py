@@ -0,0 +1,96 @@
+"""Compare benchmark results against a baseline and flag regressions.
+
+Exits with status 1 if any benchmark is slower than the baseline by more
+than the threshold.
+
+Run with: python3 -m benchmarks.compare benchmarks/baseline.json results.json
+"""
+import argparse
+import json
+import sys
+from typing import Any, Dict, List, Tuple
+
+DEFAULT_THRESHOLD = 0.1
+"""Fraction slower than baseline that counts as a regression."""
+
+
+def compare(
+    baseline: Dict[str, Any], results: Dict[str, Any], threshold: float
+) -> Tuple[List[Dict[str, Any]], List[str]]:
+    """Compare microseconds per operation of each benchmark.
+
+    Returns a row for each benchmark in both files and the names of
+    regressions.
+    """
+    rows: List[Dict[str, Any]] = []
+    regressions: List[str] = []
+    baseline_benchmarks = baseline["benchmarks"]
+
+    for name, result in results["benchmarks"].items():
+        baseline_result = baseline_benchmarks.get(name)
+        if baseline_result is None:
+            continue
+
+        baseline_us = baseline_result["us_per_op"]
+        result_us = result["us_per_op"]
+        change = (result_us - baseline_us) / baseline_us if baseline_us > 0 else 0.0
+        is_regression = change > threshold
+        if is_regression:
+            regressions.append(name)
+
+        rows.append(
+            {
+                "name": name,
+                "baseline_us": baseline_us,
+                "result_us": result_us,
+                "change": change,
+                "regression": is_regression,
+            }
+        )
+
+    return rows, regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("baseline", help="Path to baseline JSON")
+    parser.add_argument("results", help="Path to results JSON")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="Fraction slower than baseline that counts as a regression",
+    )
+    args = parser.parse_args()
+
+    with open(args.baseline, "r", encoding="utf-8") as baseline_file:
+        baseline = json.load(baseline_file)
+
+    with open(args.results, "r", encoding="utf-8") as results_file:
+        results = json.load(results_file)
+
+    rows, regressions = compare(baseline, results, args.threshold)
+
+    name_width = max((len(row["name"]) for row in rows), default=0)
+    for row in rows:
+        print(
+            f"{row['name']:<{name_width}}  "
+            f"{row['baseline_us']:>10.2f} us  "
+            f"{row['result_us']:>10.2f} us  "
+            f"{row['change']:>+7.1%}" + ("  REGRESSION" if row["regression"] else "")
+        )
+
+    missing = sorted(set(baseline["benchmarks"]) - set(results["benchmarks"]))
+    if missing:
+        print(f"Not in results: {', '.join(missing)}", file=sys.stderr)
+
+    if regressions:
+        print(
+            f"{len(regressions)} regression(s) above {args.threshold:.0%}",
+            file=sys.stderr,
+        )
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Benchmark encoding/decoding a Piper-sized info message.
+
+Run with: python3 -m benchmarks.info
+"""
+import argparse
+import json
+import timeit
+
+from wyoming.event import Event, encode_event
+from wyoming.info import (
+    Attribution,
+    Info,
+    InfoCache,
+    TtsProgram,
+    TtsVoice,
+    TtsVoiceSpeaker,
+)
+
+_LANGUAGES = ["en_US", "en_GB", "de_DE", "fr_FR", "es_ES", "it_IT", "nl_NL", "ru_RU"]
+
+
+def make_piper_info(num_voices: int = 500, num_speakers: int = 4) -> Info:
+    """Create info for a TTS service with a large voice catalog."""
+    attribution = Attribution(name="rhasspy", url="https://github.com/rhasspy/piper")
+    voices = [
+        TtsVoice(
+            name=f"{_LANGUAGES[i % len(_LANGUAGES)]}-voice_{i}-medium",
+            attribution=attribution,
+            installed=(i % 10) == 0,
+            description=f"Voice number {i} trained on a public domain dataset",
+            version="1.0.0",
+            languages=[_LANGUAGES[i % len(_LANGUAGES)]],
+            speakers=(
+                [TtsVoiceSpeaker(name=f"speaker_{j}") for j in range(num_speakers)]
+                if (i % 3) == 0
+                else None
+            ),
+        )
+        for i in range(num_voices)
+    ]
+
+    return Info(
+        tts=[
+            TtsProgram(
+                name="piper",
+                attribution=attribution,
+                installed=True,
+                description="A fast, local neural text to speech system",
+                version="1.2.0",
+                voices=voices,
+            )
+        ]
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--voices", type=int, default=500)
+    parser.add_argument("--number", type=int, default=100)
+    args = parser.parse_args()
+
+    info = make_piper_info(args.voices)
+    info_event = info.event()
+    info_cache = InfoCache(info)
+
+    # Simulate event that was received over the wire
+    received_event = Event.from_dict(json.loads(json.dumps(info_event.to_dict())))
+
+    results = {
+        "voices": args.voices,
+        "info_event_ms": timeit.timeit(info.event, number=args.number)
+        * 1000
+        / args.number,
+        "info_encode_ms": timeit.timeit(
+            lambda: encode_event(info.event()), number=args.number
+        )
+        * 1000
+        / args.number,
+        "info_cache_ms": timeit.timeit(
+            lambda: info_cache.event_bytes, number=args.number
+        )
+        * 1000
+        / args.number,
+        "info_from_event_ms": timeit.timeit(
+            lambda: Info.from_event(received_event), number=args.number
+        )
+        * 1000
+        / args.number,
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
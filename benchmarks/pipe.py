@@ -0,0 +1,102 @@
+"""Benchmark synchronous event reading/writing over a pipe.
+
+Compares flushing after every event with writing batches of events, and
+buffered with unbuffered (partial) reads of large payloads.
+
+Run with: python3 -m benchmarks.pipe
+"""
+import argparse
+import json
+import os
+import threading
+import time
+from typing import Any, BinaryIO, Callable, Dict, List
+
+from wyoming.audio import AudioChunk
+from wyoming.event import Event, read_events, write_event, write_events
+
+
+def _write_each(events: List[Event], writer: BinaryIO) -> None:
+    for event in events:
+        write_event(event, writer)
+
+
+def _write_batches(events: List[Event], writer: BinaryIO, batch_size: int) -> None:
+    for i in range(0, len(events), batch_size):
+        write_events(events[i : i + batch_size], writer)
+
+
+def _benchmark(
+    events: List[Event],
+    write: Callable[[List[Event], BinaryIO], None],
+    read_buffering: int = -1,
+) -> Dict[str, Any]:
+    read_fd, write_fd = os.pipe()
+    num_bytes = sum(len(event.payload or b"") for event in events)
+
+    def write_all() -> None:
+        with os.fdopen(write_fd, "wb") as writer:
+            write(events, writer)
+
+    writer_thread = threading.Thread(target=write_all, daemon=True)
+
+    start_time = time.perf_counter()
+    writer_thread.start()
+    with os.fdopen(read_fd, "rb", buffering=read_buffering) as reader:
+        num_events = sum(1 for _event in read_events(reader))  # type: ignore[arg-type]
+
+    seconds = time.perf_counter() - start_time
+    writer_thread.join()
+    assert num_events == len(events)
+
+    return {
+        "events_per_sec": num_events / seconds,
+        "mb_per_sec": (num_bytes / seconds) / 1e6,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--count", type=int, default=50000)
+    parser.add_argument(
+        "--samples", type=int, default=1024, help="Samples per audio chunk"
+    )
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument(
+        "--large-count", type=int, default=20, help="Number of large payloads"
+    )
+    parser.add_argument(
+        "--large-bytes", type=int, default=16 * 1024 * 1024, help="Large payload size"
+    )
+    args = parser.parse_args()
+
+    chunk_events = [
+        AudioChunk(
+            rate=16000, width=2, channels=1, audio=bytes(args.samples * 2), timestamp=i
+        ).event()
+        for i in range(args.count)
+    ]
+    large_events = [
+        Event(type="large", payload=bytes(args.large_bytes))
+        for _ in range(args.large_count)
+    ]
+
+    def write_batches(events: List[Event], writer: BinaryIO) -> None:
+        _write_batches(events, writer, args.batch_size)
+
+    results: Dict[str, Any] = {
+        "count": args.count,
+        "chunk_bytes": args.samples * 2,
+        "batch_size": args.batch_size,
+        "chunks_flush_each": _benchmark(chunk_events, _write_each),
+        "chunks_batched": _benchmark(chunk_events, write_batches),
+        "large_bytes": args.large_bytes,
+        "large_buffered": _benchmark(large_events, write_batches),
+        "large_unbuffered": _benchmark(large_events, write_batches, read_buffering=0),
+    }
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
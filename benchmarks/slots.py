@@ -0,0 +1,79 @@
+"""Benchmark memory and construction time of slotted event classes.
+
+Run with: python3 -m benchmarks.slots
+"""
+import argparse
+import json
+import timeit
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional
+
+from wyoming.audio import AudioChunk
+from wyoming.event import Event
+
+# 10 ms of 16Khz 16-bit mono audio
+_AUDIO = bytes(320)
+
+
+@dataclass
+class DictEvent:
+    """Event without __slots__."""
+
+    type: str
+    data: Dict[str, Any] = field(default_factory=dict)
+    payload: Optional[bytes] = None
+
+
+@dataclass
+class DictAudioChunk:
+    """AudioChunk without __slots__."""
+
+    rate: int
+    width: int
+    channels: int
+    audio: bytes
+    timestamp: Optional[int] = None
+
+
+def _measure(make_object: Callable[[], Any], count: int) -> Dict[str, float]:
+    tracemalloc.start()
+    objects = [make_object() for _ in range(count)]
+    size, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # Exclude list of objects itself
+    size -= objects.__sizeof__()
+    del objects
+
+    seconds = timeit.timeit(make_object, number=count)
+
+    return {
+        "bytes_per_instance": size / count,
+        "construct_ns": (seconds / count) * 1e9,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--count", type=int, default=100000)
+    args = parser.parse_args()
+
+    results = {
+        "count": args.count,
+        "event": {
+            "before": _measure(lambda: DictEvent("audio-chunk"), args.count),
+            "after": _measure(lambda: Event("audio-chunk"), args.count),
+        },
+        "audio_chunk": {
+            "before": _measure(
+                lambda: DictAudioChunk(16000, 2, 1, _AUDIO, 0), args.count
+            ),
+            "after": _measure(lambda: AudioChunk(16000, 2, 1, _AUDIO, 0), args.count),
+        },
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+"""Micro-benchmarks of the protocol's hot paths, for tracking regressions.
+
+Each benchmark times a fixed number of operations on realistic inputs, and
+the best of several rounds is reported in microseconds per operation.
+Compare a run against benchmarks/baseline.json with benchmarks.compare.
+Timings depend on the machine, so regenerate the baseline (--output
+benchmarks/baseline.json) on the machine that runs the comparison.
+
+Run with: python3 -m benchmarks.suite --output results.json
+"""
+import argparse
+import asyncio
+import json
+import platform
+import statistics
+import sys
+import time
+from typing import Any, Callable, Dict, List
+
+from wyoming import pyaudioop
+from wyoming.asr import Transcript
+from wyoming.audio import AudioChunk, AudioChunkConverter
+from wyoming.event import Event, async_read_event, async_write_event, encode_event
+from wyoming.info import TtsProgram, TtsVoice
+
+from .info import make_piper_info
+
+# 1024 samples of 16Khz 16-bit mono audio (default chunk size)
+_CHUNK_AUDIO = bytes(1024 * 2)
+
+# 20 ms of 48Khz 16-bit stereo audio (typical microphone input)
+_MIC_AUDIO = bytes(960 * 2 * 2)
+
+# Large payload (e.g., a synthesized WAV file)
+_LARGE_PAYLOAD = bytes(1024 * 1024)
+
+Benchmark = Callable[[int], float]
+"""Runs an operation a number of times and returns the seconds taken."""
+
+
+class _NullWriter:
+    """Stream writer that discards data."""
+
+    def __init__(self) -> None:
+        self.num_bytes = 0
+
+    def write(self, data: bytes) -> None:
+        self.num_bytes += len(data)
+
+    async def drain(self) -> None:
+        pass
+
+
+def _time_async_read(event: Event) -> Benchmark:
+    event_bytes = encode_event(event)
+
+    def run(number: int) -> float:
+        async def read_all() -> float:
+            reader = asyncio.StreamReader(limit=2 * len(event_bytes))
+            reader.feed_data(event_bytes * number)
+            reader.feed_eof()
+
+            start_time = time.perf_counter()
+            for _ in range(number):
+                await async_read_event(reader)
+
+            return time.perf_counter() - start_time
+
+        return asyncio.run(read_all())
+
+    return run
+
+
+def _time_async_write(event: Event) -> Benchmark:
+    def run(number: int) -> float:
+        async def write_all() -> float:
+            writer = _NullWriter()
+
+            start_time = time.perf_counter()
+            for _ in range(number):
+                await async_write_event(event, writer)  # type: ignore[arg-type]
+
+            return time.perf_counter() - start_time
+
+        return asyncio.run(write_all())
+
+    return run
+
+
+def _time_sync(operation: Callable[[], Any]) -> Benchmark:
+    def run(number: int) -> float:
+        start_time = time.perf_counter()
+        for _ in range(number):
+            operation()
+
+        return time.perf_counter() - start_time
+
+    return run
+
+
+def _time_convert(converter: AudioChunkConverter, chunk: AudioChunk) -> Benchmark:
+    return _time_sync(lambda: converter.convert(chunk))
+
+
+def _time_ratecv(audio: bytes, inrate: int, outrate: int) -> Benchmark:
+    def run(number: int) -> float:
+        state = None
+        start_time = time.perf_counter()
+        for _ in range(number):
+            _, state = pyaudioop.ratecv(audio, 2, 1, inrate, outrate, state)
+
+        return time.perf_counter() - start_time
+
+    return run
+
+
+def make_benchmarks() -> Dict[str, Benchmark]:
+    """Create all benchmarks by name."""
+    chunk = AudioChunk(rate=16000, width=2, channels=1, audio=_CHUNK_AUDIO, timestamp=0)
+    mic_chunk = AudioChunk(rate=48000, width=2, channels=2, audio=_MIC_AUDIO)
+    large_event = Event(type="audio-chunk", payload=_LARGE_PAYLOAD)
+    transcript_event = Transcript(text="turn on the living room lights").event()
+    info_dict = make_piper_info().to_dict()
+    program_dict = info_dict["tts"][0]
+    voice_dict = program_dict["voices"][0]
+
+    return {
+        "read_event.audio_chunk": _time_async_read(chunk.event()),
+        "read_event.transcript": _time_async_read(transcript_event),
+        "read_event.large_payload": _time_async_read(large_event),
+        "write_event.audio_chunk": _time_async_write(chunk.event()),
+        "write_event.transcript": _time_async_write(transcript_event),
+        "write_event.large_payload": _time_async_write(large_event),
+        "convert.unchanged": _time_convert(
+            AudioChunkConverter(rate=16000, width=2, channels=1), chunk
+        ),
+        "convert.48k_stereo_to_16k_mono": _time_convert(
+            AudioChunkConverter(rate=16000, width=2, channels=1), mic_chunk
+        ),
+        "ratecv.22050_to_16000": _time_ratecv(_CHUNK_AUDIO, 22050, 16000),
+        "ratecv.16000_to_48000": _time_ratecv(_CHUNK_AUDIO, 16000, 48000),
+        "from_dict.voice": _time_sync(lambda: TtsVoice.from_dict(voice_dict)),
+        "from_dict.program_500_voices": _time_sync(
+            lambda: TtsProgram.from_dict(program_dict)
+        ),
+    }
+
+
+def run_benchmark(
+    benchmark: Benchmark, repeat: int, min_seconds: float
+) -> Dict[str, Any]:
+    """Run a benchmark for several rounds and get microseconds per operation."""
+    # Find number of operations that takes at least min_seconds
+    number = 1
+    while True:
+        seconds = benchmark(number)
+        if seconds >= min_seconds:
+            break
+
+        number *= 2 if seconds <= 0 else max(2, int(min_seconds / seconds) + 1)
+
+    rounds_us: List[float] = [(seconds / number) * 1e6]
+    for _ in range(repeat - 1):
+        rounds_us.append((benchmark(number) / number) * 1e6)
+
+    return {
+        "us_per_op": min(rounds_us),
+        "median_us_per_op": statistics.median(rounds_us),
+        "number": number,
+        "rounds": len(rounds_us),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--output", help="Write results to a JSON file")
+    parser.add_argument(
+        "--filter", help="Only run benchmarks whose names contain this text"
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="Rounds per benchmark")
+    parser.add_argument(
+        "--min-seconds", type=float, default=0.1, help="Minimum seconds per round"
+    )
+    args = parser.parse_args()
+
+    results: Dict[str, Any] = {}
+    for name, benchmark in make_benchmarks().items():
+        if args.filter and (args.filter not in name):
+            continue
+
+        results[name] = run_benchmark(benchmark, args.repeat, args.min_seconds)
+        print(f"{name}: {results[name]['us_per_op']:.2f} us", file=sys.stderr)
+
+    report = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "benchmarks": results,
+    }
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output_file:
+            json.dump(report, output_file, indent=2)
+            output_file.write("\n")
+    else:
+        print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""Benchmark audio throughput and latency of shm:// vs unix:// transports.
+
+The server runs in a separate process and echoes every event back.
+
+Run with: python3 -m benchmarks.transport
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict
+
+from wyoming.audio import AudioChunk
+from wyoming.client import AsyncClient
+from wyoming.event import Event
+from wyoming.server import AsyncEventHandler, AsyncServer
+
+
+class EchoHandler(AsyncEventHandler):
+    """Sends every event back to the client."""
+
+    async def handle_event(self, event: Event) -> bool:
+        await self.write_event(event)
+        return True
+
+
+def _run_server(uri: str) -> None:
+    async def run() -> None:
+        server = AsyncServer.from_uri(uri)
+        await server.run(EchoHandler)
+
+    asyncio.run(run())
+
+
+async def _benchmark(uri: str, chunk: AudioChunk, count: int) -> Dict[str, Any]:
+    async with AsyncClient.from_uri(uri) as client:
+        # Latency (one chunk at a time)
+        round_trips = []
+        for _ in range(count // 10):
+            start_time = time.perf_counter()
+            await client.write_event(chunk.event())
+            await client.read_event()
+            round_trips.append(time.perf_counter() - start_time)
+
+        # Throughput (pipelined)
+        async def write_chunks() -> None:
+            for _ in range(count):
+                await client.write_event(chunk.event())
+
+        async def read_chunks() -> None:
+            for _ in range(count):
+                await client.read_event()
+
+        start_time = time.perf_counter()
+        await asyncio.gather(write_chunks(), read_chunks())
+        seconds = time.perf_counter() - start_time
+
+    num_bytes = 2 * count * len(chunk.audio)
+    return {
+        "latency_us": statistics.median(round_trips) * 1e6,
+        "events_per_sec": (2 * count) / seconds,
+        "mb_per_sec": (num_bytes / seconds) / 1e6,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--count", type=int, default=10000)
+    parser.add_argument(
+        "--samples", type=int, default=1024, help="Samples per audio chunk"
+    )
+    parser.add_argument("--channels", type=int, default=1)
+    args = parser.parse_args()
+
+    chunk = AudioChunk(
+        rate=16000,
+        width=2,
+        channels=args.channels,
+        audio=bytes(args.samples * 2 * args.channels),
+    )
+
+    results: Dict[str, Any] = {
+        "count": args.count,
+        "chunk_bytes": len(chunk.audio),
+    }
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for scheme in ("unix", "shm"):
+            socket_path = Path(temp_dir) / f"{scheme}.socket"
+            uri = f"{scheme}://{socket_path}"
+            server_process = multiprocessing.Process(
+                target=_run_server, args=(uri,), daemon=True
+            )
+            server_process.start()
+
+            try:
+                while not socket_path.exists():
+                    time.sleep(0.01)
+
+                results[scheme] = asyncio.run(_benchmark(uri, chunk, args.count))
+            finally:
+                server_process.terminate()
+                server_process.join()
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
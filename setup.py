@@ -18,8 +18,11 @@ setup(
     author="Michael Hansen",
     author_email="mike@rhasspy.org",
     license="MIT",
-    packages=["wyoming", "wyoming.util"],
-    package_data={"wyoming": [str(p.relative_to(module_dir)) for p in (version_path,)]},
+    packages=["wyoming", "wyoming.bench", "wyoming.http", "wyoming.util"],
+    package_data={
+        "wyoming": [str(p.relative_to(module_dir)) for p in (version_path,)],
+        "wyoming.http": ["conf/*.yaml"],
+    },
     classifiers=[
         "Development Status :: 3 - Alpha",
         "Intended Audience :: Developers",
@@ -35,5 +38,7 @@ setup(
     extras_require={
         "zeroconf": ["zeroconf==0.88.0"],
         "http": ["Flask==3.0.2", "swagger-ui-py==23.9.23"],
+        "websocket": ["websockets==12.0"],
+        "numpy": ["numpy>=1.20"],
     },
 )
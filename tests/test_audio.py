@@ -1,8 +1,30 @@
 """Test audio utilities."""
+import array
 import io
+import math
+import subprocess
+import sys
 import wave
+from typing import List
 
-from wyoming.audio import AudioChunk, AudioChunkConverter, wav_to_chunks
+import pytest
+
+import wyoming.audio
+from wyoming.audio import (
+    ENCODING_ALAW,
+    ENCODING_IMA_ADPCM,
+    ENCODING_MULAW,
+    SAMPLE_FORMAT_FLOAT,
+    AudioChunk,
+    AudioChunkConverter,
+    AudioDtxFilter,
+    AudioDtxReceiver,
+    AudioRechunker,
+    AudioRingBuffer,
+    AudioStart,
+    get_streaming_wav_header,
+    wav_to_chunks,
+)
 
 
 def test_chunk_converter() -> None:
@@ -45,3 +67,377 @@ def test_wav_to_chunks() -> None:
             assert chunk.width == 2
             assert chunk.channels == 1
             assert len(chunk.audio) == 1000 * 2  # 1000 samples
+
+
+def test_wav_path_to_chunks(tmp_path) -> None:
+    """Test memory-mapped WAV file to audio chunks."""
+    audio_bytes = bytes(range(256)) * 125  # 16000 samples
+    wav_path = tmp_path / "test.wav"
+    wav_write: wave.Wave_write = wave.open(str(wav_path), "wb")
+    with wav_write:
+        wav_write.setframerate(16000)
+        wav_write.setsampwidth(2)
+        wav_write.setnchannels(1)
+        wav_write.writeframes(audio_bytes)
+
+    chunks = list(wav_to_chunks(wav_path, samples_per_chunk=1000, start_event=True))
+    assert isinstance(chunks[0], AudioStart)
+    assert chunks[0].rate == 16000
+
+    audio_chunks = [chunk for chunk in chunks[1:] if isinstance(chunk, AudioChunk)]
+    assert len(audio_chunks) == len(chunks) - 1 == 16
+    for chunk in audio_chunks:
+        assert isinstance(chunk.audio, memoryview)
+
+    # Views are still valid after the file is closed
+    assert b"".join(bytes(chunk.audio) for chunk in audio_chunks) == audio_bytes
+    assert audio_chunks[-1].timestamp == 15 * 62
+
+
+def test_as_array() -> None:
+    """Test numpy views of audio chunks."""
+    np = pytest.importorskip("numpy")
+
+    samples = np.array([0, 16384, -16384, 32767, -32768], dtype=np.int16)
+    chunk = AudioChunk(rate=16000, width=2, channels=1, audio=samples.tobytes())
+
+    # No copy
+    audio_array = chunk.as_array()
+    assert audio_array.dtype == np.int16
+    assert np.array_equal(audio_array, samples)
+    assert np.shares_memory(audio_array, np.frombuffer(chunk.audio, dtype=np.int8))
+
+    # Scaled to [-1, 1]
+    float_array = chunk.as_array(np.float32)
+    assert float_array.dtype == np.float32
+    assert np.allclose(float_array, samples / 32768)
+
+    # Stereo
+    stereo_chunk = AudioChunk(rate=16000, width=2, channels=2, audio=bytes(4 * 10))
+    assert stereo_chunk.as_array().shape == (10, 2)
+
+
+def test_from_array() -> None:
+    """Test creating audio chunks from numpy arrays."""
+    np = pytest.importorskip("numpy")
+
+    samples = np.arange(20, dtype=np.int16).reshape((10, 2))
+    chunk = AudioChunk.from_array(samples, rate=16000, timestamp=10)
+    assert (chunk.width, chunk.channels, chunk.samples) == (2, 2, 10)
+    assert chunk.timestamp == 10
+    assert not chunk.is_float
+    assert bytes(chunk.audio) == samples.tobytes()
+    assert np.array_equal(chunk.as_array(), samples)
+
+    # Float samples are sent as float32 without quantizing
+    float_samples = np.linspace(-1, 1, 100)
+    float_chunk = AudioChunk.from_array(float_samples, rate=16000)
+    assert (float_chunk.width, float_chunk.channels) == (4, 1)
+    assert float_chunk.is_float
+
+    event = float_chunk.event()
+    assert event.data["sample_format"] == SAMPLE_FORMAT_FLOAT
+    received_chunk = AudioChunk.from_event(event)
+    assert received_chunk.is_float
+    assert np.array_equal(received_chunk.as_array(), float_samples.astype(np.float32))
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_float_format(use_numpy: bool, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test float32 sample format with and without numpy."""
+    if use_numpy:
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(wyoming.audio, "get_numpy", lambda: None)
+
+    float_audio = array.array("f", [0.0, 0.5, -0.5, 1.0, -1.0, 2.0])
+    if sys.byteorder != "little":
+        float_audio.byteswap()
+
+    start = AudioStart(
+        rate=16000, width=4, channels=1, sample_format=SAMPLE_FORMAT_FLOAT
+    )
+    assert AudioStart.from_event(start.event()) == start
+
+    # Integer format is not sent for compatibility
+    assert (
+        "sample_format" not in AudioStart(rate=16000, width=2, channels=1).event().data
+    )
+
+    chunk = AudioChunk(
+        rate=16000,
+        width=4,
+        channels=1,
+        audio=float_audio.tobytes(),
+        sample_format=SAMPLE_FORMAT_FLOAT,
+    )
+
+    # Nothing to convert
+    assert AudioChunkConverter().convert(chunk) is chunk
+
+    # Float is converted to integer samples
+    converter = AudioChunkConverter(width=2)
+    int_chunk = converter.convert(chunk)
+    assert (int_chunk.width, int_chunk.sample_format) == (2, None)
+
+    int_audio = array.array("h", int_chunk.audio)
+    if sys.byteorder != "little":
+        int_audio.byteswap()
+
+    assert list(int_audio) == [0, 16384, -16384, 32767, -32768, 32767]
+
+
+def test_rechunker() -> None:
+    """Test splitting audio chunks into fixed-size frames."""
+    # 10 ms frames at 16Khz
+    rechunker = AudioRechunker(samples_per_frame=160)
+    audio = bytes(range(256)) * 40  # 320 ms
+    chunk_sizes = [100, 700, 1024, 2, 4000, 3000, 1414]
+    assert sum(chunk_sizes) == len(audio)
+
+    frames: List[AudioChunk] = []
+    offset = 0
+    for chunk_size in chunk_sizes:
+        # Timestamps are continued from first chunk
+        timestamp = 1000 if offset == 0 else None
+        frames.extend(
+            rechunker.process(
+                AudioChunk(
+                    rate=16000,
+                    width=2,
+                    channels=1,
+                    audio=audio[offset : offset + chunk_size],
+                    timestamp=timestamp,
+                )
+            )
+        )
+        offset += chunk_size
+
+    assert rechunker.flush() is None
+    assert len(frames) == 32
+    assert all(len(frame.audio) == 160 * 2 for frame in frames)
+    assert b"".join(bytes(frame.audio) for frame in frames) == audio
+    assert [frame.timestamp for frame in frames] == list(range(1000, 1320, 10))
+
+    # Leftover audio is padded with silence
+    frames = rechunker.process(
+        AudioChunk(rate=16000, width=2, channels=1, audio=b"\x01" * 400)
+    )
+    assert len(frames) == 1
+    last_frame = rechunker.flush()
+    assert last_frame is not None
+    assert bytes(last_frame.audio) == (b"\x01" * 80) + bytes(240)
+
+
+def test_ring_buffer() -> None:
+    """Test pre-roll audio ring buffer."""
+    # 100 ms at 1Khz, 16-bit mono = 200 bytes
+    ring_buffer = AudioRingBuffer(rate=1000, width=2, channels=1, milliseconds=100)
+    assert not ring_buffer.get_last(50)
+
+    # Write 9 chunks of 30 ms with distinct values
+    for i in range(9):
+        ring_buffer.write(
+            AudioChunk(
+                rate=1000,
+                width=2,
+                channels=1,
+                audio=bytes([i]) * 60,
+                timestamp=5000 + (i * 30),
+            )
+        )
+
+    assert ring_buffer.milliseconds == 100
+
+    # Last 100 ms wraps around the end of the buffer
+    chunks = ring_buffer.get_last(1000)
+    assert len(chunks) == 2
+    assert all(isinstance(chunk.audio, memoryview) for chunk in chunks)
+    audio = b"".join(bytes(chunk.audio) for chunk in chunks)
+    assert audio == (bytes([5]) * 20) + (bytes([6]) * 60) + (bytes([7]) * 60) + (
+        bytes([8]) * 60
+    )
+    assert chunks[0].timestamp == 5170
+
+    # Last 45 ms
+    audio = b"".join(bytes(chunk.audio) for chunk in ring_buffer.get_last(45))
+    assert audio == (bytes([7]) * 30) + (bytes([8]) * 60)
+
+    # Since timestamp of chunk 7
+    chunks = ring_buffer.get_since(5210)
+    assert chunks[0].timestamp == 5210
+    audio = b"".join(bytes(chunk.audio) for chunk in chunks)
+    assert audio == (bytes([7]) * 60) + (bytes([8]) * 60)
+
+    # Timestamp too old
+    assert ring_buffer.get_since(0)[0].timestamp == 5170
+
+    ring_buffer.clear()
+    assert ring_buffer.milliseconds == 0
+    assert not ring_buffer.get_last(100)
+
+
+def test_dtx() -> None:
+    """Test silence suppression and restoring timing on the receiver."""
+    quiet = array.array("h", [10, -10] * 512)  # -70 dBFS
+    loud = array.array("h", [8000, -8000] * 512)  # -12 dBFS
+    if sys.byteorder != "little":
+        quiet.byteswap()
+        loud.byteswap()
+
+    # 64 ms chunks at 16Khz: 2 sec quiet, 512 ms loud, 2 sec quiet
+    chunk_audios = (
+        [quiet.tobytes()] * 32 + [loud.tobytes()] * 8 + [quiet.tobytes()] * 32
+    )
+    dtx_filter = AudioDtxFilter(hangover_ms=128, comfort_interval_ms=500)
+    dtx_receiver = AudioDtxReceiver()
+
+    num_sent = 0
+    received_chunks: List[AudioChunk] = []
+    for i, chunk_audio in enumerate(chunk_audios):
+        chunk = AudioChunk(
+            rate=16000,
+            width=2,
+            channels=1,
+            audio=chunk_audio,
+            timestamp=1000 if i == 0 else None,
+        )
+        for sent_chunk in dtx_filter.process(chunk):
+            num_sent += 1
+            event_chunk = AudioChunk.from_event(sent_chunk.event())
+            received_chunks.extend(dtx_receiver.process(event_chunk))
+
+    # Loud audio + 1 onset chunk + 2 hangover chunks + a few comfort markers
+    assert num_sent < 20
+    assert dtx_filter.is_suppressing
+
+    # Timestamps are continuous
+    timestamp = 1000
+    for received_chunk in received_chunks:
+        assert received_chunk.timestamp == timestamp
+        timestamp += received_chunk.samples // 16
+        assert received_chunk.samples % 16 == 0
+
+    # Loud audio is at the same position
+    received_audio = b"".join(bytes(c.audio) for c in received_chunks)
+    loud_offset = 32 * len(quiet.tobytes())
+    loud_audio = b"".join(chunk_audios[32:40])
+    assert received_audio[loud_offset : loud_offset + len(loud_audio)] == loud_audio
+
+    # Quiet audio before the onset chunk is silence
+    assert received_audio[: loud_offset - len(quiet.tobytes())] == bytes(
+        loud_offset - len(quiet.tobytes())
+    )
+
+    # Received audio covers everything up to the last comfort marker
+    assert len(received_audio) >= (len(chunk_audios) - 9) * len(quiet.tobytes())
+
+
+def test_adpcm_samples_out_of_range() -> None:
+    """Test that the sample count of ADPCM audio must fit in the payload."""
+    event = AudioChunk(
+        rate=16000,
+        width=2,
+        channels=2,
+        audio=bytes(400),
+        encoding=ENCODING_IMA_ADPCM,
+    ).event()
+    assert event.payload is not None
+    assert len(event.payload) == 100
+
+    event.data["samples"] = 100  # payload holds 100 samples per channel
+    assert len(AudioChunk.from_event(event).audio) == 400
+
+    for samples in (101, 2**40, -1):
+        event.data["samples"] = samples
+        with pytest.raises(ValueError):
+            AudioChunk.from_event(event)
+
+
+@pytest.mark.parametrize(
+    "encoding", [ENCODING_MULAW, ENCODING_ALAW, ENCODING_IMA_ADPCM]
+)
+@pytest.mark.parametrize("channels", [1, 2])
+def test_encoding(encoding: str, channels: int) -> None:
+    """Test compressed audio chunk payloads."""
+    # Odd number of samples per channel
+    num_samples = 1001
+    samples = array.array(
+        "h",
+        (
+            int(
+                10000
+                * math.sin((2 * math.pi * 440 * (i // channels) / 16000) + channel)
+            )
+            for i in range(num_samples * channels)
+            for channel in [i % channels]
+        ),
+    )
+    if sys.byteorder != "little":
+        samples.byteswap()
+
+    chunk = AudioChunk(
+        rate=16000,
+        width=2,
+        channels=channels,
+        audio=samples.tobytes(),
+        timestamp=10,
+        encoding=encoding,
+    )
+    event = chunk.event()
+    assert event.data["encoding"] == encoding
+    assert event.payload is not None
+    if encoding == ENCODING_IMA_ADPCM:
+        assert len(event.payload) == ((num_samples + 1) // 2) * channels
+    else:
+        assert len(event.payload) == num_samples * channels
+
+    decoded_chunk = AudioChunk.from_event(event)
+    assert decoded_chunk.encoding == encoding
+    assert (decoded_chunk.width, decoded_chunk.channels) == (2, channels)
+    assert decoded_chunk.timestamp == 10
+
+    decoded_samples = array.array("h", decoded_chunk.audio)
+    if sys.byteorder != "little":
+        decoded_samples.byteswap()
+
+    # Lossy, but close (> 30 dB SNR)
+    assert len(decoded_samples) == len(samples)
+    signal = sum(s * s for s in samples)
+    noise = sum((s - d) ** 2 for s, d in zip(samples, decoded_samples))
+    assert 10 * math.log10(signal / noise) > 30
+
+    # Other sample widths are converted to 16-bit first
+    wide_chunk = AudioChunkConverter(width=4).convert(chunk)
+    assert wide_chunk.width == 4
+    wide_decoded = AudioChunk.from_event(
+        AudioChunk(
+            rate=16000,
+            width=4,
+            channels=channels,
+            audio=wide_chunk.audio,
+            encoding=encoding,
+        ).event()
+    )
+    assert wide_decoded.audio == decoded_chunk.audio
+
+    start = AudioStart(rate=16000, width=2, channels=channels, encoding=encoding)
+    assert AudioStart.from_event(start.event()) == start
+
+
+def test_convert_streamed_wav() -> None:
+    """Test converting a WAV of unknown length through pipes."""
+    audio = bytes(range(256)) * 86  # 11008 frames
+    proc = subprocess.run(
+        [sys.executable, "-m", "wyoming.audio", "--rate", "16000"],
+        input=get_streaming_wav_header(22050, 2, 1) + audio,
+        stdout=subprocess.PIPE,
+        check=True,
+    )
+
+    # Output is also streamed, and all audio is converted
+    assert proc.stdout.startswith(get_streaming_wav_header(16000, 2, 1))
+    with wave.open(io.BytesIO(proc.stdout), "rb") as wav_file:
+        assert wav_file.getframerate() == 16000
+        num_frames = len(wav_file.readframes(11008)) // 2
+        assert abs(num_frames - ((11008 * 16000) // 22050)) <= 2
@@ -0,0 +1,109 @@
+"""Load generator tests."""
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from wyoming.asr import Transcript
+from wyoming.audio import AudioChunk, AudioStart, AudioStop
+from wyoming.bench.load import LoadSettings, percentile, run_load
+from wyoming.event import Event
+from wyoming.server import AsyncEventHandler, AsyncServer
+from wyoming.tts import Synthesize
+
+
+class FakeServiceHandler(AsyncEventHandler):
+    """Transcribes audio as the number of chunks, or synthesizes silence."""
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.num_chunks = 0
+
+    async def handle_event(self, event: Event) -> bool:
+        if AudioChunk.is_type(event.type):
+            self.num_chunks += 1
+        elif AudioStop.is_type(event.type):
+            await self.write_event(Transcript(text=str(self.num_chunks)).event())
+        elif Synthesize.is_type(event.type):
+            await self.write_event(AudioStart(rate=16000, width=2, channels=1).event())
+            await self.write_event(
+                AudioChunk(rate=16000, width=2, channels=1, audio=bytes(3200)).event()
+            )
+            await self.write_event(AudioStop().event())
+
+        return True
+
+
+def test_percentile() -> None:
+    assert percentile([1.0, 2.0, 3.0, 4.0, 5.0], 50) == 3.0
+    assert percentile([1.0, 2.0], 50) == 1.5
+    assert percentile([1.0, 2.0, 3.0], 100) == 3.0
+    assert percentile([7.0], 99) == 7.0
+
+
+@pytest.mark.asyncio
+async def test_run_load() -> None:
+    """Test transcribe and synthesize scenarios against a fake service."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        uri = f"unix://{Path(temp_dir) / 'test.socket'}"
+        server = AsyncServer.from_uri(uri)
+        await server.start(FakeServiceHandler)
+
+        audio_events = (
+            [AudioStart(rate=16000, width=2, channels=1).event()]
+            + [
+                AudioChunk(rate=16000, width=2, channels=1, audio=bytes(320)).event()
+                for _ in range(5)
+            ]
+            + [AudioStop().event()]
+        )
+
+        summary = await run_load(
+            LoadSettings(
+                uri=uri, scenario="transcribe", wav_chunks=[audio_events], speed=0
+            ),
+            num_clients=3,
+            sessions_per_client=2,
+        )
+        assert summary["sessions"] == 6
+        assert not summary["errors"]
+        assert summary["audio_seconds"] == pytest.approx(6 * 5 * 0.01)
+        assert set(summary["latency_ms"]) == {"p50", "p95", "p99", "mean", "max"}
+        assert summary["time_to_first_response_ms"]["p50"] >= 0
+
+        summary = await run_load(
+            LoadSettings(uri=uri, scenario="synthesize"),
+            num_clients=2,
+            sessions_per_client=1,
+        )
+        assert summary["sessions"] == 2
+        assert summary["audio_seconds"] == pytest.approx(2 * 0.1)
+
+        await server.stop()
+
+
+@pytest.mark.asyncio
+async def test_run_load_timeout() -> None:
+    """Test that a timed out session stops sending audio."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        uri = f"unix://{Path(temp_dir) / 'test.socket'}"
+        server = AsyncServer.from_uri(uri)
+        await server.start(FakeServiceHandler)
+
+        # Chunks of 100 seconds, sent in real time
+        audio_events = [AudioStart(rate=100, width=2, channels=1).event()] + [
+            AudioChunk(rate=100, width=2, channels=1, audio=bytes(20000)).event()
+            for _ in range(2)
+        ]
+
+        summary = await run_load(
+            LoadSettings(
+                uri=uri, scenario="transcribe", wav_chunks=[audio_events], timeout=0.2
+            ),
+            num_clients=1,
+            sessions_per_client=1,
+        )
+        assert summary["errors"] == {"timeout": 1}
+        assert summary["seconds"] < 5
+
+        await server.stop()
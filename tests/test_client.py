@@ -5,10 +5,14 @@ import pytest
 
 from wyoming.client import (
     AsyncClient,
+    AsyncInprocClient,
+    AsyncShmClient,
     AsyncStdioClient,
     AsyncTcpClient,
+    AsyncUdpClient,
     AsyncUnixClient,
 )
+from wyoming.udp import DEFAULT_JITTER_MS
 
 
 def test_from_uri() -> None:
@@ -36,3 +40,24 @@ def test_from_uri() -> None:
     unix_client = AsyncClient.from_uri("unix:///path/to/socket")
     assert isinstance(unix_client, AsyncUnixClient)
     assert unix_client.socket_path == Path("/path/to/socket")
+
+    shm_client = AsyncClient.from_uri("shm:///path/to/socket")
+    assert isinstance(shm_client, AsyncShmClient)
+    assert shm_client.socket_path == Path("/path/to/socket")
+
+    inproc_client = AsyncClient.from_uri("inproc://test")
+    assert isinstance(inproc_client, AsyncInprocClient)
+    assert inproc_client.name == "test"
+
+    udp_client = AsyncClient.from_uri("udp://127.0.0.1:5000")
+    assert isinstance(udp_client, AsyncUdpClient)
+    assert udp_client.host == "127.0.0.1"
+    assert udp_client.port == 5000
+    assert udp_client.jitter_ms == DEFAULT_JITTER_MS
+
+    udp_client = AsyncClient.from_uri("udp://127.0.0.1:5000?jitter_ms=100")
+    assert isinstance(udp_client, AsyncUdpClient)
+    assert udp_client.jitter_ms == 100
+
+    with pytest.raises(ValueError):
+        AsyncClient.from_uri("udp://127.0.0.1:5000?jitter_ms=-1")
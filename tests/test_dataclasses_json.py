@@ -0,0 +1,143 @@
+"""Test dataclass encoding/decoding."""
+import typing
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+import pytest
+
+from wyoming.info import Attribution, Info, TtsProgram, TtsVoice, TtsVoiceSpeaker
+from wyoming.util import dataclasses_json
+from wyoming.util.dataclasses_json import DataClassJsonMixin
+
+
+@dataclass
+class Child(DataClassJsonMixin):
+    name: str
+    tags: List[str] = field(default_factory=list)
+
+
+@dataclass
+class Parent(DataClassJsonMixin):
+    name: str
+    child: Child
+    children: List[Child]
+    child_map: Dict[str, Child]
+    extra: Dict[str, Any]
+    maybe_child: Optional[Child]
+    maybe_number: Optional[int]
+
+
+@dataclass
+class Node(DataClassJsonMixin):
+    name: str
+    next_node: Optional["Node"] = None
+    children: List["Node"] = field(default_factory=list)
+
+
+PARENT_DICT = {
+    "name": "parent",
+    "child": {"name": "child1", "tags": ["a", "b"]},
+    "children": [{"name": "child2", "tags": []}, {"name": "child3", "tags": ["c"]}],
+    "child_map": {"child4": {"name": "child4", "tags": ["d"]}},
+    "extra": {"nested": {"list": [1, 2, 3]}},
+    "maybe_child": None,
+    "maybe_number": 5,
+}
+
+
+def test_from_dict() -> None:
+    """Test decoding nested dataclasses."""
+    parent = Parent.from_dict(PARENT_DICT)
+    assert parent == Parent(
+        name="parent",
+        child=Child(name="child1", tags=["a", "b"]),
+        children=[Child(name="child2"), Child(name="child3", tags=["c"])],
+        child_map={"child4": Child(name="child4", tags=["d"])},
+        extra={"nested": {"list": [1, 2, 3]}},
+        maybe_child=None,
+        maybe_number=5,
+    )
+
+
+def test_from_dict_missing_optional_unknown() -> None:
+    """Test that missing optional fields are None and unknown fields are skipped."""
+    parent_dict = dict(PARENT_DICT)
+    parent_dict.pop("maybe_child")
+    parent_dict.pop("maybe_number")
+    parent_dict["unknown"] = "skipped"
+
+    parent = Parent.from_dict(parent_dict)
+    assert parent.maybe_child is None
+    assert parent.maybe_number is None
+
+
+def test_self_referential(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test decoding and encoding a dataclass with fields of its own type."""
+    hint_classes: List[type] = []
+
+    def get_type_hints(cls: type) -> Dict[str, Any]:
+        hint_classes.append(cls)
+        return typing.get_type_hints(cls)
+
+    monkeypatch.setattr(dataclasses_json, "get_type_hints", get_type_hints)
+
+    node_dict = {
+        "name": "a",
+        "next_node": {"name": "b", "next_node": None, "children": []},
+        "children": [{"name": "c", "next_node": None, "children": []}],
+    }
+    node = Node.from_dict(node_dict)
+    assert node == Node(name="a", next_node=Node(name="b"), children=[Node(name="c")])
+    assert node.to_dict() == node_dict
+
+    # Compiled once for the decoder and once for the encoder
+    assert hint_classes == [Node, Node]
+
+
+def test_to_dict() -> None:
+    """Test encoding nested dataclasses."""
+    parent = Parent.from_dict(PARENT_DICT)
+    parent_dict = parent.to_dict()
+    assert parent_dict == PARENT_DICT
+
+    # Result must not share mutable values with the dataclass
+    parent_dict["child"]["tags"].append("z")
+    parent_dict["extra"]["nested"]["list"].append(4)
+    assert parent.child.tags == ["a", "b"]
+    assert parent.extra == {"nested": {"list": [1, 2, 3]}}
+
+
+def test_info_round_trip() -> None:
+    """Test encoding/decoding info with optional nested lists."""
+    info = Info(
+        tts=[
+            TtsProgram(
+                name="piper",
+                attribution=Attribution(name="rhasspy", url="https://github.com"),
+                installed=True,
+                description=None,
+                version="1.0.0",
+                voices=[
+                    TtsVoice(
+                        name="voice1",
+                        attribution=Attribution(name="", url=""),
+                        installed=True,
+                        description="Voice 1",
+                        version=None,
+                        languages=["en_US"],
+                        speakers=[TtsVoiceSpeaker(name="speaker1")],
+                    ),
+                    TtsVoice(
+                        name="voice2",
+                        attribution=Attribution(name="", url=""),
+                        installed=False,
+                        description="Voice 2",
+                        version=None,
+                        languages=["de_DE"],
+                    ),
+                ],
+            )
+        ]
+    )
+
+    assert Info.from_event(info.event()) == info
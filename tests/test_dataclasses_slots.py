@@ -0,0 +1,60 @@
+"""Test adding __slots__ to dataclasses."""
+import weakref
+from dataclasses import dataclass, field
+from typing import List
+
+import pytest
+
+from wyoming.audio import AudioChunk
+from wyoming.event import Event
+from wyoming.util.dataclasses_slots import add_slots
+
+
+class Base:
+    __slots__ = ()
+
+
+@add_slots
+@dataclass
+class Parent(Base):
+    name: str
+    values: List[int] = field(default_factory=list)
+
+
+@add_slots
+@dataclass
+class Child(Parent):
+    extra: int = 1
+
+
+def test_add_slots() -> None:
+    """Test that slotted dataclasses behave like regular ones."""
+    child = Child(name="test")
+    assert child == Child(name="test", values=[], extra=1)
+    assert repr(child) == "Child(name='test', values=[], extra=1)"
+
+    # Inherited fields aren't duplicated
+    assert Parent.__slots__ == ("name", "values", "__weakref__")
+    assert Child.__slots__ == ("extra",)
+
+    # Weak references still work
+    assert weakref.ref(child)() is child
+
+    assert not hasattr(child, "__dict__")
+    with pytest.raises(AttributeError):
+        child.unknown = 1  # type: ignore[attr-defined] # pylint: disable=attribute-defined-outside-init
+
+    # Already slotted
+    with pytest.raises(TypeError):
+        add_slots(Base)
+
+
+def test_event_slots() -> None:
+    """Test that hot-path event classes don't have a __dict__."""
+    event = Event(type="test")
+    assert weakref.ref(event)() is event
+
+    assert not hasattr(Event(type="test"), "__dict__")
+    assert not hasattr(
+        AudioChunk(rate=16000, width=2, channels=1, audio=b""), "__dict__"
+    )
@@ -8,10 +8,19 @@ import pytest
 from wyoming import __version__ as wyoming_version
 from wyoming.event import (
     Event,
+    EventTooLargeError,
+    LazyEvent,
     async_read_event,
+    async_read_event_stream,
+    async_read_sequenced_event,
     async_write_event,
+    async_write_event_stream,
+    async_write_sequenced_event,
+    encode_event,
     read_event,
+    read_events,
     write_event,
+    write_events,
 )
 
 PAYLOAD = b"test\npayload"
@@ -52,6 +61,22 @@ class FakeStreamReader:
         return data
 
 
+class TrickleReader(io.RawIOBase):
+    """Returns at most a few bytes per read, like a pipe."""
+
+    def __init__(self, value: bytes, max_bytes: int = 7) -> None:
+        self._value_io = io.BytesIO(value)
+        self._max_bytes = max_bytes
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        data = self._value_io.read(min(len(buffer), self._max_bytes))
+        buffer[: len(data)] = data
+        return len(data)
+
+
 # -----------------------------------------------------------------------------
 
 
@@ -236,3 +261,190 @@ async def test_async_read_event() -> None:
         data={"test": "data", "test2": "this will not"},
         payload=PAYLOAD,
     )
+
+
+@pytest.mark.asyncio
+async def test_async_read_event_too_large() -> None:
+    """Test limits on data and payload length."""
+    event = Event(type="test-event", data=DATA, payload=PAYLOAD)
+    with io.BytesIO() as buf:
+        write_event(event, buf)
+        event_bytes = buf.getvalue()
+
+    with pytest.raises(EventTooLargeError):
+        await async_read_event(
+            FakeStreamReader(event_bytes),  # type: ignore
+            max_data_length=len(DATA_BYTES) - 1,
+        )
+
+    with pytest.raises(EventTooLargeError):
+        await async_read_event(
+            FakeStreamReader(event_bytes),  # type: ignore
+            max_payload_length=len(PAYLOAD) - 1,
+        )
+
+    with pytest.raises(EventTooLargeError):
+        read_event(io.BytesIO(event_bytes), max_payload_length=len(PAYLOAD) - 1)
+
+    # Exactly at the limit
+    assert (
+        await async_read_event(
+            FakeStreamReader(event_bytes),  # type: ignore
+            max_data_length=len(DATA_BYTES),
+            max_payload_length=len(PAYLOAD),
+        )
+        == event
+    )
+
+
+@pytest.mark.asyncio
+async def test_async_event_stream() -> None:
+    """Test writing and reading a payload in chunks."""
+    payload = bytes(range(256)) * 100
+
+    async def payload_chunks():
+        for i in range(0, len(payload), 1000):
+            yield payload[i : i + 1000]
+
+    writer = FakeStreamWriter()
+    await async_write_event_stream(
+        Event(type="test-event", data=DATA),
+        len(payload),
+        payload_chunks(),
+        writer,  # type: ignore
+    )
+    await async_write_event(Event(type="small-event", payload=PAYLOAD), writer)  # type: ignore
+    reader = FakeStreamReader(writer.getvalue())
+
+    # Large payload is streamed, even though it's above the limit
+    result = await async_read_event_stream(
+        reader,  # type: ignore
+        min_stream_length=1024,
+        max_payload_length=1024,
+        chunk_size=4096,
+    )
+    assert result is not None
+    event, payload_stream = result
+    assert event == Event(type="test-event", data=DATA)
+    assert payload_stream is not None
+    assert payload_stream.length == len(payload)
+
+    chunks = [chunk async for chunk in payload_stream]
+    assert [len(chunk) for chunk in chunks] == [4096] * 6 + [len(payload) - (6 * 4096)]
+    assert b"".join(chunks) == payload
+
+    # Small payload is read as usual
+    result = await async_read_event_stream(reader, min_stream_length=1024)  # type: ignore
+    assert result is not None
+    event, payload_stream = result
+    assert event.type == "small-event"
+    assert event.payload == PAYLOAD
+    assert payload_stream is None
+
+
+@pytest.mark.asyncio
+async def test_async_event_stream_length_mismatch() -> None:
+    """Test writing a streamed payload that doesn't match its length."""
+
+    async def payload_chunks():
+        yield bytes(10)
+        yield bytes(10)
+
+    # Too long
+    with pytest.raises(ValueError):
+        await async_write_event_stream(
+            Event(type="test-event"), 15, payload_chunks(), FakeStreamWriter()  # type: ignore
+        )
+
+    # Too short
+    with pytest.raises(ValueError):
+        await async_write_event_stream(
+            Event(type="test-event"), 25, payload_chunks(), FakeStreamWriter()  # type: ignore
+        )
+
+
+def test_read_write_events() -> None:
+    """Test writing and reading batches of events."""
+    events = [
+        Event(type="test-event", data=DATA, payload=PAYLOAD),
+        Event(type="no-payload", data=DATA),
+        Event(type="large-payload", data=DATA, payload=bytes(range(256)) * 1000),
+    ]
+
+    with io.BytesIO() as buf:
+        assert write_events(events, buf) == len(events)
+        event_bytes = buf.getvalue()
+
+    with io.BytesIO(event_bytes) as reader:
+        assert list(read_events(reader)) == events
+
+    # Partial reads
+    trickle_events = list(read_events(TrickleReader(event_bytes)))  # type: ignore
+    assert trickle_events == events
+
+    # Truncated event is dropped
+    truncated_events = list(
+        read_events(TrickleReader(event_bytes[:-1]))  # type: ignore
+    )
+    assert truncated_events == events[:-1]
+
+
+@pytest.mark.asyncio
+async def test_lazy_event() -> None:
+    """Test reading events without decoding their data."""
+    header = {
+        "type": "test-event",
+        "version": "0.0.0",
+        "data_length": len(DATA_BYTES),
+        "payload_length": len(PAYLOAD),
+        "data": {"test2": "inline"},
+    }
+    event_bytes = b"".join(
+        (json.dumps(header).encode("utf-8"), b"\n", DATA_BYTES, PAYLOAD)
+    )
+
+    event = await async_read_event(
+        FakeStreamReader(event_bytes), lazy=True  # type: ignore
+    )
+    assert isinstance(event, LazyEvent)
+    assert event.type == "test-event"
+    assert event.data_length == len(DATA_BYTES)
+    assert event.payload_length == len(PAYLOAD)
+    assert not event.is_data_decoded
+
+    # Original bytes are written unchanged
+    assert encode_event(event) == event_bytes
+    writer = FakeStreamWriter()
+    await async_write_event(event, writer)  # type: ignore
+    assert writer.getvalue() == event_bytes
+
+    # Data is decoded when accessed
+    assert event.data == {"test": "data", "test2": "inline"}
+    assert event.is_data_decoded
+    assert event == Event(type="test-event", data=event.data, payload=PAYLOAD)
+
+    # Data may have been modified, so the event is encoded again
+    event.data["test3"] = "modified"
+    event_2 = read_event(io.BytesIO(encode_event(event)))
+    assert event_2 == event
+    assert event_2 is not None
+    assert event_2.data["test3"] == "modified"
+
+
+@pytest.mark.asyncio
+async def test_async_sequenced_event() -> None:
+    """Test events with the number of UDP datagrams sent before them."""
+    writer = FakeStreamWriter()
+    event = Event(type="test-event", data=DATA, payload=PAYLOAD)
+    await async_write_sequenced_event(event, writer, 5)  # type: ignore[arg-type]
+    await async_write_sequenced_event(event, writer, 0)  # type: ignore[arg-type]
+
+    reader = FakeStreamReader(writer.getvalue())
+    assert await async_read_sequenced_event(reader) == (event, 5)  # type: ignore[arg-type]
+    assert await async_read_sequenced_event(reader) == (event, 0)  # type: ignore[arg-type]
+    assert await async_read_sequenced_event(reader) is None  # type: ignore[arg-type]
+
+    # Sequence must be a count
+    header = {"type": "test-event", "udp_sequence": "5"}
+    reader = FakeStreamReader(json.dumps(header).encode("utf-8") + b"\n")
+    assert await async_read_sequenced_event(reader) is None  # type: ignore[arg-type]
@@ -0,0 +1,326 @@
+"""Test info cache."""
+import io
+from dataclasses import replace
+
+from wyoming.event import Event, read_event
+from wyoming.info import (
+    Attribution,
+    Describe,
+    Info,
+    InfoCache,
+    InfoDelta,
+    InfoIndex,
+    InfoUnchanged,
+    Satellite,
+    TtsProgram,
+    TtsVoice,
+    TtsVoiceSpeaker,
+    WakeModel,
+    WakeProgram,
+)
+from wyoming.tts import SynthesizeVoice
+
+ATTRIBUTION = Attribution(name="test", url="http://test")
+
+
+def _make_model(model_name: str, installed: bool = True) -> WakeModel:
+    return WakeModel(
+        name=model_name,
+        attribution=ATTRIBUTION,
+        installed=installed,
+        description=None,
+        version=None,
+        languages=["en"],
+        phrase=None,
+    )
+
+
+def _make_info(*model_names: str) -> Info:
+    return Info(
+        wake=[
+            WakeProgram(
+                name="test-wake",
+                attribution=ATTRIBUTION,
+                installed=True,
+                description=None,
+                version=None,
+                models=[_make_model(model_name) for model_name in model_names],
+            )
+        ]
+    )
+
+
+def _read(event_bytes: bytes) -> Event:
+    with io.BytesIO(event_bytes) as reader:
+        event = read_event(reader)
+
+    assert event is not None
+    return event
+
+
+def test_info_cache() -> None:
+    """Test that cached info bytes decode to the same info."""
+    info = _make_info("model1")
+    cache = InfoCache(info)
+
+    event_bytes = cache.event_bytes
+    assert cache.event_bytes is event_bytes  # cached
+
+    assert Info.from_event(_read(event_bytes)) == replace(info, etag=cache.etag)
+
+
+def test_info_cache_invalidate() -> None:
+    """Test that replacing or invalidating info re-encodes it."""
+    cache = InfoCache(_make_info("model1"))
+    old_bytes = cache.event_bytes
+
+    # Replaced
+    cache.info = _make_info("model2")
+    assert cache.event_bytes != old_bytes
+    assert b"model2" in cache.event_bytes
+
+    # Modified in place
+    old_bytes = cache.event_bytes
+    cache.info.wake[0].models[0].name = "model3"
+    assert cache.event_bytes is old_bytes
+    cache.invalidate()
+    assert b"model3" in cache.event_bytes
+
+
+def test_info_cache_unchanged() -> None:
+    """Test describe with an up-to-date etag."""
+    cache = InfoCache(_make_info("model1"))
+    etag = cache.etag
+
+    # No etag
+    assert cache.get_response_bytes(Describe()) == cache.event_bytes
+
+    # Unknown etag
+    assert cache.get_response_bytes(Describe(etag="unknown")) == cache.event_bytes
+
+    event = _read(cache.get_response_bytes(Describe(etag=etag)))
+    assert InfoUnchanged.is_type(event.type)
+    assert InfoUnchanged.from_event(event).etag == etag
+
+
+def test_info_cache_delta() -> None:
+    """Test describe with an old etag."""
+    old_info = _make_info("model1", "model2", "model3")
+    cache = InfoCache(old_info)
+    old_info = replace(old_info, etag=cache.etag)
+
+    # Remove model1, change model2, add model4
+    cache.info = _make_info("model2", "model3", "model4")
+    cache.info.wake[0].models[0].installed = False
+    new_info = replace(cache.info, etag=cache.etag)
+
+    event = _read(cache.get_response_bytes(Describe(etag=old_info.etag)))
+    assert InfoDelta.is_type(event.type)
+    delta = InfoDelta.from_event(event)
+    assert delta.base_etag == old_info.etag
+    assert delta.etag == new_info.etag
+    assert delta.removed == {"wake": {"test-wake": ["model1"]}}
+    assert [m.name for m in delta.added.wake[0].models] == ["model2", "model4"]
+
+    # Order of models may differ
+    patched_info = delta.apply(old_info)
+    assert patched_info.etag == new_info.etag
+    assert sorted(patched_info.wake[0].models, key=lambda m: m.name) == sorted(
+        new_info.wake[0].models, key=lambda m: m.name
+    )
+
+
+def test_info_cache_copies_info() -> None:
+    """Test that changing the original info doesn't make the cache stale."""
+    info = _make_info("model1")
+    cache = InfoCache(info)
+    etag = cache.etag
+
+    info.wake[0].models.clear()
+    assert cache.etag == etag
+    assert Info.from_event(_read(cache.event_bytes)).wake[0].models
+
+    cache.info = info
+    assert cache.etag != etag
+
+
+def test_info_cache_delta_fallback() -> None:
+    """Test that full info is sent when more than models have changed."""
+    cache = InfoCache(_make_info("model1"))
+    old_etag = cache.etag
+
+    cache.info = replace(
+        _make_info("model1"),
+        satellite=Satellite(
+            name="satellite",
+            attribution=ATTRIBUTION,
+            installed=True,
+            description=None,
+            version=None,
+        ),
+    )
+    assert cache.get_response_bytes(Describe(etag=old_etag)) == cache.event_bytes
+
+
+def _make_tts_info() -> Info:
+    return Info(
+        tts=[
+            TtsProgram(
+                name="test-tts",
+                attribution=ATTRIBUTION,
+                installed=True,
+                description="Test TTS",
+                version=None,
+                voices=[
+                    TtsVoice(
+                        name=f"{language}-voice",
+                        attribution=ATTRIBUTION,
+                        installed=installed,
+                        description=f"Voice for {language}",
+                        version=None,
+                        languages=[language],
+                    )
+                    for language, installed in (
+                        ("en_US", True),
+                        ("en_GB", False),
+                        ("de_DE", True),
+                    )
+                ],
+            )
+        ],
+        wake=_make_info("model1").wake,
+    )
+
+
+def test_info_cache_filtered() -> None:
+    """Test filtered describe requests."""
+    cache = InfoCache(_make_tts_info())
+
+    def describe(**kwargs) -> Info:
+        event = _read(cache.get_response_bytes(Describe(**kwargs)))
+        assert Info.is_type(event.type)
+        return Info.from_event(event)
+
+    # Domains
+    info = describe(domains=["tts"])
+    assert info.tts and (not info.wake)
+
+    # Languages (with region fallback)
+    info = describe(domains=["tts"], languages=["en"])
+    assert [v.name for v in info.tts[0].voices] == ["en_US-voice", "en_GB-voice"]
+
+    info = describe(domains=["tts"], languages=["en-us"])
+    assert [v.name for v in info.tts[0].voices] == ["en_US-voice"]
+
+    # Names
+    info = describe(names=["de*"])
+    assert [v.name for v in info.tts[0].voices] == ["de_DE-voice"]
+    assert not info.wake  # no matching models
+
+    # Installed only
+    info = describe(domains=["tts"], installed_only=True)
+    assert [v.name for v in info.tts[0].voices] == ["en_US-voice", "de_DE-voice"]
+
+    # Omit fields
+    info = describe(omit=["description", "attribution"])
+    assert info.tts[0].description is None
+    assert info.tts[0].voices[0].description is None
+    assert info.tts[0].voices[0].attribution == Attribution(name="", url="")
+
+    # Partial info has its own etag
+    assert info.etag is not None
+    assert info.etag != cache.etag
+    event = _read(
+        cache.get_response_bytes(
+            Describe(omit=["description", "attribution"], etag=info.etag)
+        )
+    )
+    assert InfoUnchanged.from_event(event).etag == info.etag
+
+    # ...which doesn't match other filters or the full info
+    info = describe(domains=["tts"], etag=info.etag)
+    assert info.etag != cache.etag
+    assert Info.is_type(_read(cache.get_response_bytes(Describe(etag=info.etag))).type)
+
+
+def test_info_merge() -> None:
+    """Test merging filtered info on the client."""
+    cache = InfoCache(_make_tts_info())
+
+    def describe(**kwargs) -> Info:
+        return Info.from_event(_read(cache.get_response_bytes(Describe(**kwargs))))
+
+    info = describe(languages=["en"]).merge(describe(languages=["de"]))
+    assert [v.name for v in info.tts[0].voices] == [
+        "en_US-voice",
+        "en_GB-voice",
+        "de_DE-voice",
+    ]
+    assert info.wake[0].models[0].name == "model1"
+
+
+def test_info_index() -> None:
+    """Test info index lookups."""
+    index = InfoIndex(_make_tts_info())
+
+    assert index.get_program("tts", "test-tts") is index.info.tts[0]
+    assert index.get_model("wake", "model1") is index.info.wake[0].models[0]
+    assert index.get_model_program("wake", "model1") is index.info.wake[0]
+    assert index.get_model("tts", "missing") is None
+
+    # Exact language
+    assert [v.name for v in index.find_models("tts", "en-GB")] == ["en_GB-voice"]
+
+    # Fallback from region to language
+    assert [v.name for v in index.find_models("tts", "de_AT")] == ["de_DE-voice"]
+    assert [v.name for v in index.find_models("tts", "en")] == [
+        "en_US-voice",
+        "en_GB-voice",
+    ]
+
+    # Installed only
+    assert [v.name for v in index.find_models("tts", "en", installed_only=True)] == [
+        "en_US-voice"
+    ]
+    assert not index.find_models("tts", "fr")
+
+    # Rebuilt when info changes
+    index.info = _make_info("model2")
+    assert index.get_model("wake", "model1") is None
+    assert index.get_model("wake", "model2") is not None
+
+
+def test_info_index_resolve_voice() -> None:
+    """Test resolving a synthesis voice."""
+    info = _make_tts_info()
+    info.tts[0].voices[0].speakers = [
+        TtsVoiceSpeaker(name="speaker1"),
+        TtsVoiceSpeaker(name="speaker2"),
+    ]
+    index = InfoIndex(info)
+
+    # By name with speaker
+    resolved = index.resolve_voice(
+        SynthesizeVoice(name="en_US-voice", speaker="speaker2")
+    )
+    assert resolved is not None
+    assert resolved[0].name == "en_US-voice"
+    assert resolved[1] == TtsVoiceSpeaker(name="speaker2")
+
+    # By language (installed preferred)
+    resolved = index.resolve_voice(SynthesizeVoice(language="en_GB"))
+    assert resolved is not None
+    assert resolved[0].name == "en_GB-voice"
+
+    resolved = index.resolve_voice(SynthesizeVoice(language="en"))
+    assert resolved is not None
+    assert resolved[0].name == "en_US-voice"
+
+    # Default
+    resolved = index.resolve_voice()
+    assert resolved is not None
+    assert resolved[0].name == "en_US-voice"
+    assert resolved[1] is None
+
+    # Unknown
+    assert index.resolve_voice(SynthesizeVoice(name="missing")) is None
@@ -1,6 +1,11 @@
+import random
 import sys
+import warnings
+
+import pytest
 
 from wyoming import pyaudioop
+from wyoming.util.numpy_support import get_numpy
 
 
 def pack(width, data):
@@ -138,3 +143,220 @@ def test_ratecv() -> None:
     #     assert (
     #         pyaudioop.ratecv(datas[w], w, 1, 8000, 8000, None, 30, 10)[0] == expected[w]
     #     )
+
+
+@pytest.fixture(name="use_numpy", params=[True, False], ids=["numpy", "memoryview"])
+def fixture_use_numpy(request, monkeypatch: pytest.MonkeyPatch) -> bool:
+    """Run test with and without numpy."""
+    if request.param:
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(pyaudioop, "get_numpy", lambda: None)
+
+    return request.param
+
+
+def test_max(use_numpy: bool) -> None:
+    """Test maximum absolute sample value."""
+    for w in 1, 2, 4:
+        assert pyaudioop.max(b"", w) == 0
+        assert pyaudioop.max(bytearray(), w) == 0
+        assert pyaudioop.max(memoryview(b""), w) == 0
+        p = packs[w]
+        assert pyaudioop.max(p(5), w) == 5
+        assert pyaudioop.max(p(5, -8, -1), w) == 8
+        assert pyaudioop.max(p(maxvalues[w]), w) == maxvalues[w]
+        assert pyaudioop.max(p(minvalues[w]), w) == -minvalues[w]
+        assert pyaudioop.max(datas[w], w) == -minvalues[w]
+
+
+def test_avgpp(use_numpy: bool) -> None:
+    """Test average peak-to-peak value."""
+    for w in 1, 2, 4:
+        assert pyaudioop.avgpp(b"", w) == 0
+        assert pyaudioop.avgpp(bytearray(), w) == 0
+        assert pyaudioop.avgpp(memoryview(b""), w) == 0
+        p = packs[w]
+        assert pyaudioop.avgpp(p(5), w) == 0
+        assert pyaudioop.avgpp(p(5, 8), w) == 0
+        assert pyaudioop.avgpp(p(0, 5, 0), w) == 0
+        assert pyaudioop.avgpp(p(0, 5, 0, 5), w) == 5
+
+    assert pyaudioop.avgpp(datas[1], 1) == 196
+    assert pyaudioop.avgpp(datas[2], 2) == 50534
+    assert pyaudioop.avgpp(datas[4], 4) == 3311897002
+
+
+def test_rms(use_numpy: bool) -> None:
+    """Test root mean square."""
+    for w in 1, 2, 4:
+        assert pyaudioop.rms(b"", w) == 0
+        assert pyaudioop.rms(bytearray(), w) == 0
+        assert pyaudioop.rms(memoryview(b""), w) == 0
+        p = packs[w]
+        assert pyaudioop.rms(p(*range(100)), w) == 57
+        assert abs(pyaudioop.rms(p(maxvalues[w]) * 5, w) - maxvalues[w]) <= 1
+        assert abs(pyaudioop.rms(p(minvalues[w]) * 5, w) + minvalues[w]) <= 1
+
+    assert pyaudioop.rms(datas[1], 1) == 77
+    assert pyaudioop.rms(datas[2], 2) == 20001
+    assert pyaudioop.rms(datas[4], 4) == 1310854152
+
+
+def test_add(use_numpy: bool) -> None:
+    """Test adding fragments with clipping."""
+    for w in 1, 2, 4:
+        assert pyaudioop.add(b"", b"", w) == b""
+        assert pyaudioop.add(bytearray(), bytearray(), w) == b""
+        assert pyaudioop.add(memoryview(b""), memoryview(b""), w) == b""
+        assert pyaudioop.add(datas[w], b"\0" * len(datas[w]), w) == datas[w]
+
+    assert pyaudioop.add(datas[1], datas[1], 1) == b"\x00\x24\x7f\x80\x7f\x80\xfe"
+    assert pyaudioop.add(datas[2], datas[2], 2) == packs[2](
+        0, 0x2468, 0x7FFF, -0x8000, 0x7FFF, -0x8000, -2
+    )
+    assert pyaudioop.add(datas[4], datas[4], 4) == packs[4](
+        0, 0x2468ACF0, 0x7FFFFFFF, -0x80000000, 0x7FFFFFFF, -0x80000000, -2
+    )
+
+    with pytest.raises(ValueError):
+        pyaudioop.add(datas[2], datas[2][:-2], 2)
+
+
+def test_bias(use_numpy: bool) -> None:
+    """Test adding bias with wrap-around."""
+    for w in 1, 2, 4:
+        for bias in 0, 1, -1, 127, -128, 0x7FFFFFFF, -0x80000000:
+            assert pyaudioop.bias(b"", w, bias) == b""
+            assert pyaudioop.bias(bytearray(), w, bias) == b""
+            assert pyaudioop.bias(memoryview(b""), w, bias) == b""
+
+    assert pyaudioop.bias(datas[1], 1, 1) == b"\x01\x13\x46\xbc\x80\x81\x00"
+    assert pyaudioop.bias(datas[1], 1, -1) == b"\xff\x11\x44\xba\x7e\x7f\xfe"
+    assert pyaudioop.bias(datas[1], 1, 0x7FFFFFFF) == b"\xff\x11\x44\xba\x7e\x7f\xfe"
+    assert pyaudioop.bias(datas[1], 1, -0x80000000) == datas[1]
+    assert pyaudioop.bias(datas[2], 2, 1) == packs[2](
+        1, 0x1235, 0x4568, -0x4566, -0x8000, -0x7FFF, 0
+    )
+    assert pyaudioop.bias(datas[4], 4, 1) == packs[4](
+        1, 0x12345679, 0x456789AC, -0x456789AA, -0x80000000, -0x7FFFFFFF, 0
+    )
+
+    for bias in 0x80000000, -0x80000001:
+        with pytest.raises(OverflowError):
+            pyaudioop.bias(datas[1], 1, bias)
+
+
+def test_mul(use_numpy: bool) -> None:
+    """Test multiplying samples with clipping."""
+    for w in 1, 2, 4:
+        assert pyaudioop.mul(b"", w, 2) == b""
+        assert pyaudioop.mul(bytearray(), w, 2) == b""
+        assert pyaudioop.mul(memoryview(b""), w, 2) == b""
+        assert pyaudioop.mul(datas[w], w, 0) == b"\0" * len(datas[w])
+        assert pyaudioop.mul(datas[w], w, 1) == datas[w]
+
+    assert pyaudioop.mul(datas[1], 1, 2) == b"\x00\x24\x7f\x80\x7f\x80\xfe"
+    assert pyaudioop.mul(datas[2], 2, 2) == packs[2](
+        0, 0x2468, 0x7FFF, -0x8000, 0x7FFF, -0x8000, -2
+    )
+    assert pyaudioop.mul(datas[4], 4, 2) == packs[4](
+        0, 0x2468ACF0, 0x7FFFFFFF, -0x80000000, 0x7FFFFFFF, -0x80000000, -2
+    )
+
+
+def test_level_gain_matches_audioop(use_numpy: bool) -> None:
+    """Compare level and gain functions to the deprecated audioop module."""
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", DeprecationWarning)
+        audioop = pytest.importorskip("audioop")
+
+    rng = random.Random(1234)
+    for w in 1, 2, 4:
+        for num_samples in 0, 1, 2, 3, 10, 1000:
+            data1 = packs[w](
+                *(rng.randint(minvalues[w], maxvalues[w]) for _ in range(num_samples))
+            )
+            data2 = packs[w](
+                *(
+                    rng.choice((0, 1, -1, 5, minvalues[w], maxvalues[w]))
+                    for _ in range(num_samples)
+                )
+            )
+
+            for data in data1, data2:
+                for func_name in "rms", "max", "avgpp":
+                    assert getattr(pyaudioop, func_name)(data, w) == getattr(
+                        audioop, func_name
+                    )(data, w), func_name
+
+                for factor in 0.5, 2.7, -1.0, -0.3:
+                    assert pyaudioop.mul(data, w, factor) == audioop.mul(
+                        data, w, factor
+                    )
+
+                for bias in -7, 12345, 0x7FFFFFFF:
+                    assert pyaudioop.bias(data, w, bias) == audioop.bias(data, w, bias)
+
+            assert pyaudioop.add(data1, data2, w) == audioop.add(data1, data2, w)
+
+
+def test_g711_adpcm_match_audioop(use_numpy: bool) -> None:
+    """Compare G.711 and IMA-ADPCM codecs to the deprecated audioop module."""
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", DeprecationWarning)
+        audioop = pytest.importorskip("audioop")
+
+    # Every 16-bit sample and every code
+    all_samples = packs[2](*range(minvalues[2], maxvalues[2] + 1))
+    all_codes = bytes(range(256))
+    for encode_name, decode_name in ("lin2ulaw", "ulaw2lin"), ("lin2alaw", "alaw2lin"):
+        assert getattr(pyaudioop, encode_name)(all_samples, 2) == getattr(
+            audioop, encode_name
+        )(all_samples, 2)
+        assert getattr(pyaudioop, decode_name)(all_codes, 2) == getattr(
+            audioop, decode_name
+        )(all_codes, 2)
+
+    rng = random.Random(1234)
+    for w in 1, 2, 4:
+        for num_samples in 0, 1, 2, 3, 1001:
+            data = packs[w](
+                *(rng.randint(minvalues[w], maxvalues[w]) for _ in range(num_samples))
+            )
+            codes = bytes(rng.randrange(256) for _ in range(num_samples))
+
+            for func_name in "lin2ulaw", "lin2alaw":
+                assert getattr(pyaudioop, func_name)(data, w) == getattr(
+                    audioop, func_name
+                )(data, w), func_name
+
+            for func_name in "ulaw2lin", "alaw2lin":
+                assert getattr(pyaudioop, func_name)(codes, w) == getattr(
+                    audioop, func_name
+                )(codes, w), func_name
+
+            for state in None, (0, 0), (1000, 40), (-0x8000, 88):
+                assert pyaudioop.lin2adpcm(data, w, state) == audioop.lin2adpcm(
+                    data, w, state
+                )
+                assert pyaudioop.adpcm2lin(codes, w, state) == audioop.adpcm2lin(
+                    codes, w, state
+                )
+
+    with pytest.raises(ValueError):
+        pyaudioop.adpcm2lin(b"\x00", 2, (0, 89))
+
+
+def test_get_numpy_cached(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that a failed numpy import is only tried once."""
+    get_numpy.cache_clear()
+    try:
+        monkeypatch.setitem(sys.modules, "numpy", None)  # import fails
+        assert get_numpy() is None
+        assert get_numpy.cache_info().misses == 1
+
+        assert get_numpy() is None
+        assert get_numpy.cache_info().hits == 1
+    finally:
+        get_numpy.cache_clear()
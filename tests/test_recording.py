@@ -0,0 +1,216 @@
+"""Recording and replay tests."""
+import tempfile
+from functools import partial
+from pathlib import Path
+
+import pytest
+
+from wyoming.asr import Transcript
+from wyoming.audio import AudioChunk, AudioStart, AudioStop
+from wyoming.bench.replay import replay
+from wyoming.client import AsyncClient
+from wyoming.event import Event, PayloadStream
+from wyoming.recording import (
+    EventDirection,
+    EventRecorder,
+    RecordingReader,
+    get_index_path,
+)
+from wyoming.server import AsyncEventHandler, AsyncServer
+
+
+class FakeAsrHandler(AsyncEventHandler):
+    """Transcribes audio as the number of chunks."""
+
+    def __init__(self, *args, recorder=None, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.recorder = recorder
+        self.num_chunks = 0
+
+    async def handle_event(self, event: Event) -> bool:
+        if AudioChunk.is_type(event.type):
+            self.num_chunks += 1
+        elif AudioStop.is_type(event.type):
+            await self.write_event(Transcript(text=str(self.num_chunks)).event())
+
+        return True
+
+
+class StreamingHandler(AsyncEventHandler):
+    """Reads payloads of all events as streams."""
+
+    def __init__(self, *args, recorder=None, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.recorder = recorder
+        self.stream_payload_length = 1
+
+    async def handle_event(self, event: Event) -> bool:
+        if AudioStop.is_type(event.type):
+            await self.write_event(Transcript(text="done").event())
+
+        return True
+
+    async def handle_event_stream(self, event: Event, payload: PayloadStream) -> bool:
+        await payload.skip()
+        return True
+
+
+def _make_audio_events(num_chunks: int):
+    return (
+        [AudioStart(rate=16000, width=2, channels=1).event()]
+        + [
+            AudioChunk(
+                rate=16000, width=2, channels=1, audio=bytes([i % 256] * 320)
+            ).event()
+            for i in range(num_chunks)
+        ]
+        + [AudioStop().event()]
+    )
+
+
+def test_record_and_read() -> None:
+    """Test reading back a recording and seeking by time."""
+    events = _make_audio_events(200)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = Path(temp_dir) / "test.wyrec"
+        with EventRecorder(path, index_interval=16) as recorder:
+            for event in events:
+                recorder.record(event, EventDirection.TO_SERVICE)
+
+            recorder.record(Transcript(text="200").event(), EventDirection.FROM_SERVICE)
+
+        assert get_index_path(path).stat().st_size > 0
+
+        with RecordingReader(path) as reader:
+            recorded_events = list(reader)
+
+        assert [r.event for r in recorded_events[:-1]] == events
+        assert all(
+            r.direction == EventDirection.TO_SERVICE for r in recorded_events[:-1]
+        )
+        assert recorded_events[-1].direction == EventDirection.FROM_SERVICE
+        assert Transcript.from_event(recorded_events[-1].event).text == "200"
+
+        timestamps = [r.timestamp for r in recorded_events]
+        assert timestamps == sorted(timestamps)
+
+        # Seek to the middle of the recording
+        with RecordingReader(path) as reader:
+            target = recorded_events[100]
+            reader.seek(target.timestamp)
+            recorded_event = reader.read()
+            assert recorded_event is not None
+            assert recorded_event.timestamp == target.timestamp
+            first_index = timestamps.index(target.timestamp)
+            assert recorded_event.event == recorded_events[first_index].event
+
+            # Past the end
+            reader.seek(timestamps[-1] + 1)
+            assert reader.read() is None
+
+        # Truncated recording
+        path.write_bytes(path.read_bytes()[:-10])
+        with RecordingReader(path) as reader:
+            assert len(list(reader)) == len(recorded_events) - 1
+
+
+def test_not_a_recording() -> None:
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = Path(temp_dir) / "test.wyrec"
+        path.write_bytes(b"not a recording")
+        with pytest.raises(ValueError):
+            RecordingReader(path)
+
+
+@pytest.mark.asyncio
+async def test_record_handler_and_replay() -> None:
+    """Test recording an event handler and replaying the session."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        uri = f"unix://{Path(temp_dir) / 'test.socket'}"
+        recording_path = Path(temp_dir) / "session.wyrec"
+        replay_path = Path(temp_dir) / "replay.wyrec"
+
+        # Record a session from the handler's side
+        with EventRecorder(recording_path) as recorder:
+            server = AsyncServer.from_uri(uri)
+            await server.start(partial(FakeAsrHandler, recorder=recorder))
+
+            async with AsyncClient.from_uri(uri) as client:
+                for event in _make_audio_events(5):
+                    await client.write_event(event)
+
+                event = await client.read_event()
+                assert event is not None
+                assert Transcript.from_event(event).text == "5"
+
+            await server.stop()
+
+        # Replay to a new service, recording from the client's side
+        server = AsyncServer.from_uri(uri)
+        await server.start(FakeAsrHandler)
+
+        with RecordingReader(recording_path) as reader, EventRecorder(
+            replay_path
+        ) as replay_recorder:
+            summary = await replay(
+                reader, uri, speed=0, recorder=replay_recorder, idle_timeout=0.5
+            )
+
+        await server.stop()
+
+        assert summary["events_sent"] == 7
+        assert summary["events_received"] == 1
+
+        with RecordingReader(recording_path) as reader:
+            original = [(r.direction, r.event) for r in reader]
+
+        with RecordingReader(replay_path) as reader:
+            replayed = [(r.direction, r.event) for r in reader]
+
+        assert replayed == original
+
+
+@pytest.mark.asyncio
+async def test_record_streamed_payload() -> None:
+    """Test that events with streamed payloads are flagged and not replayed."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        uri = f"unix://{Path(temp_dir) / 'test.socket'}"
+        recording_path = Path(temp_dir) / "session.wyrec"
+
+        with EventRecorder(recording_path) as recorder:
+            server = AsyncServer.from_uri(uri)
+            await server.start(partial(StreamingHandler, recorder=recorder))
+
+            async with AsyncClient.from_uri(uri) as client:
+                for event in _make_audio_events(2):
+                    await client.write_event(event)
+
+                event = await client.read_event()
+                assert event is not None
+
+            await server.stop()
+
+        with RecordingReader(recording_path) as reader:
+            recorded_events = list(reader)
+
+        assert [r.is_payload_omitted for r in recorded_events] == [
+            False,
+            True,
+            True,
+            False,
+            False,
+        ]
+        assert recorded_events[1].event.payload is None
+
+        # Events without their payloads are skipped
+        server = AsyncServer.from_uri(uri)
+        await server.start(FakeAsrHandler)
+
+        with RecordingReader(recording_path) as reader:
+            summary = await replay(reader, uri, speed=0, idle_timeout=0.5)
+
+        await server.stop()
+
+        assert summary["events_sent"] == 2
+        assert summary["events_skipped"] == 2
+        assert summary["events_received"] == 1
@@ -0,0 +1,303 @@
+"""Router tests."""
+import asyncio
+import tempfile
+from functools import partial
+from pathlib import Path
+from typing import List, Optional
+
+import pytest
+
+from wyoming.asr import Transcribe, Transcript
+from wyoming.audio import AudioChunk, AudioStart, AudioStop
+from wyoming.client import AsyncClient
+from wyoming.error import Error
+from wyoming.event import Event
+from wyoming.info import AsrProgram, Attribution, Describe, Info, InfoCache, TtsProgram
+from wyoming.ping import Ping, Pong
+from wyoming.recording import EventDirection, EventRecorder, RecordingReader
+from wyoming.router import BackendPool, Router, RouterEventHandler
+from wyoming.server import AsyncEventHandler, AsyncServer
+from wyoming.tts import Synthesize
+
+ATTRIBUTION = Attribution(name="test", url="test")
+
+
+class FakeAsrHandler(AsyncEventHandler):
+    """Transcribes audio as the number of chunks."""
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.num_chunks = 0
+
+    async def handle_event(self, event: Event) -> bool:
+        if Describe.is_type(event.type):
+            info = Info(
+                asr=[
+                    AsrProgram(
+                        name="fake-asr",
+                        attribution=ATTRIBUTION,
+                        installed=True,
+                        description=None,
+                        version=None,
+                        models=[],
+                    )
+                ]
+            )
+            await self.write_event(info.event())
+        elif AudioChunk.is_type(event.type):
+            self.num_chunks += 1
+        elif AudioStop.is_type(event.type):
+            await self.write_event(Transcript(text=str(self.num_chunks)).event())
+
+        return True
+
+
+class FakeTtsHandler(AsyncEventHandler):
+    """Synthesizes one chunk of silence per character."""
+
+    info_cache = InfoCache(
+        Info(
+            tts=[
+                TtsProgram(
+                    name="fake-tts",
+                    attribution=ATTRIBUTION,
+                    installed=True,
+                    description=None,
+                    version=None,
+                    voices=[],
+                )
+            ]
+        )
+    )
+    describe_etags: List[Optional[str]] = []
+
+    async def handle_event(self, event: Event) -> bool:
+        if Describe.is_type(event.type):
+            describe = Describe.from_event(event)
+            self.describe_etags.append(describe.etag)
+            await self.info_cache.async_write(self.writer, describe)
+        elif Synthesize.is_type(event.type):
+            synthesize = Synthesize.from_event(event)
+            await self.write_event(AudioStart(rate=16000, width=2, channels=1).event())
+            for _ in synthesize.text:
+                await self.write_event(
+                    AudioChunk(rate=16000, width=2, channels=1, audio=bytes(2)).event()
+                )
+
+            await self.write_event(AudioStop().event())
+
+        return True
+
+
+async def _start_server(uri: str, handler_factory) -> AsyncServer:
+    server = AsyncServer.from_uri(uri)
+    await server.start(handler_factory)
+
+    return server
+
+
+@pytest.mark.asyncio
+async def test_router() -> None:
+    """Test routing events to ASR and TTS services."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        asr_uri = f"unix://{Path(temp_dir) / 'asr.socket'}"
+        tts_uri = f"unix://{Path(temp_dir) / 'tts.socket'}"
+        router_uri = f"unix://{Path(temp_dir) / 'router.socket'}"
+
+        asr_server = await _start_server(asr_uri, FakeAsrHandler)
+        tts_server = await _start_server(tts_uri, FakeTtsHandler)
+
+        router = Router({"asr": asr_uri, "tts": tts_uri})
+        router_server = await _start_server(
+            router_uri, partial(RouterEventHandler, router=router)
+        )
+
+        async with AsyncClient.from_uri(router_uri) as client:
+            # Info is merged
+            await client.write_event(Describe().event())
+            event = await asyncio.wait_for(client.read_event(), timeout=1)
+            assert event is not None
+            info = Info.from_event(event)
+            assert [p.name for p in info.asr] == ["fake-asr"]
+            assert [p.name for p in info.tts] == ["fake-tts"]
+
+            # Handled by router
+            await client.write_event(Ping(text="test").event())
+            event = await asyncio.wait_for(client.read_event(), timeout=1)
+            assert event is not None
+            assert Pong.is_type(event.type)
+
+            # ASR
+            await client.write_event(Transcribe().event())
+            await client.write_event(
+                AudioStart(rate=16000, width=2, channels=1).event()
+            )
+            for _ in range(5):
+                await client.write_event(
+                    AudioChunk(rate=16000, width=2, channels=1, audio=bytes(2)).event()
+                )
+
+            await client.write_event(AudioStop().event())
+            event = await asyncio.wait_for(client.read_event(), timeout=1)
+            assert event is not None
+            assert Transcript.from_event(event).text == "5"
+
+            # TTS in the same session
+            await client.write_event(Synthesize(text="abc").event())
+            event_types: List[str] = []
+            while not event_types or (event_types[-1] != AudioStop().event().type):
+                event = await asyncio.wait_for(client.read_event(), timeout=1)
+                assert event is not None
+                event_types.append(event.type)
+
+            assert event_types == (
+                ["audio-start"] + (["audio-chunk"] * 3) + ["audio-stop"]
+            )
+
+        await router_server.stop()
+        await router.close()
+        await asr_server.stop()
+        await tts_server.stop()
+
+
+@pytest.mark.asyncio
+async def test_router_info_cache() -> None:
+    """Test that merged info is cached and refreshed with etags."""
+    FakeTtsHandler.describe_etags.clear()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        tts_uri = f"unix://{Path(temp_dir) / 'tts.socket'}"
+        tts_server = await _start_server(tts_uri, FakeTtsHandler)
+
+        router = Router({"tts": tts_uri}, pool_size=0)
+        info_cache = await router.get_info()
+        assert [p.name for p in info_cache.info.tts] == ["fake-tts"]
+
+        # Cached
+        assert (await router.get_info()) is info_cache
+        assert FakeTtsHandler.describe_etags == [None]
+
+        # Service answers with info-unchanged
+        router.invalidate_info()
+        assert (await router.get_info()) is info_cache
+        assert FakeTtsHandler.describe_etags == [None, FakeTtsHandler.info_cache.etag]
+        assert [p.name for p in info_cache.info.tts] == ["fake-tts"]
+
+        await router.close()
+        await tts_server.stop()
+
+
+@pytest.mark.asyncio
+async def test_router_missing_backend() -> None:
+    """Test routing to a service that isn't running."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        asr_uri = f"unix://{Path(temp_dir) / 'asr.socket'}"
+        tts_uri = f"unix://{Path(temp_dir) / 'tts.socket'}"
+        router_uri = f"unix://{Path(temp_dir) / 'router.socket'}"
+
+        tts_server = await _start_server(tts_uri, FakeTtsHandler)
+        router = Router({"asr": asr_uri, "tts": tts_uri})
+        router_server = await _start_server(
+            router_uri, partial(RouterEventHandler, router=router)
+        )
+
+        async with AsyncClient.from_uri(router_uri) as client:
+            await client.write_event(Transcribe().event())
+            event = await asyncio.wait_for(client.read_event(), timeout=1)
+            assert event is not None
+            assert Error.from_event(event).code == "no-service"
+
+            # Info of the other services is still available
+            await client.write_event(Describe().event())
+            event = await asyncio.wait_for(client.read_event(), timeout=1)
+            assert event is not None
+            info = Info.from_event(event)
+            assert not info.asr
+            assert [p.name for p in info.tts] == ["fake-tts"]
+
+        await router_server.stop()
+        await router.close()
+        await tts_server.stop()
+
+
+@pytest.mark.asyncio
+async def test_backend_pool_refill_error() -> None:
+    """Test that errors while opening connections ahead of time are logged."""
+    # pylint: disable=protected-access
+    pool = BackendPool("unix:///does-not-exist", size=1)
+
+    async def connect():
+        raise RuntimeError("test")
+
+    pool._connect = connect  # type: ignore[method-assign]
+    pool._start_refill()
+    assert pool._refill_task is not None
+    await pool._refill_task
+    assert pool._refill_task.exception() is None
+
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_router_info_connection_reset() -> None:
+    """Test describe when a pooled connection to a service was reset."""
+
+    class ResetClient:
+        async def write_event(self, event: Event) -> None:
+            raise ConnectionResetError()
+
+        async def disconnect(self) -> None:
+            pass
+
+    async def acquire() -> ResetClient:
+        return ResetClient()
+
+    router = Router({"tts": "unix:///does-not-exist"}, pool_size=0)
+    router.pools["tts"].acquire = acquire  # type: ignore[assignment,method-assign]
+
+    info_cache = await router.get_info()
+    assert not info_cache.info.tts
+
+    await router.close()
+
+
+@pytest.mark.asyncio
+async def test_router_records_describe() -> None:
+    """Test that cached describe responses are recorded."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        asr_uri = f"unix://{Path(temp_dir) / 'asr.socket'}"
+        router_uri = f"unix://{Path(temp_dir) / 'router.socket'}"
+        recording_path = Path(temp_dir) / "router.wyrec"
+
+        asr_server = await _start_server(asr_uri, FakeAsrHandler)
+        router = Router({"asr": asr_uri})
+
+        with EventRecorder(recording_path) as recorder:
+
+            def make_handler(reader, writer) -> RouterEventHandler:
+                handler = RouterEventHandler(reader, writer, router=router)
+                handler.recorder = recorder
+                return handler
+
+            router_server = await _start_server(router_uri, make_handler)
+
+            async with AsyncClient.from_uri(router_uri) as client:
+                await client.write_event(Describe().event())
+                event = await asyncio.wait_for(client.read_event(), timeout=1)
+                assert event is not None
+
+            await router_server.stop()
+
+        await router.close()
+        await asr_server.stop()
+
+        with RecordingReader(recording_path) as reader:
+            recorded_events = list(reader)
+
+        assert [r.direction for r in recorded_events] == [
+            EventDirection.TO_SERVICE,
+            EventDirection.FROM_SERVICE,
+        ]
+        assert Describe.is_type(recorded_events[0].event.type)
+        info = Info.from_event(recorded_events[1].event)
+        assert [p.name for p in info.asr] == ["fake-asr"]
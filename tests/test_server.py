@@ -1,21 +1,34 @@
 """Server tests."""
 import asyncio
+import io
 import socket
 import tempfile
 from pathlib import Path
+from typing import List, Optional
 
 import pytest
 
+from wyoming.audio import AudioChunk, AudioStart, AudioStop
 from wyoming.client import AsyncClient
-from wyoming.event import Event
+from wyoming.event import Event, PayloadStream, write_event
 from wyoming.ping import Ping, Pong
 from wyoming.server import (
     AsyncEventHandler,
+    AsyncInprocServer,
     AsyncServer,
+    AsyncShmServer,
     AsyncStdioServer,
     AsyncTcpServer,
+    AsyncUdpServer,
     AsyncUnixServer,
 )
+from wyoming.udp import DEFAULT_JITTER_MS
+
+
+class EchoHandler(AsyncEventHandler):
+    async def handle_event(self, event: Event) -> bool:
+        await self.write_event(event)
+        return True
 
 
 class PingHandler(AsyncEventHandler):
@@ -28,6 +41,70 @@ class PingHandler(AsyncEventHandler):
         return True
 
 
+class PayloadSizeHandler(AsyncEventHandler):
+    """Replies with the size of each chunk of large payloads."""
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.stream_payload_length = 1024
+
+    async def handle_event(self, event: Event) -> bool:
+        await self.write_event(Event("size", {"sizes": [len(event.payload or b"")]}))
+        return True
+
+    async def handle_event_stream(self, event: Event, payload: PayloadStream) -> bool:
+        sizes = [len(chunk) async for chunk in payload]
+        await self.write_event(Event("size", {"sizes": sizes}))
+        return True
+
+
+class CountHandler(AsyncEventHandler):
+    """Counts events slowly without replying."""
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.num_events = 0
+        self.is_disconnected = asyncio.Event()
+
+    async def handle_event(self, event: Event) -> bool:
+        await asyncio.sleep(0.001)
+        self.num_events += 1
+        return True
+
+    async def disconnect(self) -> None:
+        self.is_disconnected.set()
+
+
+class SmallPayloadHandler(CountHandler):
+    """Counts events with payloads up to 10 bytes."""
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.max_payload_length = 10
+
+
+class StreamHandler(AsyncEventHandler):
+    """Streams many events back for each event."""
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.num_written = 0
+        self.error: Optional[Exception] = None
+        self.is_done = asyncio.Event()
+
+    async def handle_event(self, event: Event) -> bool:
+        try:
+            for _ in range(1000):
+                await self.write_event(event)
+                self.num_written += 1
+        except ConnectionResetError as err:
+            self.error = err
+        finally:
+            self.is_done.set()
+
+        return False
+
+
 def test_from_uri() -> None:
     """Test AsyncServer.from_uri"""
     # Bad scheme
@@ -54,6 +131,24 @@ def test_from_uri() -> None:
     assert isinstance(unix_server, AsyncUnixServer)
     assert unix_server.socket_path == Path("/path/to/socket")
 
+    shm_server = AsyncServer.from_uri("shm:///path/to/socket")
+    assert isinstance(shm_server, AsyncShmServer)
+    assert shm_server.socket_path == Path("/path/to/socket")
+
+    inproc_server = AsyncServer.from_uri("inproc://test")
+    assert isinstance(inproc_server, AsyncInprocServer)
+    assert inproc_server.name == "test"
+
+    udp_server = AsyncServer.from_uri("udp://127.0.0.1:5000")
+    assert isinstance(udp_server, AsyncUdpServer)
+    assert udp_server.host == "127.0.0.1"
+    assert udp_server.port == 5000
+    assert udp_server.jitter_ms == DEFAULT_JITTER_MS
+
+    udp_server = AsyncServer.from_uri("udp://127.0.0.1:5000?jitter_ms=100")
+    assert isinstance(udp_server, AsyncUdpServer)
+    assert udp_server.jitter_ms == 100
+
 
 @pytest.mark.asyncio
 async def test_unix_server() -> None:
@@ -81,6 +176,62 @@ async def test_unix_server() -> None:
         await unix_server.stop()
 
 
+@pytest.mark.asyncio
+async def test_event_too_large() -> None:
+    """Test disconnecting a client that sends an event over the limit."""
+    handlers: List[SmallPayloadHandler] = []
+
+    def make_handler(*args) -> SmallPayloadHandler:
+        handlers.append(SmallPayloadHandler(*args))
+        return handlers[-1]
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        socket_path = Path(temp_dir) / "test.socket"
+        uri = f"unix://{socket_path}"
+        unix_server = AsyncServer.from_uri(uri)
+        await unix_server.start(make_handler)
+
+        # Wait for path to exist
+        while not socket_path.exists():
+            await asyncio.sleep(0.1)
+
+        async with AsyncClient.from_uri(uri) as client:
+            await client.write_event(Event(type="small", payload=bytes(10)))
+            await client.write_event(Event(type="large", payload=bytes(11)))
+
+            # Server closes the connection
+            assert await asyncio.wait_for(client.read_event(), timeout=1) is None
+
+        assert handlers[0].is_disconnected.is_set()
+        assert handlers[0].num_events == 1
+
+        await unix_server.stop()
+
+
+@pytest.mark.asyncio
+async def test_stream_payload() -> None:
+    """Test handling large payloads in chunks."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        socket_path = Path(temp_dir) / "test.socket"
+        uri = f"unix://{socket_path}"
+        unix_server = AsyncServer.from_uri(uri)
+        await unix_server.start(PayloadSizeHandler)
+
+        # Wait for path to exist
+        while not socket_path.exists():
+            await asyncio.sleep(0.1)
+
+        async with AsyncClient.from_uri(uri) as client:
+            for payload_length in (100, 200_000, 10):
+                await client.write_event(Event("test", payload=bytes(payload_length)))
+                event = await asyncio.wait_for(client.read_event(), timeout=1)
+                assert event is not None
+                assert sum(event.data["sizes"]) == payload_length
+                assert len(event.data["sizes"]) == (4 if payload_length > 1024 else 1)
+
+        await unix_server.stop()
+
+
 @pytest.mark.asyncio
 async def test_tcp_server() -> None:
     """Test sending events to and from a TCP server."""
@@ -115,3 +266,260 @@ async def test_tcp_server() -> None:
 
     await client.disconnect()
     await tcp_server.stop()
+
+
+@pytest.mark.asyncio
+async def test_shm_server() -> None:
+    """Test sending audio through shared memory."""
+    # pylint: disable=protected-access
+    with tempfile.TemporaryDirectory() as temp_dir:
+        socket_path = Path(temp_dir) / "test.socket"
+        uri = f"shm://{socket_path}"
+        shm_server = AsyncServer.from_uri(uri)
+        await shm_server.start(EchoHandler)
+
+        # Wait for path to exist
+        while not socket_path.exists():
+            await asyncio.sleep(0.1)
+
+        async with AsyncClient.from_uri(uri) as client:
+            # Small payloads are sent inline
+            chunks = [
+                AudioChunk(
+                    rate=16000,
+                    width=2,
+                    channels=1,
+                    audio=bytes([i]) * (2048 if (i % 2) == 0 else 8),
+                    timestamp=i,
+                )
+                for i in range(100)
+            ]
+            for chunk in chunks:
+                await client.write_event(chunk.event())
+
+            for chunk in chunks:
+                event = await asyncio.wait_for(client.read_event(), timeout=1)
+                assert event is not None
+                assert AudioChunk.from_event(event) == chunk
+
+            assert client._writer is not None
+            assert getattr(client._writer, "_ring") is not None
+
+        await shm_server.stop()
+
+
+@pytest.mark.asyncio
+async def test_shm_server_releases_memory() -> None:
+    """Test that shared memory is unlinked after clients disconnect."""
+
+    def count_segments() -> int:
+        return len(list(Path("/dev/shm").glob("wyoming_*")))
+
+    if not Path("/dev/shm").is_dir():
+        pytest.skip("No /dev/shm")
+
+    num_segments = count_segments()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        socket_path = Path(temp_dir) / "test.socket"
+        uri = f"shm://{socket_path}"
+        shm_server = AsyncServer.from_uri(uri)
+
+        # Keep handlers alive so memory isn't released by garbage collection
+        handlers: List[EchoHandler] = []
+
+        def make_handler(*args) -> EchoHandler:
+            handlers.append(EchoHandler(*args))
+            return handlers[-1]
+
+        await shm_server.start(make_handler)
+
+        while not socket_path.exists():
+            await asyncio.sleep(0.1)
+
+        for _ in range(5):
+            async with AsyncClient.from_uri(uri) as client:
+                chunk = AudioChunk(rate=16000, width=2, channels=1, audio=bytes(2048))
+                await client.write_event(chunk.event())
+                event = await asyncio.wait_for(client.read_event(), timeout=1)
+                assert event is not None
+                assert AudioChunk.from_event(event) == chunk
+
+        await shm_server.stop()
+
+    assert count_segments() == num_segments
+
+
+@pytest.mark.asyncio
+async def test_inproc_server() -> None:
+    """Test passing events in the same process."""
+    # pylint: disable=protected-access
+    uri = "inproc://test"
+    inproc_server = AsyncServer.from_uri(uri)
+    await inproc_server.start(EchoHandler)
+
+    # Name is taken
+    with pytest.raises(ValueError):
+        await AsyncServer.from_uri(uri).start(EchoHandler)
+
+    async with AsyncClient.from_uri(uri) as client:
+        # Events are passed without serialization
+        chunk_event = AudioChunk(
+            rate=16000, width=2, channels=1, audio=bytes(2048)
+        ).event()
+        await client.write_event(chunk_event)
+        event = await asyncio.wait_for(client.read_event(), timeout=1)
+        assert event is chunk_event
+
+        # Encoded events are decoded
+        assert client._writer is not None
+        with io.BytesIO() as event_io:
+            write_event(Ping(text="test").event(), event_io)
+            client._writer.write(event_io.getvalue())
+        await client._writer.drain()
+        event = await asyncio.wait_for(client.read_event(), timeout=1)
+        assert event is not None
+        assert Ping.from_event(event).text == "test"
+
+    await inproc_server.stop()
+
+    # Server is gone
+    with pytest.raises(ConnectionRefusedError):
+        async with AsyncClient.from_uri(uri):
+            pass
+
+
+@pytest.mark.asyncio
+async def test_inproc_disconnect_full_queue() -> None:
+    """Test that the handler gets every event and the end of a full stream."""
+    # pylint: disable=protected-access
+    uri = "inproc://test-full"
+    inproc_server = AsyncServer.from_uri(uri)
+    handlers: List[CountHandler] = []
+
+    def make_handler(*args) -> CountHandler:
+        handlers.append(CountHandler(*args))
+        return handlers[-1]
+
+    await inproc_server.start(make_handler)
+
+    async with AsyncClient.from_uri(uri) as client:
+        # More events than the queue holds, without waiting for the handler
+        assert client._writer is not None
+        with io.BytesIO() as event_io:
+            write_event(Ping().event(), event_io)
+            ping_bytes = event_io.getvalue()
+
+        for _ in range(400):
+            client._writer.write(ping_bytes)
+
+    await asyncio.wait_for(handlers[0].is_disconnected.wait(), timeout=5)
+    assert handlers[0].num_events == 400
+
+    await inproc_server.stop()
+
+
+@pytest.mark.asyncio
+async def test_inproc_write_after_disconnect() -> None:
+    """Test a service writing to a client that has gone away."""
+    uri = "inproc://test-gone"
+    inproc_server = AsyncServer.from_uri(uri)
+    handlers: List[StreamHandler] = []
+
+    def make_handler(*args) -> StreamHandler:
+        handlers.append(StreamHandler(*args))
+        return handlers[-1]
+
+    await inproc_server.start(make_handler)
+
+    async with AsyncClient.from_uri(uri) as client:
+        await client.write_event(Ping().event())
+        assert await asyncio.wait_for(client.read_event(), timeout=1) is not None
+
+    await asyncio.wait_for(handlers[0].is_done.wait(), timeout=1)
+    assert isinstance(handlers[0].error, ConnectionResetError)
+    assert handlers[0].num_written < 1000
+
+    # Stopping the server unblocks a handler whose client isn't reading
+    async with AsyncClient.from_uri(uri) as client:
+        await client.write_event(Ping().event())
+        while handlers[1].num_written < 10:
+            await asyncio.sleep(0.01)
+
+        await inproc_server.stop()
+        await asyncio.wait_for(handlers[1].is_done.wait(), timeout=1)
+        assert isinstance(handlers[1].error, ConnectionResetError)
+
+
+@pytest.mark.asyncio
+async def test_udp_server() -> None:
+    """Test sending audio over UDP with other events over TCP."""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.bind(("127.0.0.1", 0))
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    port = sock.getsockname()[1]
+    sock.close()
+
+    uri = f"udp://127.0.0.1:{port}"
+    udp_server = AsyncServer.from_uri(uri)
+    await udp_server.start(EchoHandler)
+
+    async with AsyncClient.from_uri(uri) as client:
+        chunks = [
+            AudioChunk(
+                rate=16000, width=2, channels=1, audio=bytes([i]) * 640, timestamp=i
+            )
+            for i in range(50)
+        ]
+        await client.write_event(AudioStart(rate=16000, width=2, channels=1).event())
+        for chunk in chunks:
+            await client.write_event(chunk.event())
+
+        # Sent over TCP, but received after the audio
+        await client.write_event(AudioStop().event())
+
+        event = await asyncio.wait_for(client.read_event(), timeout=1)
+        assert event is not None
+        assert AudioStart.is_type(event.type)
+
+        for chunk in chunks:
+            event = await asyncio.wait_for(client.read_event(), timeout=1)
+            assert event is not None
+            assert AudioChunk.from_event(event) == chunk
+
+        event = await asyncio.wait_for(client.read_event(), timeout=1)
+        assert event is not None
+        assert AudioStop.is_type(event.type)
+
+    await udp_server.stop()
+
+
+@pytest.mark.asyncio
+async def test_udp_event_too_large() -> None:
+    """Test disconnecting a UDP client that sends an event over the limit."""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.bind(("127.0.0.1", 0))
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    port = sock.getsockname()[1]
+    sock.close()
+
+    handlers: List[SmallPayloadHandler] = []
+
+    def make_handler(*args) -> SmallPayloadHandler:
+        handlers.append(SmallPayloadHandler(*args))
+        return handlers[-1]
+
+    uri = f"udp://127.0.0.1:{port}"
+    udp_server = AsyncServer.from_uri(uri)
+    await udp_server.start(make_handler)
+
+    async with AsyncClient.from_uri(uri) as client:
+        await client.write_event(Event(type="small", payload=bytes(10)))
+        await client.write_event(Event(type="large", payload=bytes(11)))
+
+        # Server closes the connection
+        assert await asyncio.wait_for(client.read_event(), timeout=1) is None
+
+    await asyncio.wait_for(handlers[0].is_disconnected.wait(), timeout=1)
+    assert handlers[0].num_events == 1
+
+    await udp_server.stop()
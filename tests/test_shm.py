@@ -0,0 +1,70 @@
+"""Shared memory transport tests."""
+import asyncio
+import json
+import secrets
+import struct
+
+import pytest
+
+from wyoming.event import async_read_event
+from wyoming.shm import SharedMemoryRing, ShmStreamReader
+
+
+def test_ring_get() -> None:
+    """Test that payloads outside the ring are rejected."""
+    ring = SharedMemoryRing.create(capacity=1024)
+    try:
+        shm_payload = ring.put(b"test")
+        assert shm_payload is not None
+        name, position, length = shm_payload
+
+        reader_ring = SharedMemoryRing.attach(name)
+        try:
+            assert reader_ring.capacity == 1024
+            assert reader_ring.get(position, length) == b"test"
+
+            for bad_position, bad_length in ((0, 1025), (1000, 100), (-1, 4), (0, -1)):
+                with pytest.raises(ValueError):
+                    reader_ring.get(bad_position, bad_length)
+        finally:
+            reader_ring.close()
+    finally:
+        ring.close()
+
+
+def test_ring_attach() -> None:
+    """Test that only valid Wyoming rings can be attached."""
+    for name in ("psm_other", "wyoming_../x", "", 1234):
+        with pytest.raises(ValueError):
+            SharedMemoryRing.attach(name)  # type: ignore[arg-type]
+
+    # Doesn't exist
+    with pytest.raises(ValueError):
+        SharedMemoryRing.attach(f"wyoming_{secrets.token_hex(8)}")
+
+    # Zero capacity
+    ring = SharedMemoryRing.create(capacity=1024)
+    try:
+        assert ring.shm.buf is not None
+        struct.pack_into("<QQ", ring.shm.buf, 0, 0, 0)
+        with pytest.raises(ValueError):
+            SharedMemoryRing.attach(ring.name)
+    finally:
+        ring.close()
+
+
+@pytest.mark.asyncio
+async def test_read_bad_shared_payload() -> None:
+    """Test that a bad shared memory payload ends the read cleanly."""
+    reader = ShmStreamReader()
+    for payload_shm in (
+        ["/etc/passwd", 0, 10],
+        [f"wyoming_{secrets.token_hex(8)}", 0, 10],
+        ["wyoming_00", 0],
+        "wyoming_00",
+    ):
+        header = {"type": "audio-chunk", "payload_shm": payload_shm}
+        reader.feed_data(json.dumps(header).encode() + b"\n")
+        assert await asyncio.wait_for(async_read_event(reader), timeout=1) is None
+
+    reader.close_shared_memory()
@@ -0,0 +1,84 @@
+"""UDP transport tests."""
+from wyoming.audio import AudioChunk
+from wyoming.event import Event
+from wyoming.udp import JitterBuffer
+
+
+def _chunk_event(timestamp: int):
+    return AudioChunk(
+        rate=16000, width=2, channels=1, audio=b"\x01\x00" * 160, timestamp=timestamp
+    ).event()
+
+
+def test_jitter_buffer() -> None:
+    """Test reordering and filling in lost chunks."""
+    jitter_buffer = JitterBuffer(max_delay_ms=50)
+
+    # In order
+    jitter_buffer.put(0, _chunk_event(0), now=0)
+    assert [e.data["timestamp"] for _s, e in jitter_buffer.get(now=0)] == [0]
+
+    # Out of order
+    jitter_buffer.put(2, _chunk_event(20), now=0.01)
+    assert not jitter_buffer.get(now=0.01)
+    jitter_buffer.put(1, _chunk_event(10), now=0.02)
+    assert [e.data["timestamp"] for _s, e in jitter_buffer.get(now=0.02)] == [10, 20]
+
+    # Lost (chunk 3)
+    jitter_buffer.put(4, _chunk_event(40), now=0.03)
+    assert not jitter_buffer.get(now=0.07)
+    events = jitter_buffer.get(now=0.08)
+    assert [e.data["timestamp"] for _s, e in events] == [30, 40]
+    assert events[0][1].payload == bytes(320)
+    assert jitter_buffer.num_lost == 1
+
+    # Too late
+    jitter_buffer.put(3, _chunk_event(30), now=0.09)
+    assert jitter_buffer.num_late == 1
+
+    # Lost at the end, before a control event
+    events = jitter_buffer.get(now=0.1, until_sequence=7)
+    assert [e.data["timestamp"] for _s, e in events] == [50, 60]
+    assert jitter_buffer.next_sequence == 7
+
+
+def test_jitter_buffer_resync() -> None:
+    """Test skipping a long gap in sequence numbers without silence."""
+    jitter_buffer = JitterBuffer(max_delay_ms=50, max_gap=2)
+    jitter_buffer.put(0, _chunk_event(0), now=0)
+    jitter_buffer.put(2**40, _chunk_event(10), now=0)
+
+    events = jitter_buffer.get(now=0.1)
+    assert [e.data["timestamp"] for _s, e in events] == [0, 10]
+    assert jitter_buffer.next_sequence == (2**40) + 1
+    assert jitter_buffer.num_lost == (2**40) - 1
+
+    # Short gaps are still filled in
+    jitter_buffer.put((2**40) + 3, _chunk_event(40), now=0.1)
+    events = jitter_buffer.get(now=0.2)
+    assert [e.data["timestamp"] for _s, e in events] == [20, 30, 40]
+
+    # Also for gaps before a control event
+    assert not jitter_buffer.get(now=0.3, until_sequence=2**50)
+    assert jitter_buffer.next_sequence == 2**50
+
+
+def test_jitter_buffer_other_events() -> None:
+    """Test that non-audio events keep their place but aren't used for silence."""
+    jitter_buffer = JitterBuffer(max_delay_ms=50)
+    jitter_buffer.put(0, Event(type="not-audio"), now=0)
+    jitter_buffer.put(2, _chunk_event(20), now=0)
+    jitter_buffer.put(3, Event(type="audio-chunk"), now=0)
+    jitter_buffer.put(5, _chunk_event(50), now=0)
+
+    events = jitter_buffer.get(now=0.1)
+    assert [e.type for _s, e in events] == [
+        "not-audio",
+        "audio-chunk",  # silence
+        "audio-chunk",
+        "audio-chunk",  # malformed, passed on
+        "audio-chunk",  # silence
+        "audio-chunk",
+    ]
+    assert events[1][1].payload == bytes(320)
+    assert events[4][1].data["timestamp"] == 30
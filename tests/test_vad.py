@@ -0,0 +1,121 @@
+"""Tests for voice activity detection."""
+import array
+import math
+import random
+import sys
+from typing import List, Union
+
+import pytest
+
+import wyoming.vad
+from wyoming.audio import AudioChunk
+from wyoming.vad import EnergyVad, VoiceStarted, VoiceStopped
+
+RATE = 16000
+
+
+def _make_audio(milliseconds: int, amplitude: float, kind: str = "tone") -> bytes:
+    rng = random.Random(milliseconds)
+    num_samples = (RATE * milliseconds) // 1000
+    if kind == "tone":
+        samples = [
+            int(amplitude * math.sin(2 * math.pi * 200 * (i / RATE)))
+            for i in range(num_samples)
+        ]
+    else:
+        samples = [int(rng.uniform(-amplitude, amplitude)) for _ in range(num_samples)]
+
+    audio = array.array("h", samples)
+    if sys.byteorder != "little":
+        audio.byteswap()
+
+    return audio.tobytes()
+
+
+def _run_vad(
+    vad: EnergyVad, audio: bytes, chunk_bytes: int = 1000
+) -> List[Union[VoiceStarted, VoiceStopped]]:
+    events: List[Union[VoiceStarted, VoiceStopped]] = []
+    for offset in range(0, len(audio), chunk_bytes):
+        events.extend(
+            vad.process(
+                AudioChunk(
+                    rate=RATE,
+                    width=2,
+                    channels=1,
+                    audio=audio[offset : offset + chunk_bytes],
+                    timestamp=0 if offset == 0 else None,
+                )
+            )
+        )
+
+    voice_stopped = vad.flush()
+    if voice_stopped is not None:
+        events.append(voice_stopped)
+
+    return events
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_energy_vad(use_numpy: bool, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test voice started/stopped timestamps."""
+    if use_numpy:
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(wyoming.vad, "get_numpy", lambda: None)
+
+    # 1 sec of quiet noise, 500 ms of "speech", 1 sec of quiet noise
+    audio = (
+        _make_audio(1000, 100, "noise")
+        + _make_audio(500, 8000)
+        + _make_audio(1000, 100, "noise")
+    )
+
+    events = _run_vad(EnergyVad(), audio)
+    assert len(events) == 2
+    assert isinstance(events[0], VoiceStarted)
+    assert isinstance(events[1], VoiceStopped)
+    assert events[0].timestamp is not None
+    assert events[1].timestamp is not None
+    assert abs(events[0].timestamp - 1000) <= 10
+    assert abs(events[1].timestamp - 1500) <= 10
+
+    # Pre-roll moves start earlier
+    events = _run_vad(EnergyVad(pre_roll_ms=200), audio)
+    assert isinstance(events[0], VoiceStarted)
+    assert events[0].timestamp is not None
+    assert abs(events[0].timestamp - 800) <= 10
+
+    # Speech at end of audio is stopped by flush
+    events = _run_vad(EnergyVad(), audio[: len(audio) // 2])
+    assert [type(event) for event in events] == [VoiceStarted, VoiceStopped]
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_energy_vad_rejects_noise(
+    use_numpy: bool, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that short clicks and loud broadband noise aren't speech."""
+    if use_numpy:
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(wyoming.vad, "get_numpy", lambda: None)
+
+    # Shorter than activation time
+    audio = (
+        _make_audio(500, 100, "noise")
+        + _make_audio(30, 8000)
+        + _make_audio(500, 100, "noise")
+    )
+    assert not _run_vad(EnergyVad(), audio)
+
+    # High zero-crossing rate
+    audio = _make_audio(500, 100, "noise") + _make_audio(500, 8000, "noise")
+    assert not _run_vad(EnergyVad(), audio)
+
+    # Audio that is already loud at the start sets the noise floor
+    audio = _make_audio(3000, 300)
+    vad = EnergyVad()
+    _run_vad(vad, audio)
+    assert vad.noise_floor_db is not None
+    assert not vad.is_speech
@@ -0,0 +1,76 @@
+"""WebSocket bridge tests."""
+import asyncio
+import json
+import tempfile
+from functools import partial
+from pathlib import Path
+
+import pytest
+
+from wyoming.audio import AudioChunk, AudioStart, AudioStop
+from wyoming.event import Event
+from wyoming.server import AsyncEventHandler, AsyncServer
+
+websockets = pytest.importorskip("websockets")
+
+# pylint: disable=wrong-import-position
+from wyoming.http.websocket_server import handle_websocket  # noqa: E402
+
+
+class EchoAudioHandler(AsyncEventHandler):
+    """Sends audio back to the client."""
+
+    async def handle_event(self, event: Event) -> bool:
+        if (
+            AudioStart.is_type(event.type)
+            or AudioChunk.is_type(event.type)
+            or AudioStop.is_type(event.type)
+        ):
+            await self.write_event(event)
+
+        return True
+
+
+@pytest.mark.asyncio
+async def test_websocket_round_trip() -> None:
+    """Test audio through the bridge and back, with a malformed frame."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        uri = f"unix://{Path(temp_dir) / 'test.socket'}"
+        server = AsyncServer.from_uri(uri)
+        await server.start(EchoAudioHandler)
+
+        async with websockets.serve(
+            partial(handle_websocket, uri=uri), "127.0.0.1", 0
+        ) as ws_server:
+            port = next(iter(ws_server.sockets)).getsockname()[1]
+            async with websockets.connect(f"ws://127.0.0.1:{port}") as websocket:
+                # Malformed JSON is reported without disconnecting
+                await websocket.send("{not json")
+                message = json.loads(
+                    await asyncio.wait_for(websocket.recv(), timeout=1)
+                )
+                assert message["type"] == "error"
+
+                await websocket.send(
+                    json.dumps(
+                        AudioStart(rate=22050, width=2, channels=1).event().to_dict()
+                    )
+                )
+                message = json.loads(
+                    await asyncio.wait_for(websocket.recv(), timeout=1)
+                )
+                assert message["type"] == "audio-start"
+                assert message["data"]["rate"] == 22050
+
+                # Binary frames are audio chunks
+                await websocket.send(bytes(range(10)))
+                audio = await asyncio.wait_for(websocket.recv(), timeout=1)
+                assert audio == bytes(range(10))
+
+                await websocket.send(json.dumps(AudioStop().event().to_dict()))
+                message = json.loads(
+                    await asyncio.wait_for(websocket.recv(), timeout=1)
+                )
+                assert message["type"] == "audio-stop"
+
+        await server.stop()
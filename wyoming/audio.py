@@ -1,10 +1,26 @@
 """Audio input/output."""
 import argparse
+import array
 import io
+import math
+import mmap
+import struct
 import sys
 import wave
+from collections import deque
 from dataclasses import dataclass
-from typing import Iterable, Optional, Union
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Deque,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
 
 try:
     # Use built-in audioop until it's removed in Python 3.13
@@ -14,12 +30,48 @@ except ImportError:
 
 from .event import Event, Eventable
 from .util.dataclasses_json import DataClassJsonMixin
+from .util.dataclasses_slots import add_slots
+from .util.numpy_support import get_numpy
+
+if TYPE_CHECKING:
+    import numpy as np
 
 _CHUNK_TYPE = "audio-chunk"
 _START_TYPE = "audio-start"
 _STOP_TYPE = "audio-stop"
 
+SAMPLE_FORMAT_INT = "int"
+"""Signed integer samples (default)."""
+
+SAMPLE_FORMAT_FLOAT = "float"
+"""32-bit float samples in [-1, 1] (width = 4)."""
+
+ENCODING_MULAW = "mulaw"
+"""8-bit u-law (G.711), 2x smaller than 16-bit PCM."""
+
+ENCODING_ALAW = "alaw"
+"""8-bit A-law (G.711), 2x smaller than 16-bit PCM."""
+
+ENCODING_IMA_ADPCM = "ima-adpcm"
+"""4-bit IMA-ADPCM, 4x smaller than 16-bit PCM."""
+
+# Samples used to estimate the initial ADPCM step size of each chunk
+_ADPCM_WARMUP_SAMPLES = 32
+
+_WAVE_FORMAT_PCM = 0x0001
+_WAVE_FORMAT_IEEE_FLOAT = 0x0003
+_WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+# RIFF header, fmt chunk, and data chunk header of a PCM WAV file
+_STREAMING_WAV_HEADER = struct.Struct("<4sI4s4sIHHIIHH4sI")
+_UNKNOWN_WAV_SIZE = 0xFFFFFFFF
 
+# width -> numpy dtype
+_INT_DTYPES = {1: "<i1", 2: "<i2", 4: "<i4"}
+_FLOAT_DTYPE = "<f4"
+
+
+@add_slots
 @dataclass
 class AudioFormat(DataClassJsonMixin):
     """Base class for events with audio format information."""
@@ -34,6 +86,7 @@ class AudioFormat(DataClassJsonMixin):
     """Mono = 1"""
 
 
+@add_slots
 @dataclass
 class AudioChunk(AudioFormat, Eventable):
     """Chunk of raw PCM audio."""
@@ -44,32 +97,141 @@ class AudioChunk(AudioFormat, Eventable):
     timestamp: Optional[int] = None
     """Milliseconds"""
 
+    sample_format: Optional[str] = None
+    """Format of samples (None = int)."""
+
+    encoding: Optional[str] = None
+    """Encoding of the payload when sent (None = raw PCM).
+
+    Audio is encoded by event() and decoded to 16-bit samples by from_event(),
+    so it is always raw PCM here.
+    """
+
     @staticmethod
     def is_type(event_type: str) -> bool:
         return event_type == _CHUNK_TYPE
 
     def event(self) -> Event:
-        return Event(
-            type=_CHUNK_TYPE,
-            data={
-                "rate": self.rate,
-                "width": self.width,
-                "channels": self.channels,
-                "timestamp": self.timestamp,
-            },
-            payload=self.audio,
-        )
+        data: Dict[str, Any] = {
+            "rate": self.rate,
+            "width": self.width,
+            "channels": self.channels,
+            "timestamp": self.timestamp,
+        }
+
+        if self.encoding:
+            data["width"] = 2
+            data["encoding"] = self.encoding
+            payload = _encode_audio(self, data)
+        else:
+            payload = self.audio
+            if self.is_float:
+                data["sample_format"] = self.sample_format
+
+        return Event(type=_CHUNK_TYPE, data=data, payload=payload)
 
     @staticmethod
     def from_event(event: Event) -> "AudioChunk":
         assert event.data is not None
 
+        audio = event.payload or bytes()
+        encoding = event.data.get("encoding")
+        if encoding:
+            audio = _decode_audio(audio, event.data)
+
         return AudioChunk(
             rate=event.data["rate"],
             width=event.data["width"],
             channels=event.data["channels"],
-            audio=event.payload or bytes(),
+            audio=audio,
             timestamp=event.data.get("timestamp"),
+            sample_format=event.data.get("sample_format"),
+            encoding=encoding,
+        )
+
+    @property
+    def is_float(self) -> bool:
+        """True if samples are 32-bit floats."""
+        return self.sample_format == SAMPLE_FORMAT_FLOAT
+
+    def as_array(self, dtype: Optional[Any] = None) -> "np.ndarray":
+        """Get audio as a numpy array with shape (samples,) or (samples, channels).
+
+        Without a dtype, the array is a read-only view of the audio (no copy).
+        With a float dtype, integer samples are scaled to [-1, 1].
+
+        Requires numpy.
+        """
+        np = get_numpy()
+        if np is None:
+            raise ImportError("pip install numpy")
+
+        if self.is_float:
+            audio_array = np.frombuffer(self.audio, dtype=_FLOAT_DTYPE)
+        else:
+            audio_array = np.frombuffer(self.audio, dtype=_INT_DTYPES[self.width])
+
+        if self.channels > 1:
+            audio_array = audio_array.reshape((-1, self.channels))
+
+        if (dtype is None) or (np.dtype(dtype) == audio_array.dtype):
+            return audio_array
+
+        if np.dtype(dtype).kind != "f":
+            raise ValueError(f"Only float dtypes are supported, got {dtype}")
+
+        float_array = audio_array.astype(dtype)
+        if not self.is_float:
+            float_array /= _get_max_value(self.width) + 1
+
+        return float_array
+
+    @staticmethod
+    def from_array(
+        audio_array: "np.ndarray",
+        rate: int,
+        timestamp: Optional[int] = None,
+    ) -> "AudioChunk":
+        """Create chunk from a numpy array with shape (samples,) or (samples, channels).
+
+        Width, channels, and sample format are taken from the array.
+        Contiguous int8/16/32 and float32 arrays are not copied, so audio will
+        be a memoryview of the array. Other float arrays are converted to
+        float32.
+
+        Requires numpy.
+        """
+        np = get_numpy()
+        if np is None:
+            raise ImportError("pip install numpy")
+
+        if audio_array.ndim == 1:
+            channels = 1
+        elif audio_array.ndim == 2:
+            channels = audio_array.shape[1]
+        else:
+            raise ValueError(f"Expected 1 or 2 dimensions, got {audio_array.ndim}")
+
+        sample_format: Optional[str] = None
+        if audio_array.dtype.kind == "f":
+            audio_array = np.ascontiguousarray(audio_array, dtype=_FLOAT_DTYPE)
+            sample_format = SAMPLE_FORMAT_FLOAT
+        elif (audio_array.dtype.kind == "i") and (
+            audio_array.dtype.itemsize in _INT_DTYPES
+        ):
+            audio_array = np.ascontiguousarray(
+                audio_array, dtype=_INT_DTYPES[audio_array.dtype.itemsize]
+            )
+        else:
+            raise ValueError(f"Unsupported dtype: {audio_array.dtype}")
+
+        return AudioChunk(
+            rate=rate,
+            width=audio_array.dtype.itemsize,
+            channels=channels,
+            audio=memoryview(audio_array).cast("B"),  # type: ignore[arg-type]
+            timestamp=timestamp,
+            sample_format=sample_format,
         )
 
     @property
@@ -85,6 +247,7 @@ class AudioChunk(AudioFormat, Eventable):
         return int(self.seconds * 1_000)
 
 
+@add_slots
 @dataclass
 class AudioStart(AudioFormat, Eventable):
     """Audio stream has started."""
@@ -92,20 +255,30 @@ class AudioStart(AudioFormat, Eventable):
     timestamp: Optional[int] = None
     """Milliseconds"""
 
+    sample_format: Optional[str] = None
+    """Format of samples in the stream (None = int)."""
+
+    encoding: Optional[str] = None
+    """Encoding of audio chunk payloads in the stream (None = raw PCM)."""
+
     @staticmethod
     def is_type(event_type: str) -> bool:
         return event_type == _START_TYPE
 
     def event(self) -> Event:
-        return Event(
-            type=_START_TYPE,
-            data={
-                "rate": self.rate,
-                "width": self.width,
-                "channels": self.channels,
-                "timestamp": self.timestamp,
-            },
-        )
+        data: Dict[str, Any] = {
+            "rate": self.rate,
+            "width": self.width,
+            "channels": self.channels,
+            "timestamp": self.timestamp,
+        }
+        if self.sample_format == SAMPLE_FORMAT_FLOAT:
+            data["sample_format"] = self.sample_format
+
+        if self.encoding:
+            data["encoding"] = self.encoding
+
+        return Event(type=_START_TYPE, data=data)
 
     @staticmethod
     def from_event(event: Event) -> "AudioStart":
@@ -115,9 +288,12 @@ class AudioStart(AudioFormat, Eventable):
             width=event.data["width"],
             channels=event.data["channels"],
             timestamp=event.data.get("timestamp"),
+            sample_format=event.data.get("sample_format"),
+            encoding=event.data.get("encoding"),
         )
 
 
+@add_slots
 @dataclass
 class AudioStop(Eventable):
     """Audio stream has stopped."""
@@ -151,16 +327,33 @@ class AudioChunkConverter:
 
     def convert(self, chunk: AudioChunk) -> AudioChunk:
         """Converts sample rate, width, and channels as necessary."""
+        if (self.rate is None) and (self.width is None) and (self.channels is None):
+            # No conversion requested, including from float samples
+            return chunk
+
         if (
             ((self.rate is None) or (chunk.rate == self.rate))
             and ((self.width is None) or (chunk.width == self.width))
             and ((self.channels is None) or (chunk.channels == self.channels))
+            and (not chunk.is_float)
         ):
             return chunk
 
         audio_bytes = chunk.audio
         width = chunk.width
 
+        if chunk.is_float:
+            # Convert to integer samples first
+            width = self.width or chunk.width
+            audio_bytes = _float_to_int(audio_bytes, width)
+            chunk = AudioChunk(
+                chunk.rate,
+                width,
+                chunk.channels,
+                audio_bytes,
+                timestamp=chunk.timestamp,
+            )
+
         if (self.width is not None) and (chunk.width != self.width):
             # Convert sample width
             audio_bytes = audioop.lin2lin(audio_bytes, chunk.width, self.width)
@@ -200,14 +393,625 @@ class AudioChunkConverter:
         )
 
 
+class AudioRechunker:
+    """Splits audio chunks of any size into fixed-size frames.
+
+    Frames are memoryview slices of the input audio. Only a frame that spans
+    two input chunks is assembled in a preallocated buffer (and copied out),
+    so there is no concatenation of audio per frame.
+
+    Frame timestamps are computed from the sample offset within the input
+    chunk, so they stay accurate even when chunk sizes don't line up.
+    """
+
+    def __init__(self, samples_per_frame: int) -> None:
+        if samples_per_frame < 1:
+            raise ValueError("samples_per_frame must be at least 1")
+
+        self.samples_per_frame = samples_per_frame
+
+        self._rate = 0
+        self._width = 0
+        self._channels = 0
+        self._sample_format: Optional[str] = None
+        self._bytes_per_sample = 0
+        self._bytes_per_frame = 0
+
+        self._buffer = bytearray()
+        self._buffer_length = 0
+        self._buffer_timestamp = 0.0
+        self._next_timestamp = 0.0
+
+    def process(self, chunk: AudioChunk) -> List[AudioChunk]:
+        """Add audio chunk and return any complete frames."""
+        if (
+            (chunk.rate != self._rate)
+            or (chunk.width != self._width)
+            or (chunk.channels != self._channels)
+            or (chunk.sample_format != self._sample_format)
+        ):
+            self._set_format(chunk)
+
+        audio = memoryview(chunk.audio)
+        if audio.format != "B":
+            audio = audio.cast("B")
+
+        timestamp = (
+            float(chunk.timestamp)
+            if chunk.timestamp is not None
+            else self._next_timestamp
+        )
+        frames: List[AudioChunk] = []
+        offset = 0
+
+        if self._buffer_length > 0:
+            # Complete frame from previous chunk
+            num_bytes = min(self._bytes_per_frame - self._buffer_length, len(audio))
+            self._buffer[self._buffer_length : self._buffer_length + num_bytes] = audio[
+                :num_bytes
+            ]
+            self._buffer_length += num_bytes
+            offset = num_bytes
+
+            if self._buffer_length == self._bytes_per_frame:
+                frames.append(
+                    self._make_frame(bytes(self._buffer), self._buffer_timestamp)
+                )
+                self._buffer_length = 0
+
+        # Slice frames directly from chunk
+        while (offset + self._bytes_per_frame) <= len(audio):
+            frames.append(
+                self._make_frame(
+                    audio[offset : offset + self._bytes_per_frame],
+                    timestamp + self._get_milliseconds(offset),
+                )
+            )
+            offset += self._bytes_per_frame
+
+        remaining_bytes = len(audio) - offset
+        if remaining_bytes > 0:
+            # Keep partial frame for next chunk
+            self._buffer[:remaining_bytes] = audio[offset:]
+            self._buffer_length = remaining_bytes
+            self._buffer_timestamp = timestamp + self._get_milliseconds(offset)
+
+        self._next_timestamp = timestamp + self._get_milliseconds(len(audio))
+
+        return frames
+
+    def flush(self, pad: bool = True) -> Optional[AudioChunk]:
+        """Return remaining audio as a frame, padded with silence by default."""
+        if self._buffer_length <= 0:
+            return None
+
+        if pad:
+            self._buffer[self._buffer_length :] = bytes(
+                self._bytes_per_frame - self._buffer_length
+            )
+            frame_bytes = bytes(self._buffer)
+        else:
+            frame_bytes = bytes(self._buffer[: self._buffer_length])
+
+        self._buffer_length = 0
+
+        return self._make_frame(frame_bytes, self._buffer_timestamp)
+
+    def reset(self) -> None:
+        """Discard buffered audio."""
+        self._buffer_length = 0
+        self._next_timestamp = 0.0
+
+    def _set_format(self, chunk: AudioChunk) -> None:
+        self._rate = chunk.rate
+        self._width = chunk.width
+        self._channels = chunk.channels
+        self._sample_format = chunk.sample_format
+        self._bytes_per_sample = chunk.width * chunk.channels
+        self._bytes_per_frame = self.samples_per_frame * self._bytes_per_sample
+        self._buffer = bytearray(self._bytes_per_frame)
+        self.reset()
+
+    def _get_milliseconds(self, num_bytes: int) -> float:
+        return ((num_bytes // self._bytes_per_sample) * 1000) / self._rate
+
+    def _make_frame(self, audio: Any, timestamp: float) -> AudioChunk:
+        return AudioChunk(
+            rate=self._rate,
+            width=self._width,
+            channels=self._channels,
+            audio=audio,
+            timestamp=int(timestamp),
+            sample_format=self._sample_format,
+        )
+
+
+class AudioRingBuffer:
+    """Fixed-size circular buffer holding the most recent audio.
+
+    Used to keep pre-roll audio, e.g. to send the audio before a wake word
+    detection to speech-to-text:
+
+        chunks = ring_buffer.get_since(detection.timestamp)
+
+    Chunks returned by get_last/get_since are memoryview slices of the buffer
+    (no copy), so they are only valid until the next write.
+    """
+
+    def __init__(self, rate: int, width: int, channels: int, milliseconds: int):
+        self.rate = rate
+        self.width = width
+        self.channels = channels
+
+        self._bytes_per_sample = width * channels
+        self._bytes_per_ms = (rate * self._bytes_per_sample) / 1000
+        self._capacity = max(1, (rate * milliseconds) // 1000) * self._bytes_per_sample
+        self._buffer = bytearray(self._capacity)
+
+        # Total number of bytes ever written
+        self._num_written = 0
+
+        # (absolute byte position, timestamp in milliseconds) of each write
+        self._anchors: Deque[Tuple[int, float]] = deque()
+        self._next_timestamp = 0.0
+
+    @property
+    def milliseconds(self) -> int:
+        """Milliseconds of audio in the buffer."""
+        return int(self._num_available / self._bytes_per_ms)
+
+    @property
+    def _num_available(self) -> int:
+        return min(self._num_written, self._capacity)
+
+    def write(self, chunk: AudioChunk) -> None:
+        """Add audio chunk, overwriting the oldest audio if necessary."""
+        if (
+            (chunk.rate != self.rate)
+            or (chunk.width != self.width)
+            or (chunk.channels != self.channels)
+        ):
+            raise ValueError(
+                "Audio format mismatch: "
+                f"expected rate={self.rate}, width={self.width}, "
+                f"channels={self.channels}, got rate={chunk.rate}, "
+                f"width={chunk.width}, channels={chunk.channels}"
+            )
+
+        audio = memoryview(chunk.audio)
+        if audio.format != "B":
+            audio = audio.cast("B")
+
+        timestamp = (
+            float(chunk.timestamp)
+            if chunk.timestamp is not None
+            else self._next_timestamp
+        )
+        self._next_timestamp = timestamp + (len(audio) / self._bytes_per_ms)
+
+        if len(audio) > self._capacity:
+            # Only the end of the chunk fits
+            skipped_bytes = len(audio) - self._capacity
+            timestamp += skipped_bytes / self._bytes_per_ms
+            self._num_written += skipped_bytes
+            audio = audio[skipped_bytes:]
+
+        self._anchors.append((self._num_written, timestamp))
+
+        start_index = self._num_written % self._capacity
+        first_length = min(len(audio), self._capacity - start_index)
+        self._buffer[start_index : start_index + first_length] = audio[:first_length]
+        if first_length < len(audio):
+            # Wrap around
+            self._buffer[: len(audio) - first_length] = audio[first_length:]
+
+        self._num_written += len(audio)
+
+        # Remove anchors for overwritten audio
+        oldest_position = self._num_written - self._num_available
+        while (len(self._anchors) > 1) and (self._anchors[1][0] <= oldest_position):
+            self._anchors.popleft()
+
+    def get_last(self, milliseconds: int) -> List[AudioChunk]:
+        """Get the last milliseconds of audio as chunks (no copy)."""
+        num_bytes = int(milliseconds * self._bytes_per_ms)
+        num_bytes -= num_bytes % self._bytes_per_sample
+        return self._get_chunks(self._num_written - num_bytes)
+
+    def get_since(self, timestamp: int) -> List[AudioChunk]:
+        """Get audio starting at a timestamp in milliseconds as chunks (no copy)."""
+        for anchor_position, anchor_timestamp in reversed(self._anchors):
+            if anchor_timestamp <= timestamp:
+                num_bytes = int((timestamp - anchor_timestamp) * self._bytes_per_ms)
+                num_bytes -= num_bytes % self._bytes_per_sample
+                return self._get_chunks(anchor_position + num_bytes)
+
+        # Timestamp is before the oldest audio
+        return self._get_chunks(self._num_written - self._num_available)
+
+    def clear(self) -> None:
+        """Remove all audio."""
+        self._num_written = 0
+        self._anchors.clear()
+        self._next_timestamp = 0.0
+
+    def _get_chunks(self, start_position: int) -> List[AudioChunk]:
+        oldest_position = self._num_written - self._num_available
+        start_position = max(oldest_position, min(self._num_written, start_position))
+        num_bytes = self._num_written - start_position
+        if num_bytes <= 0:
+            return []
+
+        start_index = start_position % self._capacity
+        first_length = min(num_bytes, self._capacity - start_index)
+
+        buffer_view = memoryview(self._buffer)
+        chunks = [
+            self._make_chunk(
+                buffer_view[start_index : start_index + first_length], start_position
+            )
+        ]
+
+        if first_length < num_bytes:
+            # Wrap around
+            chunks.append(
+                self._make_chunk(
+                    buffer_view[: num_bytes - first_length],
+                    start_position + first_length,
+                )
+            )
+
+        return chunks
+
+    def _get_timestamp(self, position: int) -> int:
+        for anchor_position, anchor_timestamp in reversed(self._anchors):
+            if anchor_position <= position:
+                return int(
+                    anchor_timestamp
+                    + ((position - anchor_position) / self._bytes_per_ms)
+                )
+
+        return 0
+
+    def _make_chunk(self, audio: Any, position: int) -> AudioChunk:
+        return AudioChunk(
+            rate=self.rate,
+            width=self.width,
+            channels=self.channels,
+            audio=audio,
+            timestamp=self._get_timestamp(position),
+        )
+
+
+class AudioDtxFilter:
+    """Discontinuous transmission (DTX): suppresses silent audio chunks.
+
+    Chunks whose level is below threshold_db (dBFS) are dropped once
+    hangover_ms has passed since the last loud chunk. While audio is
+    suppressed, an empty chunk (comfort marker) is sent every
+    comfort_interval_ms (and at the start of the stream) so the receiver's
+    clock keeps moving. When audio resumes, the last suppressed chunk is sent
+    first so the onset isn't clipped.
+
+    Every chunk that is sent has a timestamp, so AudioDtxReceiver can fill in
+    the gaps with silence on the other side.
+    """
+
+    def __init__(
+        self,
+        threshold_db: float = -50.0,
+        hangover_ms: int = 300,
+        comfort_interval_ms: int = 1000,
+    ) -> None:
+        self.threshold_db = threshold_db
+        self.hangover_ms = hangover_ms
+        self.comfort_interval_ms = comfort_interval_ms
+
+        self.is_suppressing = False
+        self._next_timestamp = 0.0
+        self._last_loud_timestamp: Optional[float] = None
+        self._last_sent_timestamp: Optional[float] = None
+        self._held_chunk: Optional[AudioChunk] = None
+
+    def process(self, chunk: AudioChunk) -> List[AudioChunk]:
+        """Filter audio chunk and return the chunks to send (possibly none)."""
+        timestamp = (
+            float(chunk.timestamp)
+            if chunk.timestamp is not None
+            else self._next_timestamp
+        )
+        self._next_timestamp = timestamp + (chunk.seconds * 1000)
+        chunk = AudioChunk(
+            rate=chunk.rate,
+            width=chunk.width,
+            channels=chunk.channels,
+            audio=chunk.audio,
+            timestamp=int(timestamp),
+            sample_format=chunk.sample_format,
+        )
+
+        if self._get_level_db(chunk) >= self.threshold_db:
+            self._last_loud_timestamp = timestamp
+        elif (self._last_loud_timestamp is None) or (
+            (timestamp - self._last_loud_timestamp) >= self.hangover_ms
+        ):
+            return self._suppress(chunk, timestamp)
+
+        # Send audio
+        chunks: List[AudioChunk] = []
+        if self._held_chunk is not None:
+            # Include onset
+            chunks.append(self._held_chunk)
+            self._held_chunk = None
+
+        self.is_suppressing = False
+        self._last_sent_timestamp = timestamp
+        chunks.append(chunk)
+
+        return chunks
+
+    def reset(self) -> None:
+        """Reset state for a new audio stream."""
+        self.is_suppressing = False
+        self._next_timestamp = 0.0
+        self._last_loud_timestamp = None
+        self._last_sent_timestamp = None
+        self._held_chunk = None
+
+    def _suppress(self, chunk: AudioChunk, timestamp: float) -> List[AudioChunk]:
+        self.is_suppressing = True
+
+        # Audio may be a view that's only valid during this call
+        self._held_chunk = AudioChunk(
+            rate=chunk.rate,
+            width=chunk.width,
+            channels=chunk.channels,
+            audio=bytes(chunk.audio),
+            timestamp=chunk.timestamp,
+            sample_format=chunk.sample_format,
+        )
+
+        if (self._last_sent_timestamp is not None) and (
+            (timestamp - self._last_sent_timestamp) < self.comfort_interval_ms
+        ):
+            return []
+
+        # Comfort marker up to the start of the held chunk
+        self._last_sent_timestamp = timestamp
+        return [
+            AudioChunk(
+                rate=chunk.rate,
+                width=chunk.width,
+                channels=chunk.channels,
+                audio=bytes(),
+                timestamp=chunk.timestamp,
+                sample_format=chunk.sample_format,
+            )
+        ]
+
+    def _get_level_db(self, chunk: AudioChunk) -> float:
+        audio = chunk.audio
+        width = chunk.width
+        if chunk.is_float:
+            width = 2
+            audio = _float_to_int(audio, width)
+
+        rms = audioop.rms(audio, width)
+        if rms <= 0:
+            return -math.inf
+
+        return 20 * math.log10(rms / (_get_max_value(width) + 1))
+
+
+class AudioDtxReceiver:
+    """Restores continuous audio from an AudioDtxFilter stream.
+
+    Gaps between the end of the previous chunk and the timestamp of the next
+    one (including empty comfort markers) are filled with silence, so the
+    output has the same timing as the original audio. Gaps smaller than the
+    timestamp resolution (1 ms) are ignored.
+    """
+
+    def __init__(self) -> None:
+        self._start_timestamp: Optional[int] = None
+        self._num_samples = 0
+
+    def process(self, chunk: AudioChunk) -> List[AudioChunk]:
+        """Add received chunk and return continuous audio chunks."""
+        chunks: List[AudioChunk] = []
+        if chunk.timestamp is not None:
+            if self._start_timestamp is None:
+                self._start_timestamp = chunk.timestamp
+
+            expected_samples = (
+                (chunk.timestamp - self._start_timestamp) * chunk.rate
+            ) // 1000
+            num_missing = expected_samples - self._num_samples
+            if num_missing > (chunk.rate // 1000):
+                chunks.append(
+                    AudioChunk(
+                        rate=chunk.rate,
+                        width=chunk.width,
+                        channels=chunk.channels,
+                        audio=bytes(num_missing * chunk.width * chunk.channels),
+                        timestamp=self._get_timestamp(chunk.rate),
+                        sample_format=chunk.sample_format,
+                    )
+                )
+                self._num_samples += num_missing
+
+        if chunk.audio:
+            chunks.append(
+                AudioChunk(
+                    rate=chunk.rate,
+                    width=chunk.width,
+                    channels=chunk.channels,
+                    audio=chunk.audio,
+                    timestamp=self._get_timestamp(chunk.rate),
+                    sample_format=chunk.sample_format,
+                )
+            )
+            self._num_samples += chunk.samples
+
+        return chunks
+
+    def reset(self) -> None:
+        """Reset state for a new audio stream."""
+        self._start_timestamp = None
+        self._num_samples = 0
+
+    def _get_timestamp(self, rate: int) -> int:
+        return (self._start_timestamp or 0) + ((self._num_samples * 1000) // rate)
+
+
+def _encode_audio(chunk: AudioChunk, data: Dict[str, Any]) -> bytes:
+    """Encode audio as 16-bit samples with chunk.encoding, adding to event data."""
+    audio = chunk.audio
+    if chunk.is_float:
+        audio = _float_to_int(audio, 2)
+    elif chunk.width != 2:
+        audio = audioop.lin2lin(audio, chunk.width, 2)
+
+    if chunk.encoding == ENCODING_MULAW:
+        return audioop.lin2ulaw(audio, 2)
+
+    if chunk.encoding == ENCODING_ALAW:
+        return audioop.lin2alaw(audio, 2)
+
+    if chunk.encoding == ENCODING_IMA_ADPCM:
+        # Each channel is encoded separately and each chunk can be decoded on
+        # its own, starting from the state in the event data.
+        samples = memoryview(audio).cast("B").cast("h")
+        num_samples = len(samples) // chunk.channels
+        states: List[List[int]] = []
+        blocks: List[bytes] = []
+        for channel in range(chunk.channels):
+            channel_samples = samples[channel :: chunk.channels].tobytes()
+            if num_samples % 2:
+                # Pad to a whole byte
+                channel_samples += channel_samples[-2:]
+
+            state: Tuple[int, int] = (0, 0)
+            if channel_samples:
+                # Start at the first sample with a step size that fits the audio
+                first_sample = samples[channel]
+                _, (_, index) = audioop.lin2adpcm(
+                    channel_samples[: _ADPCM_WARMUP_SAMPLES * 2],
+                    2,
+                    (first_sample, 0),
+                )
+                state = (first_sample, index)
+
+            states.append(list(state))
+            blocks.append(audioop.lin2adpcm(channel_samples, 2, state)[0])
+
+        data["samples"] = num_samples
+        data["adpcm_state"] = states
+        return b"".join(blocks)
+
+    raise ValueError(f"Unsupported audio encoding: {chunk.encoding}")
+
+
+def _decode_audio(payload: bytes, data: Dict[str, Any]) -> bytes:
+    """Decode payload to 16-bit samples using the encoding in event data."""
+    encoding = data["encoding"]
+    if encoding == ENCODING_MULAW:
+        return audioop.ulaw2lin(payload, 2)
+
+    if encoding == ENCODING_ALAW:
+        return audioop.alaw2lin(payload, 2)
+
+    if encoding == ENCODING_IMA_ADPCM:
+        channels = data["channels"]
+        num_samples = data["samples"]
+        states = data["adpcm_state"]
+
+        # Values come from the peer, so don't trust them to size buffers
+        if (channels < 1) or (len(states) < channels):
+            raise ValueError(f"Invalid ADPCM channels: {channels}")
+
+        max_samples = (len(payload) * 2) // channels
+        if not 0 <= num_samples <= max_samples:
+            raise ValueError(
+                f"ADPCM samples out of range: {num_samples} (max {max_samples})"
+            )
+
+        block_size = (num_samples + 1) // 2
+        if channels == 1:
+            audio, _ = audioop.adpcm2lin(payload[:block_size], 2, tuple(states[0]))
+            return audio[: num_samples * 2]
+
+        samples = array.array("h", bytes(num_samples * channels * 2))
+        for channel in range(channels):
+            block = payload[channel * block_size : (channel + 1) * block_size]
+            channel_audio, _ = audioop.adpcm2lin(block, 2, tuple(states[channel]))
+            samples[channel::channels] = array.array(
+                "h", channel_audio[: num_samples * 2]
+            )
+
+        return samples.tobytes()
+
+    raise ValueError(f"Unsupported audio encoding: {encoding}")
+
+
+def _get_max_value(width: int) -> int:
+    return (1 << ((8 * width) - 1)) - 1
+
+
+def _float_to_int(audio_bytes: bytes, width: int) -> bytes:
+    """Convert 32-bit float samples in [-1, 1] to signed integer samples."""
+    max_val = _get_max_value(width)
+    min_val = -max_val - 1
+
+    np = get_numpy()
+    if np is not None:
+        float_array = np.frombuffer(audio_bytes, dtype=_FLOAT_DTYPE)
+        return (
+            np.clip(float_array * (max_val + 1), min_val, max_val)
+            .astype(_INT_DTYPES[width])
+            .tobytes()
+        )
+
+    float_array = array.array("f")
+    float_array.frombytes(audio_bytes)
+    if sys.byteorder != "little":
+        float_array.byteswap()
+
+    int_array = array.array(
+        {1: "b", 2: "h", 4: "i"}[width],
+        (
+            max(min_val, min(max_val, int(sample * (max_val + 1))))
+            for sample in float_array
+        ),
+    )
+    if sys.byteorder != "little":
+        int_array.byteswap()
+
+    return int_array.tobytes()
+
+
 def wav_to_chunks(
-    wav_file: wave.Wave_read,
+    wav_file: Union[wave.Wave_read, str, Path],
     samples_per_chunk: int,
     timestamp: int = 0,
     start_event: bool = False,
     stop_event: bool = False,
 ) -> Iterable[Union[AudioStart, AudioChunk, AudioStop]]:
-    """Splits WAV file into AudioChunks."""
+    """Splits WAV file into AudioChunks.
+
+    If wav_file is a path, the file is memory-mapped and chunk audio is a
+    memoryview slice of the mapped file (no copy or full load).
+    """
+    if isinstance(wav_file, (str, Path)):
+        yield from _wav_path_to_chunks(
+            wav_file,
+            samples_per_chunk,
+            timestamp=timestamp,
+            start_event=start_event,
+            stop_event=stop_event,
+        )
+        return
+
     rate = wav_file.getframerate()
     width = wav_file.getsampwidth()
     channels = wav_file.getnchannels()
@@ -232,10 +1036,118 @@ def wav_to_chunks(
         yield AudioStop(timestamp=timestamp)
 
 
+def _wav_path_to_chunks(
+    wav_path: Union[str, Path],
+    samples_per_chunk: int,
+    timestamp: int = 0,
+    start_event: bool = False,
+    stop_event: bool = False,
+) -> Iterable[Union[AudioStart, AudioChunk, AudioStop]]:
+    """Splits memory-mapped WAV file into AudioChunks."""
+    with open(wav_path, "rb") as wav_io:
+        wav_mmap = mmap.mmap(wav_io.fileno(), 0, access=mmap.ACCESS_READ)
+
+    wav_view = memoryview(wav_mmap)
+    try:
+        wav_format, data_offset, data_length = _read_wav_header(wav_view)
+        bytes_per_chunk = samples_per_chunk * wav_format.width * wav_format.channels
+
+        if start_event:
+            yield AudioStart(
+                rate=wav_format.rate,
+                width=wav_format.width,
+                channels=wav_format.channels,
+                timestamp=0,
+                sample_format=wav_format.sample_format,
+            )
+
+        data_end = data_offset + data_length
+        for chunk_offset in range(data_offset, data_end, bytes_per_chunk):
+            chunk = AudioChunk(
+                rate=wav_format.rate,
+                width=wav_format.width,
+                channels=wav_format.channels,
+                audio=wav_view[  # type: ignore[arg-type]
+                    chunk_offset : min(data_end, chunk_offset + bytes_per_chunk)
+                ],
+                timestamp=timestamp,
+                sample_format=wav_format.sample_format,
+            )
+            yield chunk
+            timestamp += chunk.milliseconds
+
+        if stop_event:
+            yield AudioStop(timestamp=timestamp)
+    finally:
+        wav_view.release()
+
+        try:
+            wav_mmap.close()
+        except BufferError:
+            # Chunks are still in use; mmap is closed when they're released
+            pass
+
+
+def _read_wav_header(wav_view: memoryview) -> Tuple[AudioStart, int, int]:
+    """Parse RIFF/WAVE header.
+
+    Returns (format, data offset, data length).
+    """
+    if (bytes(wav_view[0:4]) != b"RIFF") or (bytes(wav_view[8:12]) != b"WAVE"):
+        raise ValueError("Not a WAV file")
+
+    wav_format: Optional[AudioStart] = None
+    offset = 12
+    while (offset + 8) <= len(wav_view):
+        chunk_id = bytes(wav_view[offset : offset + 4])
+        (chunk_length,) = struct.unpack_from("<I", wav_view, offset + 4)
+        offset += 8
+
+        if chunk_id == b"fmt ":
+            format_tag, channels, rate = struct.unpack_from("<HHI", wav_view, offset)
+            (bits_per_sample,) = struct.unpack_from("<H", wav_view, offset + 14)
+            if (format_tag == _WAVE_FORMAT_EXTENSIBLE) and (chunk_length >= 40):
+                # Sub-format GUID starts with format tag
+                (format_tag,) = struct.unpack_from("<H", wav_view, offset + 24)
+
+            if format_tag == _WAVE_FORMAT_PCM:
+                sample_format: Optional[str] = None
+            elif (format_tag == _WAVE_FORMAT_IEEE_FLOAT) and (bits_per_sample == 32):
+                sample_format = SAMPLE_FORMAT_FLOAT
+            else:
+                raise ValueError(f"Unsupported WAV format: {format_tag}")
+
+            wav_format = AudioStart(
+                rate=rate,
+                width=bits_per_sample // 8,
+                channels=channels,
+                sample_format=sample_format,
+            )
+        elif chunk_id == b"data":
+            if wav_format is None:
+                raise ValueError("Missing fmt chunk before data")
+
+            # Length may be wrong for streamed WAV files
+            data_length = min(chunk_length, len(wav_view) - offset)
+            bytes_per_sample = wav_format.width * wav_format.channels
+            data_length -= data_length % bytes_per_sample
+
+            return wav_format, offset, data_length
+
+        # Chunks are padded to an even length
+        offset += chunk_length + (chunk_length % 2)
+
+    raise ValueError("Missing data chunk")
+
+
 # -----------------------------------------------------------------------------
 
 
 def main() -> None:
+    """Convert WAV audio from stdin and write it to stdout.
+
+    Audio is streamed with bounded memory.
+    """
     parser = argparse.ArgumentParser()
     parser.add_argument("--rate", type=int)
     parser.add_argument("--width", type=int)
@@ -247,35 +1159,74 @@ def main() -> None:
         rate=args.rate, width=args.width, channels=args.channels
     )
 
-    with io.BytesIO(
-        sys.stdin.buffer.read()
-    ) as input_wav_io, io.BytesIO() as output_wav_io:
-        input_wav_file: wave.Wave_read = wave.open(input_wav_io, "rb")
-        output_wav_file: wave.Wave_write = wave.open(output_wav_io, "wb")
-        with input_wav_file, output_wav_file:
-            # Input
-            rate = input_wav_file.getframerate()
-            width = input_wav_file.getsampwidth()
-            channels = input_wav_file.getnchannels()
-
-            # Output
-            output_wav_file.setframerate(args.rate if args.rate is not None else rate)
-            output_wav_file.setsampwidth(
-                args.width if args.width is not None else width
-            )
-            output_wav_file.setnchannels(
-                args.channels if args.channels is not None else channels
-            )
+    output_file = sys.stdout.buffer
+    input_wav_file: wave.Wave_read = wave.open(sys.stdin.buffer, "rb")
+    with input_wav_file:
+        # Input
+        rate = input_wav_file.getframerate()
+        width = input_wav_file.getsampwidth()
+        channels = input_wav_file.getnchannels()
+
+        # Output
+        output_rate = args.rate if args.rate is not None else rate
+        output_width = args.width if args.width is not None else width
+        output_channels = args.channels if args.channels is not None else channels
 
+        # The input header may not have the real length (e.g., streamed WAV),
+        # so audio is converted until the end of the input.
+        def iter_output_audio() -> Iterable[bytes]:
             audio_bytes = input_wav_file.readframes(args.samples_per_chunk)
             while audio_bytes:
                 chunk = converter.convert(
                     AudioChunk(rate, width, channels, audio_bytes)
                 )
-                output_wav_file.writeframes(chunk.audio)
+                yield chunk.audio
                 audio_bytes = input_wav_file.readframes(args.samples_per_chunk)
 
-        sys.stdout.buffer.write(output_wav_io.getvalue())
+        if _is_seekable(output_file):
+            # Length in header is fixed when output is closed
+            output_wav_file: wave.Wave_write = wave.open(output_file, "wb")
+            with output_wav_file:
+                output_wav_file.setframerate(output_rate)
+                output_wav_file.setsampwidth(output_width)
+                output_wav_file.setnchannels(output_channels)
+                for output_audio in iter_output_audio():
+                    output_wav_file.writeframesraw(output_audio)
+        else:
+            # Length is unknown when the header is written
+            output_file.write(
+                get_streaming_wav_header(output_rate, output_width, output_channels)
+            )
+            for output_audio in iter_output_audio():
+                output_file.write(output_audio)
+
+        output_file.flush()
+
+
+def get_streaming_wav_header(rate: int, width: int, channels: int) -> bytes:
+    """Get WAV header for audio of unknown length (sizes are 0xFFFFFFFF)."""
+    return _STREAMING_WAV_HEADER.pack(
+        b"RIFF",
+        _UNKNOWN_WAV_SIZE,
+        b"WAVE",
+        b"fmt ",
+        16,  # fmt chunk size
+        _WAVE_FORMAT_PCM,
+        channels,
+        rate,
+        rate * width * channels,  # bytes per second
+        width * channels,  # block align
+        width * 8,  # bits per sample
+        b"data",
+        _UNKNOWN_WAV_SIZE,
+    )
+
+
+def _is_seekable(file: Any) -> bool:
+    try:
+        return file.seekable() and (file.seek(0, io.SEEK_CUR) >= 0)
+    except (OSError, ValueError):
+        return False
 
 
 if __name__ == "__main__":
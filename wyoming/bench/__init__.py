@@ -0,0 +1 @@
+"""Tools for benchmarking Wyoming services."""
@@ -0,0 +1,362 @@
+"""Load generator that simulates many satellites using a Wyoming service.
+
+Each simulated client runs sessions one after another on a new connection:
+
+- transcribe: transcribe, then WAV audio, waiting for a transcript
+- detect: detect, then WAV audio until a detection (or not-detected)
+- synthesize: synthesize, waiting for the end of the audio
+
+Audio is sent in real time by default (--speed 2 is twice as fast, 0 is as
+fast as possible). Results are printed as JSON.
+
+Run with: python3 -m wyoming.bench.load --uri tcp://127.0.0.1:10300 \\
+    --scenario transcribe --clients 10 --wav test.wav
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import math
+import time
+import wave
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from ..asr import Transcribe, Transcript
+from ..audio import AudioChunk, AudioStop, wav_to_chunks
+from ..client import AsyncClient
+from ..error import Error
+from ..event import Event
+from ..tts import Synthesize
+from ..wake import Detect, Detection, NotDetected
+
+SCENARIOS = ("transcribe", "detect", "synthesize")
+
+_PERCENTILES = (50, 95, 99)
+
+
+@dataclass
+class SessionResult:
+    """Timing of one session (seconds)."""
+
+    time_to_first_response: Optional[float] = None
+    """From the first event sent to the first event received."""
+
+    latency: Optional[float] = None
+    """From the last event sent to the final response."""
+
+    audio_seconds: float = 0.0
+    """Seconds of audio sent or received."""
+
+    error: Optional[str] = None
+
+
+@dataclass
+class LoadSettings:
+    """Settings shared by all simulated clients."""
+
+    uri: str
+    scenario: str
+    wav_chunks: List[List[Event]] = field(default_factory=list)
+    """Events for each WAV file (audio-start, audio-chunk+, audio-stop)."""
+
+    text: str = "This is a test."
+    language: Optional[str] = None
+    wake_word_names: Optional[List[str]] = None
+    speed: float = 1.0
+    timeout: float = 30.0
+
+
+async def run_session(settings: LoadSettings, session_index: int) -> SessionResult:
+    """Run one session of the scenario on a new connection."""
+    if settings.scenario == "synthesize":
+        request_events = [Synthesize(text=settings.text).event()]
+        return await _run_session(settings, request_events, [], _is_synthesize_done)
+
+    audio_events = settings.wav_chunks[session_index % len(settings.wav_chunks)]
+    if settings.scenario == "transcribe":
+        request_event = Transcribe(language=settings.language).event()
+        is_final = _is_transcribe_done
+    elif settings.scenario == "detect":
+        request_event = Detect(names=settings.wake_word_names).event()
+        is_final = _is_detect_done
+    else:
+        raise ValueError(f"Unknown scenario: {settings.scenario}")
+
+    return await _run_session(settings, [request_event], audio_events, is_final)
+
+
+async def run_load(
+    settings: LoadSettings,
+    num_clients: int,
+    sessions_per_client: int,
+    ramp_up: float = 0.0,
+) -> Dict[str, Any]:
+    """Run sessions from many clients at once and summarize the results."""
+
+    async def run_client(client_index: int) -> List[SessionResult]:
+        if (ramp_up > 0) and (num_clients > 1):
+            await asyncio.sleep(ramp_up * client_index / (num_clients - 1))
+
+        results: List[SessionResult] = []
+        for session_index in range(sessions_per_client):
+            results.append(
+                await run_session(
+                    settings, (client_index * sessions_per_client) + session_index
+                )
+            )
+
+        return results
+
+    start_time = time.perf_counter()
+    client_results = await asyncio.gather(
+        *(run_client(client_index) for client_index in range(num_clients))
+    )
+    seconds = time.perf_counter() - start_time
+
+    results = [result for results in client_results for result in results]
+    return summarize(settings.scenario, num_clients, results, seconds)
+
+
+def summarize(
+    scenario: str, num_clients: int, results: List[SessionResult], seconds: float
+) -> Dict[str, Any]:
+    """Summarize session results as a JSON-compatible dict."""
+    ok_results = [result for result in results if result.error is None]
+    errors: Dict[str, int] = {}
+    for result in results:
+        if result.error is not None:
+            errors[result.error] = errors.get(result.error, 0) + 1
+
+    audio_seconds = sum(result.audio_seconds for result in ok_results)
+
+    return {
+        "scenario": scenario,
+        "clients": num_clients,
+        "sessions": len(ok_results),
+        "errors": errors,
+        "seconds": seconds,
+        "sessions_per_second": len(ok_results) / seconds if seconds > 0 else 0.0,
+        "audio_seconds": audio_seconds,
+        "audio_seconds_per_second": audio_seconds / seconds if seconds > 0 else 0.0,
+        "time_to_first_response_ms": _summarize_times(
+            [r.time_to_first_response for r in ok_results]
+        ),
+        "latency_ms": _summarize_times([r.latency for r in ok_results]),
+    }
+
+
+def percentile(sorted_values: Sequence[float], percent: float) -> float:
+    """Get percentile of sorted values with linear interpolation."""
+    if not sorted_values:
+        return math.nan
+
+    position = (len(sorted_values) - 1) * (percent / 100)
+    lower = math.floor(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    fraction = position - lower
+
+    return sorted_values[lower] + (
+        (sorted_values[upper] - sorted_values[lower]) * fraction
+    )
+
+
+# -----------------------------------------------------------------------------
+
+
+async def _run_session(
+    settings: LoadSettings,
+    request_events: List[Event],
+    audio_events: List[Event],
+    is_final: Callable[[Event], bool],
+) -> SessionResult:
+    result = SessionResult()
+    first_send_time: Optional[float] = None
+    last_send_time: Optional[float] = None
+    is_done = asyncio.Event()
+
+    try:
+        async with AsyncClient.from_uri(settings.uri) as client:
+
+            async def send_events() -> None:
+                nonlocal first_send_time, last_send_time
+
+                for event in request_events:
+                    await client.write_event(event)
+                    last_send_time = time.perf_counter()
+                    if first_send_time is None:
+                        first_send_time = last_send_time
+
+                audio_start_time = time.perf_counter()
+                audio_offset = 0.0
+                for event in audio_events:
+                    if is_done.is_set():
+                        # Final response came early (e.g., detection)
+                        break
+
+                    if settings.speed > 0:
+                        # Send audio on schedule
+                        delay = (
+                            audio_start_time
+                            + (audio_offset / settings.speed)
+                            - time.perf_counter()
+                        )
+                        if delay > 0:
+                            await asyncio.sleep(delay)
+
+                    await client.write_event(event)
+                    last_send_time = time.perf_counter()
+                    if first_send_time is None:
+                        first_send_time = last_send_time
+
+                    if AudioChunk.is_type(event.type):
+                        seconds = AudioChunk.from_event(event).seconds
+                        audio_offset += seconds
+                        result.audio_seconds += seconds
+
+            async def receive_events() -> None:
+                while True:
+                    event = await client.read_event()
+                    if event is None:
+                        result.error = "disconnected"
+                        break
+
+                    receive_time = time.perf_counter()
+                    if (result.time_to_first_response is None) and (
+                        first_send_time is not None
+                    ):
+                        result.time_to_first_response = receive_time - first_send_time
+
+                    if Error.is_type(event.type):
+                        result.error = "error"
+                        break
+
+                    if (not audio_events) and AudioChunk.is_type(event.type):
+                        # Synthesized audio
+                        result.audio_seconds += AudioChunk.from_event(event).seconds
+
+                    if is_final(event):
+                        assert last_send_time is not None
+                        result.latency = max(0.0, receive_time - last_send_time)
+                        break
+
+                is_done.set()
+
+            send_task = asyncio.create_task(send_events())
+            try:
+                await asyncio.wait_for(receive_events(), timeout=settings.timeout)
+            except asyncio.TimeoutError:
+                result.error = "timeout"
+            finally:
+                is_done.set()
+                send_task.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await send_task
+    except OSError:
+        result.error = "connection"
+
+    return result
+
+
+def _is_transcribe_done(event: Event) -> bool:
+    return Transcript.is_type(event.type)
+
+
+def _is_detect_done(event: Event) -> bool:
+    return Detection.is_type(event.type) or NotDetected.is_type(event.type)
+
+
+def _is_synthesize_done(event: Event) -> bool:
+    return AudioStop.is_type(event.type)
+
+
+def _summarize_times(times: List[Optional[float]]) -> Dict[str, float]:
+    sorted_ms = sorted(t * 1000 for t in times if t is not None)
+    if not sorted_ms:
+        return {}
+
+    summary = {f"p{p}": percentile(sorted_ms, p) for p in _PERCENTILES}
+    summary["mean"] = sum(sorted_ms) / len(sorted_ms)
+    summary["max"] = sorted_ms[-1]
+
+    return summary
+
+
+def _load_wav_events(wav_path: str, samples_per_chunk: int) -> List[Event]:
+    with wave.open(wav_path, "rb") as wav_file:
+        return [
+            message.event()
+            for message in wav_to_chunks(
+                wav_file, samples_per_chunk, start_event=True, stop_event=True
+            )
+        ]
+
+
+# -----------------------------------------------------------------------------
+
+
+async def main() -> None:
+    """Run load test and print results as JSON."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--uri", required=True, help="URI of Wyoming service")
+    parser.add_argument("--scenario", choices=SCENARIOS, default="transcribe")
+    parser.add_argument(
+        "--clients", type=int, default=1, help="Number of concurrent clients"
+    )
+    parser.add_argument(
+        "--sessions", type=int, default=1, help="Number of sessions per client"
+    )
+    parser.add_argument(
+        "--wav",
+        action="append",
+        default=[],
+        help="WAV file to stream (transcribe/detect, may be repeated)",
+    )
+    parser.add_argument("--samples-per-chunk", type=int, default=1024)
+    parser.add_argument(
+        "--speed",
+        type=float,
+        default=1.0,
+        help="Audio speed relative to real time (0 = as fast as possible)",
+    )
+    parser.add_argument(
+        "--ramp-up",
+        type=float,
+        default=0.0,
+        help="Seconds over which to start clients",
+    )
+    parser.add_argument("--text", default="This is a test.", help="Text to synthesize")
+    parser.add_argument("--language", help="Language for transcribe")
+    parser.add_argument(
+        "--wake-word-name", action="append", help="Wake word name for detect"
+    )
+    parser.add_argument(
+        "--timeout", type=float, default=30.0, help="Seconds to wait for a response"
+    )
+    args = parser.parse_args()
+
+    if (args.scenario != "synthesize") and (not args.wav):
+        parser.error(f"--wav is required for {args.scenario}")
+
+    settings = LoadSettings(
+        uri=args.uri,
+        scenario=args.scenario,
+        wav_chunks=[_load_wav_events(p, args.samples_per_chunk) for p in args.wav],
+        text=args.text,
+        language=args.language,
+        wake_word_names=args.wake_word_name,
+        speed=args.speed,
+        timeout=args.timeout,
+    )
+
+    summary = await run_load(
+        settings,
+        num_clients=args.clients,
+        sessions_per_client=args.sessions,
+        ramp_up=args.ramp_up,
+    )
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,172 @@
+"""Replay a recorded session to a Wyoming service.
+
+Events that were sent to the service are sent again with their original
+pacing (--speed 1), faster (--speed N), or as fast as possible (--speed 0).
+Responses can be recorded for comparison with the original session.
+Events whose payload was streamed and not recorded are skipped.
+
+Run with: python3 -m wyoming.bench.replay session.wyrec \\
+    --uri tcp://127.0.0.1:10300 --speed 0
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import logging
+import time
+from typing import Any, Dict, Optional
+
+from ..client import AsyncClient
+from ..recording import EventDirection, EventRecorder, RecordingReader
+
+DEFAULT_IDLE_TIMEOUT = 1.0
+"""Seconds to wait for more responses after the last event is sent."""
+
+_LOGGER = logging.getLogger(__name__)
+
+
+async def replay(
+    reader: RecordingReader,
+    uri: str,
+    speed: float = 1.0,
+    start: float = 0.0,
+    recorder: Optional[EventRecorder] = None,
+    idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+) -> Dict[str, Any]:
+    """Send recorded events to a service and summarize the responses.
+
+    If recorder is given, sent events and responses are recorded.
+    """
+    num_sent = 0
+    num_skipped = 0
+    num_received = 0
+    first_timestamp: Optional[float] = None
+    last_timestamp = start
+    last_receive_time: Optional[float] = None
+
+    reader.seek(start)
+
+    async with AsyncClient.from_uri(uri) as client:
+        client.recorder = recorder
+
+        async def receive_events() -> None:
+            nonlocal num_received, last_receive_time
+
+            while True:
+                event = await client.read_event()
+                if event is None:
+                    break
+
+                num_received += 1
+                last_receive_time = time.perf_counter()
+
+        receive_task = asyncio.create_task(receive_events())
+        start_time = time.perf_counter()
+
+        for recorded_event in reader:
+            if recorded_event.direction != EventDirection.TO_SERVICE:
+                continue
+
+            if recorded_event.is_payload_omitted:
+                # Sending the event without its payload would change its meaning
+                _LOGGER.warning(
+                    "Skipping %s event without its streamed payload",
+                    recorded_event.event.type,
+                )
+                num_skipped += 1
+                continue
+
+            if first_timestamp is None:
+                first_timestamp = recorded_event.timestamp
+
+            last_timestamp = recorded_event.timestamp
+            if speed > 0:
+                # Keep original pacing
+                delay = (
+                    start_time
+                    + ((recorded_event.timestamp - first_timestamp) / speed)
+                    - time.perf_counter()
+                )
+                if delay > 0:
+                    await asyncio.sleep(delay)
+
+            await client.write_event(recorded_event.event)
+            num_sent += 1
+
+        send_seconds = time.perf_counter() - start_time
+
+        # Wait until the service stops responding
+        while not receive_task.done():
+            idle_seconds = time.perf_counter() - (last_receive_time or start_time)
+            if idle_seconds >= idle_timeout:
+                break
+
+            await asyncio.wait([receive_task], timeout=idle_timeout - idle_seconds)
+
+        receive_task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await receive_task
+
+    recorded_seconds = (
+        (last_timestamp - first_timestamp) if first_timestamp is not None else 0.0
+    )
+
+    return {
+        "events_sent": num_sent,
+        "events_skipped": num_skipped,
+        "events_received": num_received,
+        "recorded_seconds": recorded_seconds,
+        "send_seconds": send_seconds,
+        "speedup": recorded_seconds / send_seconds if send_seconds > 0 else 0.0,
+        "last_response_seconds": (
+            (last_receive_time - start_time) if last_receive_time is not None else None
+        ),
+    }
+
+
+# -----------------------------------------------------------------------------
+
+
+async def main() -> None:
+    """Replay a recording and print a summary as JSON."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("recording", help="Path to recording")
+    parser.add_argument("--uri", required=True, help="URI of Wyoming service")
+    parser.add_argument(
+        "--speed",
+        type=float,
+        default=1.0,
+        help="Speed relative to the recording (0 = as fast as possible)",
+    )
+    parser.add_argument(
+        "--start", type=float, default=0.0, help="Seconds into the recording to start"
+    )
+    parser.add_argument("--record", help="Record sent events and responses to a file")
+    parser.add_argument(
+        "--idle-timeout",
+        type=float,
+        default=DEFAULT_IDLE_TIMEOUT,
+        help="Seconds to wait for more responses after the last event",
+    )
+    args = parser.parse_args()
+
+    with contextlib.ExitStack() as stack:
+        reader = stack.enter_context(RecordingReader(args.recording))
+        recorder: Optional[EventRecorder] = None
+        if args.record:
+            recorder = stack.enter_context(EventRecorder(args.record))
+
+        summary = await replay(
+            reader,
+            args.uri,
+            speed=args.speed,
+            start=args.start,
+            recorder=recorder,
+            idle_timeout=args.idle_timeout,
+        )
+
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,16 +1,24 @@
 import asyncio
 from abc import ABC
 from pathlib import Path
-from typing import Optional, Union
+from typing import Optional, Tuple, Union, cast
 from urllib.parse import urlparse
 
 from .event import (
+    DEFAULT_MAX_DATA_LENGTH,
+    DEFAULT_MAX_PAYLOAD_LENGTH,
     Event,
+    PayloadStream,
     async_get_stdin,
     async_get_stdout,
     async_read_event,
+    async_read_event_stream,
     async_write_event,
 )
+from .inproc import InprocStreamReader, open_inproc_connection
+from .recording import EventDirection, EventRecorder
+from .shm import open_shm_connection
+from .udp import DEFAULT_JITTER_MS, get_jitter_ms, open_udp_connection
 
 
 class AsyncClient(ABC):
@@ -20,12 +28,61 @@ class AsyncClient(ABC):
         self._reader: Optional[asyncio.StreamReader] = None
         self._writer: Optional[asyncio.StreamWriter] = None
 
+        self.max_data_length = DEFAULT_MAX_DATA_LENGTH
+        """Longest event data that will be read."""
+
+        self.max_payload_length = DEFAULT_MAX_PAYLOAD_LENGTH
+        """Longest event payload that will be read into memory."""
+
+        self.lazy_events = False
+        """Read events as LazyEvent (e.g., for forwarding without decoding)."""
+
+        self.recorder: Optional[EventRecorder] = None
+        """Records events that are read and written (see recording.py)."""
+
     async def read_event(self) -> Optional[Event]:
         assert self._reader is not None
-        return await async_read_event(self._reader)
+        event = await async_read_event(
+            self._reader,
+            max_data_length=self.max_data_length,
+            max_payload_length=self.max_payload_length,
+            lazy=self.lazy_events,
+        )
+        if (event is not None) and (self.recorder is not None):
+            self.recorder.record(event, EventDirection.FROM_SERVICE)
+
+        return event
+
+    async def read_event_stream(
+        self, min_stream_length: int = 0
+    ) -> Optional[Tuple[Event, Optional[PayloadStream]]]:
+        """Read event with payloads of at least min_stream_length in chunks.
+
+        A payload stream must be read or skipped before the next event.
+        """
+        assert self._reader is not None
+        result = await async_read_event_stream(
+            self._reader,
+            min_stream_length=min_stream_length,
+            max_data_length=self.max_data_length,
+            max_payload_length=self.max_payload_length,
+        )
+        if (result is not None) and (self.recorder is not None):
+            # Streamed payloads are not recorded
+            event, payload = result
+            self.recorder.record(
+                event,
+                EventDirection.FROM_SERVICE,
+                is_payload_omitted=payload is not None,
+            )
+
+        return result
 
     async def write_event(self, event: Event) -> None:
         assert self._writer is not None
+        if self.recorder is not None:
+            self.recorder.record(event, EventDirection.TO_SERVICE)
+
         await async_write_event(event, self._writer)
 
     async def connect(self) -> None:
@@ -57,7 +114,24 @@ class AsyncClient(ABC):
         if result.scheme == "stdio":
             return AsyncStdioClient()
 
-        raise ValueError("Only 'stdio://', 'unix://', or 'tcp://' are supported")
+        if result.scheme == "shm":
+            return AsyncShmClient(result.path)
+
+        if result.scheme == "inproc":
+            return AsyncInprocClient(result.netloc or result.path)
+
+        if result.scheme == "udp":
+            if (result.hostname is None) or (result.port is None):
+                raise ValueError("A port must be specified when using a 'udp://' URI")
+
+            return AsyncUdpClient(
+                result.hostname, result.port, jitter_ms=get_jitter_ms(result.query)
+            )
+
+        raise ValueError(
+            "Only 'stdio://', 'unix://', 'tcp://', 'shm://', 'inproc://', "
+            "or 'udp://' are supported"
+        )
 
 
 class AsyncTcpClient(AsyncClient):
@@ -85,6 +159,27 @@ class AsyncTcpClient(AsyncClient):
             await writer.wait_closed()
 
 
+class AsyncUdpClient(AsyncTcpClient):
+    """UDP Wyoming client.
+
+    Audio chunks are sent as UDP datagrams, and other events over TCP.
+    """
+
+    def __init__(
+        self, host: str, port: int, jitter_ms: int = DEFAULT_JITTER_MS
+    ) -> None:
+        super().__init__(host, port)
+
+        self.jitter_ms = jitter_ms
+
+    async def connect(self) -> None:
+        reader, writer = await open_udp_connection(
+            self.host, self.port, jitter_ms=self.jitter_ms
+        )
+        self._reader = cast(asyncio.StreamReader, reader)
+        self._writer = cast(asyncio.StreamWriter, writer)
+
+
 class AsyncUnixClient(AsyncClient):
     """Unix domain socket Wyoming client."""
 
@@ -108,6 +203,44 @@ class AsyncUnixClient(AsyncClient):
             await writer.wait_closed()
 
 
+class AsyncShmClient(AsyncUnixClient):
+    """Shared memory Wyoming client.
+
+    Events are sent over a Unix domain socket, with large payloads in shared
+    memory.
+    """
+
+    async def connect(self) -> None:
+        self._reader, self._writer = await open_shm_connection(self.socket_path)
+
+
+class AsyncInprocClient(AsyncClient):
+    """In-process Wyoming client (events are passed without serialization)."""
+
+    def __init__(self, name: str) -> None:
+        super().__init__()
+
+        self.name = name
+
+    async def connect(self) -> None:
+        reader, writer = await open_inproc_connection(self.name)
+        self._reader = cast(asyncio.StreamReader, reader)
+        self._writer = cast(asyncio.StreamWriter, writer)
+
+    async def disconnect(self) -> None:
+        reader = self._reader
+        writer = self._writer
+        self._reader = None
+        self._writer = None
+
+        if reader is not None:
+            # Service gets ConnectionResetError if it keeps writing
+            cast(InprocStreamReader, reader).close()
+
+        if writer is not None:
+            writer.close()
+
+
 class AsyncStdioClient(AsyncClient):
     """Standard output Wyoming client."""
 
@@ -122,11 +255,23 @@ class AsyncStdioClient(AsyncClient):
             self._reader = await async_get_stdin()
 
         assert self._reader is not None
-        return await async_read_event(self._reader)
+        event = await async_read_event(
+            self._reader,
+            max_data_length=self.max_data_length,
+            max_payload_length=self.max_payload_length,
+            lazy=self.lazy_events,
+        )
+        if (event is not None) and (self.recorder is not None):
+            self.recorder.record(event, EventDirection.FROM_SERVICE)
+
+        return event
 
     async def write_event(self, event: Event) -> None:
         if self._writer is None:
             self._writer = await async_get_stdout()
 
         assert self._writer is not None
+        if self.recorder is not None:
+            self.recorder.record(event, EventDirection.TO_SERVICE)
+
         await async_write_event(event, self._writer)
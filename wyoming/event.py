@@ -4,19 +4,44 @@ import os
 import sys
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
-from typing import Any, BinaryIO, Dict, Iterable, Optional
-
+from typing import (
+    Any,
+    AsyncIterable,
+    BinaryIO,
+    Dict,
+    Iterable,
+    Iterator,
+    Optional,
+    Tuple,
+)
+
+from .util.dataclasses_slots import add_slots
 from .version import __version__
 
 _TYPE = "type"
 _DATA = "data"
 _DATA_LENGTH = "data_length"
 _PAYLOAD_LENGTH = "payload_length"
+_PAYLOAD_SHM = "payload_shm"
+_UDP_SEQUENCE = "udp_sequence"
 _NEWLINE = "\n".encode()
 _VERSION = "version"
 _VERSION_NUMBER = __version__
 
+DEFAULT_MAX_DATA_LENGTH = 4 * 1024 * 1024
+"""Longest event data (JSON) that will be read."""
+
+DEFAULT_MAX_PAYLOAD_LENGTH = 64 * 1024 * 1024
+"""Longest event payload that will be read into memory."""
+
+DEFAULT_PAYLOAD_CHUNK_SIZE = 64 * 1024
+"""Bytes per chunk when streaming a payload."""
+
+# Payloads up to this size are joined with the header into a single write
+_MAX_JOIN_LENGTH = 64 * 1024
+
 
+@add_slots
 @dataclass
 class Event:
     type: str
@@ -31,7 +56,114 @@ class Event:
         return Event(type=event_dict["type"], data=event_dict.get("data", {}))
 
 
+# Data of a LazyEvent that hasn't been accessed yet
+_NOT_DECODED = object()
+
+
+class LazyEvent(Event):
+    """Event whose data is decoded from JSON when first accessed.
+
+    The original bytes are kept, and written again unchanged (e.g., when
+    forwarding) as long as the data was never accessed and the type and
+    payload weren't replaced.
+    """
+
+    __slots__ = (
+        "data_length",
+        "payload_length",
+        "_header_bytes",
+        "_header_data",
+        "_data_bytes",
+        "_raw_type",
+        "_raw_payload",
+        "_data",
+    )
+
+    def __init__(
+        self,
+        header_bytes: Optional[bytes],
+        header_dict: Dict[str, Any],
+        data_bytes: Optional[bytes] = None,
+        payload: Optional[bytes] = None,
+    ) -> None:
+        super().__init__(type=header_dict[_TYPE], payload=payload)
+
+        # Replaces the empty data from Event.__init__
+        self._data: Any = _NOT_DECODED
+
+        self.data_length: int = header_dict.get(_DATA_LENGTH) or 0
+        """Length of additional data in bytes."""
+
+        self.payload_length: int = len(payload) if payload else 0
+        """Length of payload in bytes."""
+
+        self._header_bytes = header_bytes
+        self._header_data: Optional[Dict[str, Any]] = header_dict.get(_DATA)
+        self._data_bytes = data_bytes
+        self._raw_type = self.type
+        self._raw_payload = payload
+
+    @property  # type: ignore[override]
+    def data(self) -> Dict[str, Any]:
+        if self._data is not _NOT_DECODED:
+            return self._data
+
+        # Decode on first access
+        data = self._header_data
+        if self._data_bytes:
+            data = data or {}
+            data.update(json.loads(self._data_bytes))
+
+        self.data = data  # type: ignore[assignment]
+        return data  # type: ignore[return-value]
+
+    @data.setter
+    def data(self, value: Dict[str, Any]) -> None:
+        self._data = value
+
+        # Data may be modified
+        self._header_bytes = None
+
+    @property
+    def is_data_decoded(self) -> bool:
+        """True if data has been accessed."""
+        return self._data is not _NOT_DECODED
+
+    def get_raw_bytes(self) -> Optional[Tuple[bytes, Optional[bytes]]]:
+        """Get original header line and data bytes if the event is unchanged."""
+        if (
+            (self._header_bytes is None)
+            or (self.type != self._raw_type)
+            or (self.payload is not self._raw_payload)
+        ):
+            return None
+
+        return self._header_bytes, self._data_bytes
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, Event):
+            return NotImplemented
+
+        return (self.type, self.data, self.payload) == (
+            other.type,
+            other.data,
+            other.payload,
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"LazyEvent(type={self.type!r}, data={self.data!r}, "
+            f"payload={self.payload!r})"
+        )
+
+
+class EventTooLargeError(ValueError):
+    """Event data or payload is longer than allowed."""
+
+
 class Eventable(ABC):
+    __slots__ = ()
+
     @abstractmethod
     def event(self) -> Event:
         pass
@@ -74,37 +206,305 @@ async def async_get_stdout(
     return asyncio.streams.StreamWriter(writer_transport, writer_protocol, None, loop)
 
 
-async def async_read_event(reader: asyncio.StreamReader) -> Optional[Event]:
+async def async_read_event(
+    reader: asyncio.StreamReader,
+    max_data_length: int = DEFAULT_MAX_DATA_LENGTH,
+    max_payload_length: int = DEFAULT_MAX_PAYLOAD_LENGTH,
+    lazy: bool = False,
+) -> Optional[Event]:
+    """Read event, raising EventTooLargeError if its data or payload is too long.
+
+    If lazy is True, a LazyEvent is returned when reading from a byte stream.
+    """
+    get_event = getattr(reader, "get_event", None)
+    if get_event is not None:
+        # In-process or UDP reader (see inproc.py, udp.py)
+        return await get_event(
+            max_data_length=max_data_length, max_payload_length=max_payload_length
+        )
+
+    if lazy:
+        return await _async_read_lazy_event(
+            reader,
+            max_data_length=max_data_length,
+            max_payload_length=max_payload_length,
+        )
+
+    return await _async_read_stream_event(
+        reader, max_data_length=max_data_length, max_payload_length=max_payload_length
+    )
+
+
+async def async_read_event_stream(
+    reader: asyncio.StreamReader,
+    min_stream_length: int = 0,
+    max_data_length: int = DEFAULT_MAX_DATA_LENGTH,
+    max_payload_length: int = DEFAULT_MAX_PAYLOAD_LENGTH,
+    chunk_size: int = DEFAULT_PAYLOAD_CHUNK_SIZE,
+) -> Optional[Tuple[Event, Optional["PayloadStream"]]]:
+    """Read event with payloads of at least min_stream_length as a PayloadStream.
+
+    The payload of a streamed event is None, and the stream must be read or
+    skipped before the next event. There is no length limit on streamed
+    payloads.
+    """
+    get_event = getattr(reader, "get_event", None)
+    if get_event is not None:
+        # In-process or UDP reader (see inproc.py, udp.py)
+        event = await get_event(max_data_length=max_data_length)
+        if event is None:
+            return None
+
+        if (not event.payload) or (len(event.payload) < min_stream_length):
+            return event, None
+
+        # Don't modify the sender's event
+        return Event(type=event.type, data=event.data), PayloadStream(
+            len(event.payload), payload=event.payload, chunk_size=chunk_size
+        )
+
+    result = await _async_read_stream_event_start(reader, max_data_length)
+    if result is None:
+        return None
+
+    event, payload_length = result
+    if payload_length <= 0:
+        return event, None
+
+    if payload_length >= min_stream_length:
+        return event, PayloadStream(
+            payload_length, reader=reader, chunk_size=chunk_size
+        )
+
+    _check_payload_length(payload_length, max_payload_length)
+    event.payload = await reader.readexactly(payload_length)
+
+    return event, None
+
+
+async def _async_read_stream_event(
+    reader: asyncio.StreamReader,
+    header: Optional[Dict[str, Any]] = None,
+    max_data_length: int = DEFAULT_MAX_DATA_LENGTH,
+    max_payload_length: int = DEFAULT_MAX_PAYLOAD_LENGTH,
+) -> Optional[Event]:
+    """Read event from a byte stream, copying header fields into header if given."""
+    result = await _async_read_stream_event_start(reader, max_data_length, header)
+    if result is None:
+        return None
+
+    event, payload_length = result
+    if payload_length > 0:
+        _check_payload_length(payload_length, max_payload_length)
+        event.payload = await reader.readexactly(payload_length)
+
+    return event
+
+
+async def async_read_sequenced_event(
+    reader: asyncio.StreamReader,
+    max_data_length: int = DEFAULT_MAX_DATA_LENGTH,
+    max_payload_length: int = DEFAULT_MAX_PAYLOAD_LENGTH,
+) -> Optional[Tuple[Event, int]]:
+    """Read event and the number of UDP datagrams sent before it (see udp.py).
+
+    Returns None at end of stream or if the event is malformed.
+    """
+    header: Dict[str, Any] = {}
+    event = await _async_read_stream_event(
+        reader,
+        header,
+        max_data_length=max_data_length,
+        max_payload_length=max_payload_length,
+    )
+    if event is None:
+        return None
+
+    udp_sequence = header.get(_UDP_SEQUENCE) or 0
+    if (not isinstance(udp_sequence, int)) or (udp_sequence < 0):
+        return None
+
+    return event, udp_sequence
+
+
+async def _async_read_lazy_event(
+    reader: asyncio.StreamReader,
+    max_data_length: int = DEFAULT_MAX_DATA_LENGTH,
+    max_payload_length: int = DEFAULT_MAX_PAYLOAD_LENGTH,
+) -> Optional[LazyEvent]:
+    """Read event from a byte stream without decoding its data."""
+    try:
+        json_line = await reader.readline()
+        if not json_line:
+            return None
+
+        # Header line is short, but the data may not be
+        header_dict = json.loads(json_line)
+        header_bytes: Optional[bytes] = json_line
+
+        data_length = header_dict.get(_DATA_LENGTH)
+        data_bytes: Optional[bytes] = None
+        if (data_length is not None) and (data_length > 0):
+            if data_length > max_data_length:
+                raise EventTooLargeError(
+                    f"Event data is too long: {data_length} > {max_data_length}"
+                )
+
+            data_bytes = await reader.readexactly(data_length)
+
+        payload_length = header_dict.get(_PAYLOAD_LENGTH) or 0
+
+        payload: Optional[bytes] = None
+        if payload_length > 0:
+            _check_payload_length(payload_length, max_payload_length)
+            payload = await reader.readexactly(payload_length)
+        elif _PAYLOAD_SHM in header_dict:
+            # Payload is in shared memory (see shm.py), so header can't be reused
+            payload = reader.read_shared_payload(  # type: ignore[attr-defined]
+                header_dict[_PAYLOAD_SHM]
+            )
+            header_bytes = None
+
+        return LazyEvent(header_bytes, header_dict, data_bytes, payload)
+    except EventTooLargeError:
+        raise
+    except (KeyboardInterrupt, ValueError):
+        pass
+
+    return None
+
+
+async def _async_read_stream_event_start(
+    reader: asyncio.StreamReader,
+    max_data_length: int,
+    header: Optional[Dict[str, Any]] = None,
+) -> Optional[Tuple[Event, int]]:
+    """Read event up to its payload, returning the payload length left to read."""
     try:
         json_line = await reader.readline()
         if not json_line:
             return None
 
         event_dict = json.loads(json_line)
+        if header is not None:
+            header.update(event_dict)
+
         data_length = event_dict.get(_DATA_LENGTH)
         if (data_length is not None) and (data_length > 0):
+            if data_length > max_data_length:
+                raise EventTooLargeError(
+                    f"Event data is too long: {data_length} > {max_data_length}"
+                )
+
             # Merge data
             data_bytes = await reader.readexactly(data_length)
             data_dict = event_dict.get(_DATA, {})
             data_dict.update(json.loads(data_bytes))
             event_dict[_DATA] = data_dict
 
-        payload_length = event_dict.get(_PAYLOAD_LENGTH)
+        payload_length = event_dict.get(_PAYLOAD_LENGTH) or 0
 
         payload: Optional[bytes] = None
-        if (payload_length is not None) and (payload_length > 0):
-            payload = await reader.readexactly(payload_length)
+        if (payload_length <= 0) and (_PAYLOAD_SHM in event_dict):
+            # Payload is in shared memory (see shm.py)
+            payload = reader.read_shared_payload(  # type: ignore[attr-defined]
+                event_dict[_PAYLOAD_SHM]
+            )
 
-        return Event(
+        event = Event(
             type=event_dict[_TYPE], data=event_dict.get(_DATA), payload=payload
         )
+        return event, payload_length
+    except EventTooLargeError:
+        raise
     except (KeyboardInterrupt, ValueError):
         pass
 
     return None
 
 
-async def async_write_event(event: Event, writer: asyncio.StreamWriter):
+def _check_payload_length(payload_length: int, max_payload_length: int) -> None:
+    if payload_length > max_payload_length:
+        raise EventTooLargeError(
+            f"Event payload is too long: {payload_length} > {max_payload_length}"
+        )
+
+
+class PayloadStream:
+    """Event payload that is read in chunks instead of all at once."""
+
+    def __init__(
+        self,
+        length: int,
+        reader: Optional[asyncio.StreamReader] = None,
+        payload: Optional[bytes] = None,
+        chunk_size: int = DEFAULT_PAYLOAD_CHUNK_SIZE,
+    ) -> None:
+        self.length = length
+        """Total length of payload in bytes."""
+
+        self.bytes_left = length
+        """Bytes of payload not yet read."""
+
+        self.chunk_size = chunk_size
+        self._reader = reader
+        self._payload = payload
+
+    def __aiter__(self) -> "PayloadStream":
+        return self
+
+    async def __anext__(self) -> bytes:
+        if self.bytes_left <= 0:
+            raise StopAsyncIteration
+
+        num_bytes = min(self.chunk_size, self.bytes_left)
+        if self._payload is not None:
+            offset = self.length - self.bytes_left
+            chunk = self._payload[offset : offset + num_bytes]
+        else:
+            assert self._reader is not None
+            chunk = await self._reader.readexactly(num_bytes)
+
+        self.bytes_left -= num_bytes
+        return chunk
+
+    async def read(self, max_length: Optional[int] = None) -> bytes:
+        """Read the rest of the payload into memory."""
+        if (max_length is not None) and (self.bytes_left > max_length):
+            raise EventTooLargeError(
+                f"Event payload is too long: {self.bytes_left} > {max_length}"
+            )
+
+        if (self._payload is not None) and (self.bytes_left == self.length):
+            self.bytes_left = 0
+            return self._payload
+
+        return b"".join([chunk async for chunk in self])
+
+    async def skip(self) -> None:
+        """Discard the rest of the payload."""
+        async for _chunk in self:
+            pass
+
+
+def _encode_header(
+    event: Event,
+    payload_shm: Optional[Any] = None,
+    udp_sequence: Optional[int] = None,
+    payload_length: Optional[int] = None,
+) -> Tuple[bytes, Optional[bytes]]:
+    """Encode JSON header line (with newline) and additional data."""
+    if (
+        isinstance(event, LazyEvent)
+        and (payload_shm is None)
+        and (udp_sequence is None)
+        and (payload_length is None)
+    ):
+        raw_bytes = event.get_raw_bytes()
+        if raw_bytes is not None:
+            # Unchanged since it was read
+            return raw_bytes
+
     event_dict: Dict[str, Any] = event.to_dict()
     event_dict[_VERSION] = _VERSION_NUMBER
 
@@ -114,13 +514,67 @@ async def async_write_event(event: Event, writer: asyncio.StreamWriter):
         data_bytes = json.dumps(data_dict, ensure_ascii=False).encode("utf-8")
         event_dict[_DATA_LENGTH] = len(data_bytes)
 
-    if event.payload:
+    if payload_shm is not None:
+        event_dict[_PAYLOAD_SHM] = payload_shm
+    elif payload_length is not None:
+        # Payload is written separately
+        event_dict[_PAYLOAD_LENGTH] = payload_length
+    elif event.payload:
         event_dict[_PAYLOAD_LENGTH] = len(event.payload)
 
+    if udp_sequence is not None:
+        # Audio datagrams sent before this event (see udp.py)
+        event_dict[_UDP_SEQUENCE] = udp_sequence
+
     json_line = json.dumps(event_dict, ensure_ascii=False)
 
+    return json_line.encode() + _NEWLINE, data_bytes
+
+
+def encode_event(event: Event) -> bytes:
+    """Encode complete event (header, data, payload) as bytes."""
+    header_bytes, data_bytes = _encode_header(event)
+    return b"".join((header_bytes, data_bytes or b"", event.payload or b""))
+
+
+async def async_write_event(event: Event, writer: asyncio.StreamWriter):
+    put_event = getattr(writer, "put_event", None)
+    if put_event is not None:
+        # In-process or UDP writer (see inproc.py, udp.py)
+        await put_event(event)
+        return
+
+    payload_shm: Optional[Any] = None
+    if event.payload:
+        share_payload = getattr(writer, "share_payload", None)
+        if share_payload is not None:
+            # Shared memory writer (see shm.py)
+            payload_shm = share_payload(event.payload)
+
+    header_bytes, data_bytes = _encode_header(event, payload_shm)
+
+    try:
+        writer.write(header_bytes)
+
+        if data_bytes:
+            writer.write(data_bytes)
+
+        if event.payload and (payload_shm is None):
+            writer.write(event.payload)
+
+        await writer.drain()
+    except KeyboardInterrupt:
+        pass
+
+
+async def async_write_sequenced_event(
+    event: Event, writer: asyncio.StreamWriter, udp_sequence: int
+):
+    """Write event with the number of UDP datagrams sent before it (see udp.py)."""
+    header_bytes, data_bytes = _encode_header(event, udp_sequence=udp_sequence or None)
+
     try:
-        writer.writelines((json_line.encode(), _NEWLINE))
+        writer.write(header_bytes)
 
         if data_bytes:
             writer.write(data_bytes)
@@ -133,6 +587,68 @@ async def async_write_event(event: Event, writer: asyncio.StreamWriter):
         pass
 
 
+async def async_write_event_stream(
+    event: Event,
+    payload_length: int,
+    payload_chunks: AsyncIterable[bytes],
+    writer: asyncio.StreamWriter,
+):
+    """Write event with a payload that is sent in chunks (event.payload is ignored).
+
+    The chunks must add up to exactly payload_length bytes, or ValueError is
+    raised (and the stream can't be used anymore).
+    """
+    if getattr(writer, "put_event", None) is not None:
+        # Events are passed whole (see inproc.py, udp.py)
+        payload = b"".join([chunk async for chunk in payload_chunks])
+        if len(payload) != payload_length:
+            raise ValueError(
+                f"Payload length mismatch: {len(payload)} != {payload_length}"
+            )
+
+        await async_write_event(
+            Event(type=event.type, data=event.data, payload=payload), writer
+        )
+        return
+
+    header_bytes, data_bytes = _encode_header(event, payload_length=payload_length)
+
+    try:
+        writer.write(header_bytes)
+
+        if data_bytes:
+            writer.write(data_bytes)
+
+        bytes_written = 0
+        async for chunk in payload_chunks:
+            bytes_written += len(chunk)
+            if bytes_written > payload_length:
+                raise ValueError(
+                    f"Payload is longer than payload_length: {payload_length}"
+                )
+
+            writer.write(chunk)
+            await writer.drain()
+
+        if bytes_written != payload_length:
+            raise ValueError(
+                f"Payload length mismatch: {bytes_written} != {payload_length}"
+            )
+
+        await writer.drain()
+    except KeyboardInterrupt:
+        pass
+
+
+async def async_write_bytes(event_bytes: bytes, writer: asyncio.StreamWriter):
+    """Write pre-encoded event bytes (see encode_event)."""
+    try:
+        writer.write(event_bytes)
+        await writer.drain()
+    except KeyboardInterrupt:
+        pass
+
+
 async def async_write_events(events: Iterable[Event], writer: asyncio.StreamWriter):
     try:
         await asyncio.gather(*(async_write_event(event, writer) for event in events))
@@ -140,7 +656,12 @@ async def async_write_events(events: Iterable[Event], writer: asyncio.StreamWrit
         pass
 
 
-def read_event(reader: Optional[BinaryIO] = None) -> Optional[Event]:
+def read_event(
+    reader: Optional[BinaryIO] = None,
+    max_data_length: int = DEFAULT_MAX_DATA_LENGTH,
+    max_payload_length: int = DEFAULT_MAX_PAYLOAD_LENGTH,
+) -> Optional[Event]:
+    """Read event, raising EventTooLargeError if its data or payload is too long."""
     if reader is None:
         reader = sys.stdin.buffer
 
@@ -153,10 +674,15 @@ def read_event(reader: Optional[BinaryIO] = None) -> Optional[Event]:
         event_dict = json.loads(json_line)
         data_length = event_dict.get(_DATA_LENGTH)
         if (data_length is not None) and (data_length > 0):
+            if data_length > max_data_length:
+                raise EventTooLargeError(
+                    f"Event data is too long: {data_length} > {max_data_length}"
+                )
+
             # Merge data
-            data_bytes = reader.read(data_length)
-            while len(data_bytes) < data_length:
-                data_bytes += reader.read(data_length - len(data_bytes))
+            data_bytes = _read_exactly(reader, data_length)
+            if data_bytes is None:
+                return None
 
             data_dict = event_dict.get(_DATA, {})
             data_dict.update(json.loads(data_bytes))
@@ -166,46 +692,119 @@ def read_event(reader: Optional[BinaryIO] = None) -> Optional[Event]:
 
         payload: Optional[bytes] = None
         if payload_length is not None:
-            payload = reader.read(payload_length)
-            while len(payload) < payload_length:
-                payload += reader.read(payload_length - len(payload))
+            _check_payload_length(payload_length, max_payload_length)
+            payload = _read_exactly(reader, payload_length)
+            if payload is None:
+                return None
 
         return Event(
             type=event_dict[_TYPE], data=event_dict.get(_DATA), payload=payload
         )
+    except EventTooLargeError:
+        raise
     except (KeyboardInterrupt, ValueError):
         pass
 
     return None
 
 
-def write_event(event: Event, writer: Optional[BinaryIO] = None):
-    if writer is None:
-        writer = sys.stdout.buffer
+def read_events(
+    reader: Optional[BinaryIO] = None,
+    max_data_length: int = DEFAULT_MAX_DATA_LENGTH,
+    max_payload_length: int = DEFAULT_MAX_PAYLOAD_LENGTH,
+) -> Iterator[Event]:
+    """Read events until the end of the stream."""
+    if reader is None:
+        reader = sys.stdin.buffer
 
-    event_dict: Dict[str, Any] = event.to_dict()
-    event_dict[_VERSION] = _VERSION_NUMBER
+    while True:
+        event = read_event(
+            reader,
+            max_data_length=max_data_length,
+            max_payload_length=max_payload_length,
+        )
+        if event is None:
+            break
+
+        yield event
+
+
+def _read_exactly(reader: BinaryIO, length: int) -> Optional[bytes]:
+    """Read exactly length bytes, or None if the stream ends first."""
+    # Buffered readers usually return everything at once
+    first_bytes = reader.read(length)
+    if len(first_bytes) >= length:
+        return first_bytes
+
+    if not first_bytes:
+        return None
+
+    # Fill the rest of a preallocated buffer without re-copying
+    buffer = bytearray(length)
+    buffer_view = memoryview(buffer)
+    position = len(first_bytes)
+    buffer_view[:position] = first_bytes
+
+    readinto = getattr(reader, "readinto", None)
+    while position < length:
+        if readinto is not None:
+            num_bytes = readinto(buffer_view[position:])
+        else:
+            chunk = reader.read(length - position)
+            num_bytes = len(chunk)
+            buffer_view[position : position + num_bytes] = chunk
+
+        if not num_bytes:
+            # End of stream
+            return None
 
-    data_dict = event_dict.pop(_DATA, None)
-    data_bytes: Optional[bytes] = None
-    if data_dict:
-        data_bytes = json.dumps(data_dict, ensure_ascii=False).encode("utf-8")
-        event_dict[_DATA_LENGTH] = len(data_bytes)
+        position += num_bytes
 
-    if event.payload:
-        event_dict[_PAYLOAD_LENGTH] = len(event.payload)
+    buffer_view.release()
+    return bytes(buffer)
 
-    json_line = json.dumps(event_dict, ensure_ascii=False)
 
-    try:
-        writer.writelines((json_line.encode(), _NEWLINE))
+def write_event(
+    event: Event, writer: Optional[BinaryIO] = None, flush: bool = True
+) -> None:
+    if writer is None:
+        writer = sys.stdout.buffer
 
-        if data_bytes:
-            writer.write(data_bytes)
+    header_bytes, data_bytes = _encode_header(event)
 
-        if event.payload:
+    try:
+        if event.payload and (len(event.payload) > _MAX_JOIN_LENGTH):
+            # Avoid copying large payloads
+            writer.write(header_bytes + (data_bytes or b""))
             writer.write(event.payload)
+        else:
+            # One write per event
+            writer.write(
+                b"".join((header_bytes, data_bytes or b"", event.payload or b""))
+            )
+
+        if flush:
+            writer.flush()
+    except KeyboardInterrupt:
+        pass
+
+
+def write_events(events: Iterable[Event], writer: Optional[BinaryIO] = None) -> int:
+    """Write a batch of events with a single flush at the end.
 
+    Returns the number of events written.
+    """
+    if writer is None:
+        writer = sys.stdout.buffer
+
+    num_events = 0
+    for event in events:
+        write_event(event, writer, flush=False)
+        num_events += 1
+
+    try:
         writer.flush()
     except KeyboardInterrupt:
         pass
+
+    return num_events
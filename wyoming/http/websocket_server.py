@@ -0,0 +1,196 @@
+"""WebSocket bridge for bidirectional audio streaming.
+
+Binary frames are raw PCM audio (audio-chunk events).
+Text frames are Wyoming events as JSON: {"type": "...", "data": {...}}
+"""
+import argparse
+import asyncio
+import json
+import logging
+from functools import partial
+from typing import Any, Optional
+
+from websockets import ConnectionClosed, serve
+
+from wyoming.audio import AudioChunk, AudioStart
+from wyoming.client import AsyncClient
+from wyoming.error import Error
+from wyoming.event import Event
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class WebSocketBridge:
+    """Forwards events between a WebSocket and a Wyoming service."""
+
+    def __init__(
+        self,
+        websocket: Any,
+        client: AsyncClient,
+        rate: int,
+        width: int,
+        channels: int,
+    ) -> None:
+        self.websocket = websocket
+        self.client = client
+
+        # Format of binary frames from the WebSocket.
+        # Updated by audio-start text frames.
+        self.rate = rate
+        self.width = width
+        self.channels = channels
+
+    async def run(self) -> None:
+        """Forward events in both directions until either side disconnects."""
+        to_service = asyncio.create_task(self._websocket_to_service())
+        to_websocket = asyncio.create_task(self._service_to_websocket())
+
+        try:
+            await asyncio.wait(
+                {to_service, to_websocket}, return_when=asyncio.FIRST_COMPLETED
+            )
+        finally:
+            to_service.cancel()
+            to_websocket.cancel()
+            await asyncio.gather(to_service, to_websocket, return_exceptions=True)
+
+    async def _websocket_to_service(self) -> None:
+        async for message in self.websocket:
+            if isinstance(message, (bytes, bytearray, memoryview)):
+                # Raw audio
+                await self.client.write_event(
+                    AudioChunk(
+                        rate=self.rate,
+                        width=self.width,
+                        channels=self.channels,
+                        audio=bytes(message),
+                    ).event()
+                )
+                continue
+
+            try:
+                event = Event.from_dict(json.loads(message))
+                if AudioStart.is_type(event.type):
+                    audio_start = AudioStart.from_event(event)
+                    self.rate = audio_start.rate
+                    self.width = audio_start.width
+                    self.channels = audio_start.channels
+            except (ValueError, KeyError, TypeError, AttributeError) as err:
+                # Report malformed event and keep the connection open
+                _LOGGER.debug("Invalid event from WebSocket: %s", err)
+                await self.websocket.send(
+                    json.dumps(
+                        Error(text=f"Invalid event: {err}", code="invalid-event")
+                        .event()
+                        .to_dict(),
+                        ensure_ascii=False,
+                    )
+                )
+                continue
+
+            await self.client.write_event(event)
+
+    async def _service_to_websocket(self) -> None:
+        while True:
+            event = await self.client.read_event()
+            if event is None:
+                _LOGGER.debug("Service disconnected")
+                break
+
+            if AudioChunk.is_type(event.type) and event.payload:
+                # Format is sent beforehand in audio-start
+                await self.websocket.send(event.payload)
+            else:
+                await self.websocket.send(
+                    json.dumps(event.to_dict(), ensure_ascii=False)
+                )
+
+
+# -----------------------------------------------------------------------------
+
+
+def get_argument_parser() -> argparse.ArgumentParser:
+    """Create argument parser for WebSocket bridge."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=5001)
+    parser.add_argument("--uri", required=True, help="URI of Wyoming service")
+    parser.add_argument(
+        "--rate",
+        type=int,
+        default=16000,
+        help="Sample rate of binary frames before audio-start",
+    )
+    parser.add_argument(
+        "--width",
+        type=int,
+        default=2,
+        help="Sample width of binary frames before audio-start",
+    )
+    parser.add_argument(
+        "--channels",
+        type=int,
+        default=1,
+        help="Sample channels of binary frames before audio-start",
+    )
+    parser.add_argument(
+        "--debug", action="store_true", help="Print DEBUG logs to console"
+    )
+    return parser
+
+
+async def handle_websocket(
+    websocket: Any,
+    _path: Optional[str] = None,
+    *,
+    uri: str,
+    rate: int = 16000,
+    width: int = 2,
+    channels: int = 1,
+) -> None:
+    """Bridge one WebSocket connection to the Wyoming service at uri."""
+    _LOGGER.debug("WebSocket connected")
+
+    try:
+        # One persistent service connection per WebSocket
+        async with AsyncClient.from_uri(uri) as client:
+            bridge = WebSocketBridge(
+                websocket, client, rate=rate, width=width, channels=channels
+            )
+            await bridge.run()
+    except ConnectionClosed:
+        pass
+    except Exception:
+        _LOGGER.exception("Unexpected error in WebSocket bridge")
+    finally:
+        _LOGGER.debug("WebSocket disconnected")
+
+
+async def run_bridge(args: argparse.Namespace) -> None:
+    """Accept WebSocket connections and bridge each to the Wyoming service."""
+    handler = partial(
+        handle_websocket,
+        uri=args.uri,
+        rate=args.rate,
+        width=args.width,
+        channels=args.channels,
+    )
+
+    async with serve(handler, args.host, args.port):
+        _LOGGER.info("Listening on ws://%s:%s", args.host, args.port)
+        await asyncio.Future()
+
+
+def main():
+    parser = get_argument_parser()
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.DEBUG if args.debug else logging.INFO)
+
+    try:
+        asyncio.run(run_bridge(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -1,31 +1,120 @@
 """Information about available services, models, etc.."""
 
-from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional
+import asyncio
+import copy
+import fnmatch
+import hashlib
+import json
+from collections import OrderedDict
+from dataclasses import dataclass, field, replace
+from typing import Any, Dict, List, Optional, Tuple
 
 from .audio import AudioFormat
-from .event import Event, Eventable
+from .event import Event, Eventable, async_write_bytes, encode_event
+from .tts import SynthesizeVoice
 from .util.dataclasses_json import DataClassJsonMixin
 
 DOMAIN = "info"
 _DESCRIBE_TYPE = "describe"
 _INFO_TYPE = "info"
+_INFO_UNCHANGED_TYPE = "info-unchanged"
+_INFO_DELTA_TYPE = "info-delta"
+
+# domain -> key of model list in program
+_MODEL_KEYS: Dict[str, str] = {
+    "asr": "models",
+    "tts": "voices",
+    "handle": "models",
+    "intent": "models",
+    "wake": "models",
+}
+
+# Artifact fields that can be omitted from info -> replacement value.
+# None means the field is removed and decoded as None.
+_OMIT_FIELDS: Dict[str, Any] = {
+    "description": None,
+    "version": None,
+    "attribution": {"name": "", "url": ""},
+    "speakers": None,
+    "phrase": None,
+}
+
+_MAX_FILTERED_RESPONSES = 16
 
 
 @dataclass
 class Describe(Eventable):
     """Request info message."""
 
+    etag: Optional[str] = None
+    """Tag of info the client already has.
+
+    Server may reply with info-unchanged or info-delta instead of info.
+    """
+
+    domains: Optional[List[str]] = None
+    """Only include these services (asr, tts, wake, etc.)."""
+
+    languages: Optional[List[str]] = None
+    """Only include models/voices that support one of these languages."""
+
+    names: Optional[List[str]] = None
+    """Only include models/voices whose names match one of these patterns."""
+
+    installed_only: bool = False
+    """Only include installed programs and models/voices."""
+
+    omit: Optional[List[str]] = None
+    """Fields to leave out of programs and models/voices (e.g., description)."""
+
+    @property
+    def is_filtered(self) -> bool:
+        """True if only part of info was requested."""
+        return (
+            (self.domains is not None)
+            or (self.languages is not None)
+            or (self.names is not None)
+            or self.installed_only
+            or bool(self.omit)
+        )
+
     @staticmethod
     def is_type(event_type: str) -> bool:
         return event_type == _DESCRIBE_TYPE
 
     def event(self) -> Event:
-        return Event(type=_DESCRIBE_TYPE)
+        data: Dict[str, Any] = {}
+        if self.etag is not None:
+            data["etag"] = self.etag
+
+        if self.domains is not None:
+            data["domains"] = self.domains
+
+        if self.languages is not None:
+            data["languages"] = self.languages
+
+        if self.names is not None:
+            data["names"] = self.names
+
+        if self.installed_only:
+            data["installed_only"] = self.installed_only
+
+        if self.omit:
+            data["omit"] = self.omit
+
+        return Event(type=_DESCRIBE_TYPE, data=data)
 
     @staticmethod
     def from_event(event: Event) -> "Describe":
-        return Describe()
+        data = event.data or {}
+        return Describe(
+            etag=data.get("etag"),
+            domains=data.get("domains"),
+            languages=data.get("languages"),
+            names=data.get("names"),
+            installed_only=data.get("installed_only", False),
+            omit=data.get("omit"),
+        )
 
 
 @dataclass
@@ -244,6 +333,9 @@ class Info(Eventable):
     satellite: Optional[Satellite] = None
     """Satellite information."""
 
+    etag: Optional[str] = None
+    """Tag that changes whenever info changes (see InfoCache)."""
+
     @staticmethod
     def is_type(event_type: str) -> bool:
         return event_type == _INFO_TYPE
@@ -262,6 +354,9 @@ class Info(Eventable):
         if self.satellite is not None:
             data["satellite"] = self.satellite.to_dict()
 
+        if self.etag is not None:
+            data["etag"] = self.etag
+
         return Event(type=_INFO_TYPE, data=data)
 
     @staticmethod
@@ -282,4 +377,661 @@ class Info(Eventable):
             mic=[MicProgram.from_dict(d) for d in event.data.get("mic", [])],
             snd=[SndProgram.from_dict(d) for d in event.data.get("snd", [])],
             satellite=satellite,
+            etag=event.data.get("etag"),
+        )
+
+    def merge(self, other: "Info") -> "Info":
+        """Return a copy of info with programs and models/voices from other.
+
+        Used to combine the responses of filtered describe requests.
+        """
+        changes: Dict[str, Any] = {}
+        for domain, models_key in _MODEL_KEYS.items():
+            changes[domain] = _merge_programs(
+                getattr(self, domain), getattr(other, domain), {}, models_key
+            )
+
+        for domain in ("mic", "snd"):
+            other_programs = {p.name: p for p in getattr(other, domain)}
+            programs = [other_programs.pop(p.name, p) for p in getattr(self, domain)]
+            programs.extend(other_programs.values())
+            changes[domain] = programs
+
+        if other.satellite is not None:
+            changes["satellite"] = other.satellite
+
+        if other.etag is not None:
+            changes["etag"] = other.etag
+
+        return replace(self, **changes)
+
+
+@dataclass
+class InfoUnchanged(Eventable):
+    """Response to describe when the client's info is up to date."""
+
+    etag: str
+    """Tag of current info."""
+
+    @staticmethod
+    def is_type(event_type: str) -> bool:
+        return event_type == _INFO_UNCHANGED_TYPE
+
+    def event(self) -> Event:
+        return Event(type=_INFO_UNCHANGED_TYPE, data={"etag": self.etag})
+
+    @staticmethod
+    def from_event(event: Event) -> "InfoUnchanged":
+        assert event.data is not None
+        return InfoUnchanged(etag=event.data["etag"])
+
+
+@dataclass
+class InfoDelta(Eventable):
+    """Response to describe with only the models/voices that changed."""
+
+    etag: str
+    """Tag of info after the delta is applied."""
+
+    base_etag: str
+    """Tag of info that the delta applies to."""
+
+    added: Info = field(default_factory=Info)
+    """Programs with only their added or changed models/voices."""
+
+    removed: Dict[str, Dict[str, List[str]]] = field(default_factory=dict)
+    """Names of removed models/voices (domain -> program name -> names)."""
+
+    @staticmethod
+    def is_type(event_type: str) -> bool:
+        return event_type == _INFO_DELTA_TYPE
+
+    def event(self) -> Event:
+        added_data = {
+            domain: programs
+            for domain, programs in self.added.event().data.items()
+            if programs
+        }
+        return Event(
+            type=_INFO_DELTA_TYPE,
+            data={
+                "etag": self.etag,
+                "base_etag": self.base_etag,
+                "added": added_data,
+                "removed": self.removed,
+            },
+        )
+
+    @staticmethod
+    def from_event(event: Event) -> "InfoDelta":
+        assert event.data is not None
+        return InfoDelta(
+            etag=event.data["etag"],
+            base_etag=event.data["base_etag"],
+            added=Info.from_event(
+                Event(type=_INFO_TYPE, data=event.data.get("added", {}))
+            ),
+            removed=event.data.get("removed", {}),
+        )
+
+    def apply(self, info: Info) -> Info:
+        """Return a copy of info with this delta applied."""
+        if info.etag != self.base_etag:
+            raise ValueError(
+                f"Delta applies to {self.base_etag}, but info is {info.etag}"
+            )
+
+        changes: Dict[str, Any] = {"etag": self.etag}
+        for domain, models_key in _MODEL_KEYS.items():
+            added_programs = getattr(self.added, domain)
+            removed_names = self.removed.get(domain, {})
+            if (not added_programs) and (not removed_names):
+                continue
+
+            changes[domain] = _merge_programs(
+                getattr(info, domain), added_programs, removed_names, models_key
+            )
+
+        return replace(info, **changes)
+
+
+def _merge_programs(
+    programs: List[Any],
+    added_programs: List[Any],
+    removed_names: Dict[str, List[str]],
+    models_key: str,
+) -> List[Any]:
+    """Merge programs by name, adding/replacing and removing models by name."""
+    added_by_name = {p.name: p for p in added_programs}
+    merged_programs = []
+    for program in programs:
+        added_program = added_by_name.pop(program.name, None)
+        program_removed = set(removed_names.get(program.name, []))
+        if (added_program is None) and (not program_removed):
+            merged_programs.append(program)
+            continue
+
+        models = {
+            model.name: model
+            for model in getattr(program, models_key)
+            if model.name not in program_removed
+        }
+
+        if added_program is not None:
+            # Upsert added/changed models
+            for model in getattr(added_program, models_key):
+                models[model.name] = model
+
+            program = added_program
+
+        merged_programs.append(replace(program, **{models_key: list(models.values())}))
+
+    # New programs
+    merged_programs.extend(added_by_name.values())
+
+    return merged_programs
+
+
+def filter_info_data(info_data: Dict[str, Any], describe: Describe) -> Dict[str, Any]:
+    """Filter info event data using a describe request."""
+    if not describe.is_filtered:
+        return info_data
+
+    filter_models = (
+        (describe.languages is not None)
+        or (describe.names is not None)
+        or describe.installed_only
+    )
+    languages = [_normalize_language(lang) for lang in describe.languages or []]
+
+    def omit(artifact: Dict[str, Any]) -> Dict[str, Any]:
+        if not describe.omit:
+            return artifact
+
+        artifact = dict(artifact)
+        for key in describe.omit:
+            if key not in _OMIT_FIELDS:
+                # Required field
+                continue
+
+            replacement = _OMIT_FIELDS[key]
+            if replacement is None:
+                artifact.pop(key, None)
+            elif key in artifact:
+                artifact[key] = replacement
+
+        return artifact
+
+    def is_model_match(model: Dict[str, Any]) -> bool:
+        if describe.installed_only and (not model.get("installed", True)):
+            return False
+
+        if (describe.names is not None) and (
+            not any(
+                fnmatch.fnmatchcase(model.get("name", ""), pattern)
+                for pattern in describe.names
+            )
+        ):
+            return False
+
+        if (describe.languages is not None) and (
+            not any(
+                _is_language_match(_normalize_language(model_lang), lang)
+                for model_lang in model.get("languages") or []
+                for lang in languages
+            )
+        ):
+            return False
+
+        return True
+
+    filtered_data: Dict[str, Any] = {}
+    for key, value in info_data.items():
+        if key == "etag":
+            # Tag of the full info doesn't apply to partial info
+            continue
+
+        if (describe.domains is not None) and (key not in describe.domains):
+            continue
+
+        if key == "satellite":
+            filtered_data[key] = omit(value) if value is not None else None
+            continue
+
+        if not isinstance(value, list):
+            filtered_data[key] = value
+            continue
+
+        programs = []
+        models_key = _MODEL_KEYS.get(key)
+        for program in value:
+            if describe.installed_only and (not program.get("installed", True)):
+                continue
+
+            if models_key is None:
+                # mic/snd
+                programs.append(omit(program))
+                continue
+
+            models = [
+                omit(model)
+                for model in program.get(models_key) or []
+                if is_model_match(model)
+            ]
+            if filter_models and (not models):
+                continue
+
+            programs.append({**omit(program), models_key: models})
+
+        filtered_data[key] = programs
+
+    return filtered_data
+
+
+def _normalize_language(language: str) -> str:
+    """Normalize language code so en_US and en-us are the same."""
+    return language.replace("_", "-").lower()
+
+
+def _is_language_match(model_language: str, language: str) -> bool:
+    """True if normalized language is the same or more general than model's."""
+    return (model_language == language) or model_language.startswith(language + "-")
+
+
+def get_info_etag(info_data: Dict[str, Any]) -> str:
+    """Compute tag from info event data (ignoring any existing tag)."""
+    info_data = {key: value for key, value in info_data.items() if key != "etag"}
+    info_json = json.dumps(info_data, ensure_ascii=False, sort_keys=True)
+    return hashlib.blake2b(info_json.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def _get_info_delta(
+    old_data: Dict[str, Any], new_data: Dict[str, Any]
+) -> Optional[Tuple[Dict[str, Any], Dict[str, Dict[str, List[str]]]]]:
+    """Compute (added, removed) between info event data.
+
+    Returns None if anything besides models/voices changed.
+    """
+    for key in set(old_data.keys()) | set(new_data.keys()):
+        if (key == "etag") or (key in _MODEL_KEYS):
+            continue
+
+        if old_data.get(key) != new_data.get(key):
+            return None
+
+    added: Dict[str, Any] = {}
+    removed: Dict[str, Dict[str, List[str]]] = {}
+    for domain, models_key in _MODEL_KEYS.items():
+        old_programs = {p["name"]: p for p in old_data.get(domain, [])}
+        new_programs = {p["name"]: p for p in new_data.get(domain, [])}
+        if old_programs.keys() != new_programs.keys():
+            return None
+
+        for program_name, new_program in new_programs.items():
+            old_program = old_programs[program_name]
+            program_info = {k: v for k, v in new_program.items() if k != models_key}
+            if program_info != {
+                k: v for k, v in old_program.items() if k != models_key
+            }:
+                return None
+
+            old_models = {m["name"]: m for m in old_program.get(models_key) or []}
+            new_models = {m["name"]: m for m in new_program.get(models_key) or []}
+            added_models = [
+                model
+                for model_name, model in new_models.items()
+                if old_models.get(model_name) != model
+            ]
+            removed_models = [
+                model_name for model_name in old_models if model_name not in new_models
+            ]
+
+            if added_models:
+                added.setdefault(domain, []).append(
+                    {**program_info, models_key: added_models}
+                )
+
+            if removed_models:
+                removed.setdefault(domain, {})[program_name] = removed_models
+
+    return added, removed
+
+
+# -----------------------------------------------------------------------------
+
+
+class InfoCache:
+    """Caches the encoded info event so describe can be answered without
+    re-serializing.
+
+    The info is copied when it is set, so later changes to the original
+    object are not seen. Assign a new info (or call invalidate() after
+    modifying cache.info in place) to update the cache.
+
+    An etag is computed for each version of info. Clients that send a describe
+    with an etag get info-unchanged if it matches, or info-delta if it matches
+    one of the last max_versions versions.
+
+    Filtered describe requests are answered with partial info, which is also
+    cached. Partial info has its own etag, so it is only ever compared with
+    a describe that has the same filter.
+    """
+
+    def __init__(self, info: Info, max_versions: int = 4) -> None:
+        self._info = copy.deepcopy(info)
+        self.max_versions = max_versions
+
+        self._event_bytes: Optional[bytes] = None
+        self._etag: Optional[str] = None
+
+        # etag -> info event data
+        self._versions: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+        # base etag -> encoded delta event (or None if full info is needed)
+        self._delta_bytes: Dict[str, Optional[bytes]] = {}
+
+        # filter -> (etag, encoded filtered info event)
+        self._filtered_bytes: Dict[Tuple[Any, ...], Tuple[str, bytes]] = {}
+
+    @property
+    def info(self) -> Info:
+        """Cached info."""
+        return self._info
+
+    @info.setter
+    def info(self, info: Info) -> None:
+        self._info = copy.deepcopy(info)
+        self.invalidate()
+
+    def invalidate(self) -> None:
+        """Force info to be re-encoded on next use."""
+        self._event_bytes = None
+        self._etag = None
+        self._delta_bytes.clear()
+        self._filtered_bytes.clear()
+
+    @property
+    def etag(self) -> str:
+        """Tag of current info."""
+        self._encode()
+        assert self._etag is not None
+        return self._etag
+
+    @property
+    def event_bytes(self) -> bytes:
+        """Complete encoded info event (header + data)."""
+        self._encode()
+        assert self._event_bytes is not None
+        return self._event_bytes
+
+    def get_response_bytes(self, describe: Optional[Describe] = None) -> bytes:
+        """Get encoded response to a describe request."""
+        etag = self.etag
+        if describe is None:
+            return self.event_bytes
+
+        if describe.is_filtered:
+            filtered_etag, filtered_bytes = self._get_filtered_bytes(describe)
+            if describe.etag == filtered_etag:
+                return encode_event(InfoUnchanged(etag=filtered_etag).event())
+
+            return filtered_bytes
+
+        if describe.etag == etag:
+            return encode_event(InfoUnchanged(etag=etag).event())
+
+        if (describe.etag is None) or (describe.etag not in self._versions):
+            return self.event_bytes
+
+        if describe.etag not in self._delta_bytes:
+            self._delta_bytes[describe.etag] = self._encode_delta(describe.etag)
+
+        return self._delta_bytes[describe.etag] or self.event_bytes
+
+    async def async_write(
+        self, writer: asyncio.StreamWriter, describe: Optional[Describe] = None
+    ) -> None:
+        """Write encoded response to a describe request."""
+        await async_write_bytes(self.get_response_bytes(describe), writer)
+
+    def _encode(self) -> None:
+        if self._event_bytes is not None:
+            return
+
+        info_event = self._info.event()
+        etag = get_info_etag(info_event.data)
+        info_event.data["etag"] = etag
+
+        self._etag = etag
+        self._event_bytes = encode_event(info_event)
+
+        # Remember version for deltas
+        self._versions[etag] = info_event.data
+        self._versions.move_to_end(etag)
+        while len(self._versions) > max(1, self.max_versions):
+            self._versions.popitem(last=False)
+
+    def _get_filtered_bytes(self, describe: Describe) -> Tuple[str, bytes]:
+        filter_key = (
+            tuple(describe.domains or []) if describe.domains is not None else None,
+            tuple(describe.languages or []) if describe.languages is not None else None,
+            tuple(describe.names or []) if describe.names is not None else None,
+            describe.installed_only,
+            tuple(describe.omit or []),
+        )
+        filtered = self._filtered_bytes.get(filter_key)
+        if filtered is None:
+            assert self._etag is not None
+            filtered_data = filter_info_data(self._versions[self._etag], describe)
+
+            # Tag of the partial info, not the full info
+            filtered_etag = get_info_etag(filtered_data)
+            filtered_data["etag"] = filtered_etag
+            filtered = (
+                filtered_etag,
+                encode_event(Event(type=_INFO_TYPE, data=filtered_data)),
+            )
+
+            if len(self._filtered_bytes) >= _MAX_FILTERED_RESPONSES:
+                self._filtered_bytes.clear()
+
+            self._filtered_bytes[filter_key] = filtered
+
+        return filtered
+
+    def _encode_delta(self, base_etag: str) -> Optional[bytes]:
+        assert self._etag is not None
+        delta = _get_info_delta(self._versions[base_etag], self._versions[self._etag])
+        if delta is None:
+            return None
+
+        added, removed = delta
+        delta_bytes = encode_event(
+            Event(
+                type=_INFO_DELTA_TYPE,
+                data={
+                    "etag": self._etag,
+                    "base_etag": base_etag,
+                    "added": added,
+                    "removed": removed,
+                },
+            )
         )
+
+        if len(delta_bytes) >= len(self.event_bytes):
+            # Not worth it
+            return None
+
+        return delta_bytes
+
+
+# -----------------------------------------------------------------------------
+
+
+class InfoIndex:
+    """Index for fast lookups of programs and models/voices in info.
+
+    The index is rebuilt on next use when info is replaced. Call invalidate()
+    after modifying the info object in place.
+    """
+
+    def __init__(self, info: Info) -> None:
+        self._info = info
+        self._is_built = False
+
+        # domain -> name -> program
+        self._programs: Dict[str, Dict[str, Any]] = {}
+
+        # domain -> name -> (program, model)
+        self._models: Dict[str, Dict[str, Tuple[Any, Any]]] = {}
+
+        # domain -> normalized language (and prefixes) -> models
+        self._models_by_language: Dict[str, Dict[str, List[Any]]] = {}
+
+    @property
+    def info(self) -> Info:
+        """Indexed info."""
+        return self._info
+
+    @info.setter
+    def info(self, info: Info) -> None:
+        self._info = info
+        self.invalidate()
+
+    def invalidate(self) -> None:
+        """Force index to be rebuilt on next use."""
+        self._is_built = False
+
+    def get_program(self, domain: str, name: str) -> Optional[Any]:
+        """Get program by name (e.g., domain = "tts")."""
+        self._build()
+        return self._programs.get(domain, {}).get(name)
+
+    def get_model(self, domain: str, name: str) -> Optional[Any]:
+        """Get model/voice by name (e.g., domain = "tts")."""
+        self._build()
+        program_model = self._models.get(domain, {}).get(name)
+        if program_model is None:
+            return None
+
+        return program_model[1]
+
+    def get_model_program(self, domain: str, name: str) -> Optional[Any]:
+        """Get program that has a model/voice."""
+        self._build()
+        program_model = self._models.get(domain, {}).get(name)
+        if program_model is None:
+            return None
+
+        return program_model[0]
+
+    def find_models(
+        self,
+        domain: str,
+        language: Optional[str] = None,
+        installed_only: bool = False,
+    ) -> List[Any]:
+        """Find models/voices that support a language.
+
+        Falls back to more general languages (en-US -> en) if no models are
+        found for the exact language.
+        """
+        self._build()
+
+        if language is None:
+            models = [
+                model for _program, model in self._models.get(domain, {}).values()
+            ]
+            if installed_only:
+                models = [model for model in models if model.installed]
+
+            return models
+
+        models_by_language = self._models_by_language.get(domain, {})
+        lang_parts = _normalize_language(language).split("-")
+        while lang_parts:
+            models = models_by_language.get("-".join(lang_parts), [])
+            if installed_only:
+                models = [model for model in models if model.installed]
+
+            if models:
+                return list(models)
+
+            lang_parts.pop()
+
+        return []
+
+    def resolve_voice(
+        self, voice: Optional[SynthesizeVoice] = None
+    ) -> Optional[Tuple[TtsVoice, Optional[TtsVoiceSpeaker]]]:
+        """Resolve a synthesis voice to the best matching voice and speaker.
+
+        Installed voices are preferred.
+        """
+        tts_voice: Optional[TtsVoice] = None
+        if (voice is not None) and (voice.name is not None):
+            tts_voice = self.get_model("tts", voice.name)
+            if tts_voice is None:
+                # Some clients send the language as the name
+                tts_voice = self._find_best_voice(voice.name)
+
+        if (tts_voice is None) and (voice is not None) and voice.language:
+            tts_voice = self._find_best_voice(voice.language)
+
+        if (tts_voice is None) and ((voice is None) or (not voice.name)):
+            # Default voice
+            tts_voice = self._find_best_voice(None)
+
+        if tts_voice is None:
+            return None
+
+        speaker: Optional[TtsVoiceSpeaker] = None
+        if (voice is not None) and (voice.speaker is not None) and tts_voice.speakers:
+            speaker = next(
+                (s for s in tts_voice.speakers if s.name == voice.speaker), None
+            )
+
+        return (tts_voice, speaker)
+
+    def _find_best_voice(self, language: Optional[str]) -> Optional[TtsVoice]:
+        voices = self.find_models("tts", language)
+        return next((v for v in voices if v.installed), voices[0] if voices else None)
+
+    def _build(self) -> None:
+        if self._is_built:
+            return
+
+        self._programs.clear()
+        self._models.clear()
+        self._models_by_language.clear()
+
+        for domain in ("asr", "tts", "handle", "intent", "wake", "mic", "snd"):
+            programs = self._programs[domain] = {}
+            models = self._models[domain] = {}
+            models_by_language = self._models_by_language[domain] = {}
+            models_key = _MODEL_KEYS.get(domain)
+
+            for program in getattr(self._info, domain):
+                programs.setdefault(program.name, program)
+                if models_key is None:
+                    continue
+
+                for model in getattr(program, models_key):
+                    if model.name in models:
+                        # First one wins
+                        continue
+
+                    models[model.name] = (program, model)
+
+                    # Index language and its prefixes (en-us -> en)
+                    model_langs = set()
+                    for model_lang in getattr(model, "languages", None) or []:
+                        lang_parts = _normalize_language(model_lang).split("-")
+                        while lang_parts:
+                            model_langs.add("-".join(lang_parts))
+                            lang_parts.pop()
+
+                    for model_lang in model_langs:
+                        models_by_language.setdefault(model_lang, []).append(model)
+
+        self._is_built = True
@@ -0,0 +1,280 @@
+"""In-process transport that passes Event objects without serialization.
+
+Servers are registered by name in this process. Connecting creates a pair of
+queues, and the reader/writer objects stand in for asyncio streams, so event
+handlers and clients work unchanged.
+
+Events are passed by reference, so they must not be modified after writing.
+"""
+import asyncio
+import json
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+
+from .event import DEFAULT_MAX_DATA_LENGTH, DEFAULT_MAX_PAYLOAD_LENGTH, Event
+
+_DEFAULT_MAX_EVENTS = 256
+
+# Marks end of stream in a queue
+_EOF = None
+
+ConnectedCallback = Callable[
+    ["InprocStreamReader", "InprocStreamWriter"], Optional[Awaitable[Any]]
+]
+
+# name -> callback for new connections
+_SERVERS: Dict[str, ConnectedCallback] = {}
+
+
+class _InprocChannel:
+    """Events from one writer to one reader."""
+
+    def __init__(self, max_events: int) -> None:
+        self.queue: "asyncio.Queue[Optional[Event]]" = asyncio.Queue(max_events)
+
+        # Events written when the queue was full (sent as the reader catches up)
+        self.pending: Deque[Event] = deque()
+
+        self.is_closed = False
+        """Writer has finished."""
+
+        self.is_reader_closed = False
+        """Reader has gone away, so events can't be written anymore."""
+
+        # Set when the reader takes an event or either side closes
+        self._changed = asyncio.Event()
+
+    def send_pending(self) -> None:
+        """Move pending events into the queue while there is room."""
+        while self.pending and (not self.queue.full()):
+            self.queue.put_nowait(self.pending.popleft())
+
+    def notify(self) -> None:
+        """Wake up a waiting writer."""
+        self._changed.set()
+
+    async def wait_changed(self) -> None:
+        """Wait for the reader to take an event or either side to close."""
+        self._changed.clear()
+        await self._changed.wait()
+
+    def close(self) -> None:
+        """End the stream after the events already written."""
+        if self.is_closed:
+            return
+
+        self.is_closed = True
+        self.notify()
+
+        if self.pending:
+            # Reader sees the end once pending events are read
+            return
+
+        try:
+            # Wake up a waiting reader
+            self.queue.put_nowait(_EOF)
+        except asyncio.QueueFull:
+            # Reader sees the end once the queue is empty
+            pass
+
+    def close_reader(self) -> None:
+        """Drop unread events and fail writes from now on."""
+        self.is_reader_closed = True
+        self.pending.clear()
+        while not self.queue.empty():
+            self.queue.get_nowait()
+
+        self.notify()
+
+
+class InprocStreamReader:
+    """Receives events from an in-process writer."""
+
+    def __init__(self, channel: _InprocChannel) -> None:
+        self._channel = channel
+        self._is_eof = False
+
+    async def get_event(
+        self,
+        max_data_length: int = DEFAULT_MAX_DATA_LENGTH,
+        max_payload_length: int = DEFAULT_MAX_PAYLOAD_LENGTH,
+    ) -> Optional[Event]:
+        """Get next event or None at end of stream.
+
+        Events are passed by reference, so the length limits don't apply.
+        """
+        if self._is_eof:
+            return None
+
+        channel = self._channel
+        if channel.is_reader_closed or (
+            channel.is_closed and channel.queue.empty() and (not channel.pending)
+        ):
+            self._is_eof = True
+            return None
+
+        event = await channel.queue.get()
+        channel.send_pending()
+        channel.notify()
+
+        if event is _EOF:
+            self._is_eof = True
+
+        return event
+
+    def feed_eof(self) -> None:
+        """End the stream after the events already received."""
+        self._channel.close()
+
+    def at_eof(self) -> bool:
+        return self._is_eof
+
+    def close(self) -> None:
+        """Stop reading, so the writer gets ConnectionResetError."""
+        self._is_eof = True
+        self._channel.close_reader()
+
+
+class InprocStreamWriter:
+    """Sends events to an in-process reader.
+
+    Also accepts encoded events through write(), which are decoded (for code
+    that writes pre-encoded bytes).
+    """
+
+    def __init__(self, channel: _InprocChannel) -> None:
+        self._channel = channel
+        self._buffer = bytearray()
+        self._is_closing = False
+
+    async def put_event(self, event: Event) -> None:
+        """Send event to reader, waiting if the reader is too far behind.
+
+        Raises ConnectionResetError if either side is closed.
+        """
+        channel = self._channel
+        while True:
+            if self._is_closing or channel.is_closed or channel.is_reader_closed:
+                raise ConnectionResetError("Connection is closed")
+
+            channel.send_pending()
+            if (not channel.pending) and (not channel.queue.full()):
+                break
+
+            await channel.wait_changed()
+
+        channel.queue.put_nowait(event)
+
+    def write(self, data: bytes) -> None:
+        """Decode events from bytes and send them."""
+        channel = self._channel
+        self._buffer.extend(data)
+        for event in _decode_events(self._buffer):
+            if channel.is_reader_closed:
+                # Like a socket, the error comes from drain()
+                continue
+
+            if not channel.pending:
+                try:
+                    channel.queue.put_nowait(event)
+                    continue
+                except asyncio.QueueFull:
+                    pass
+
+            channel.pending.append(event)
+
+    async def drain(self) -> None:
+        """Wait until pending events are sent.
+
+        Raises ConnectionResetError if the reader is closed.
+        """
+        channel = self._channel
+        while True:
+            if channel.is_reader_closed:
+                raise ConnectionResetError("Connection is closed")
+
+            channel.send_pending()
+            if not channel.pending:
+                break
+
+            await channel.wait_changed()
+
+    def close(self) -> None:
+        """End the stream for the reader.
+
+        Events that are already written are still delivered.
+        """
+        self._is_closing = True
+        self._channel.close()
+
+    def is_closing(self) -> bool:
+        return self._is_closing
+
+    async def wait_closed(self) -> None:
+        await self.drain()
+
+
+def start_inproc_server(name: str, client_connected_cb: ConnectedCallback) -> None:
+    """Accept in-process connections to name.
+
+    The callback is awaited during connect, so it should return quickly.
+    """
+    if name in _SERVERS:
+        raise ValueError(f"In-process server already exists: {name}")
+
+    _SERVERS[name] = client_connected_cb
+
+
+def stop_inproc_server(name: str) -> None:
+    """Stop accepting in-process connections to name."""
+    _SERVERS.pop(name, None)
+
+
+async def open_inproc_connection(
+    name: str, max_events: int = _DEFAULT_MAX_EVENTS
+) -> Tuple[InprocStreamReader, InprocStreamWriter]:
+    """Connect to an in-process server."""
+    client_connected_cb = _SERVERS.get(name)
+    if client_connected_cb is None:
+        raise ConnectionRefusedError(f"No in-process server named: {name}")
+
+    to_server = _InprocChannel(max_events)
+    to_client = _InprocChannel(max_events)
+
+    result = client_connected_cb(
+        InprocStreamReader(to_server), InprocStreamWriter(to_client)
+    )
+    if result is not None:
+        await result
+
+    return InprocStreamReader(to_client), InprocStreamWriter(to_server)
+
+
+def _decode_events(buffer: bytearray) -> List[Event]:
+    """Decode complete events from buffer, removing their bytes."""
+    events: List[Event] = []
+    while True:
+        newline_index = buffer.find(b"\n")
+        if newline_index < 0:
+            break
+
+        event_dict = json.loads(buffer[:newline_index])
+        data_length = event_dict.get("data_length") or 0
+        payload_length = event_dict.get("payload_length") or 0
+        event_length = newline_index + 1 + data_length + payload_length
+        if len(buffer) < event_length:
+            break
+
+        data_start = newline_index + 1
+        data = event_dict.get("data") or {}
+        if data_length > 0:
+            data.update(json.loads(buffer[data_start : data_start + data_length]))
+
+        payload: Optional[bytes] = None
+        if payload_length > 0:
+            payload = bytes(buffer[data_start + data_length : event_length])
+
+        events.append(Event(type=event_dict["type"], data=data, payload=payload))
+        del buffer[:event_length]
+
+    return events
@@ -4,12 +4,21 @@ Only supports:
   - widths 1, 2, and 4
   - signed samples
   - tomono, tostereo, lin2lin, ratecv
+  - rms, max, avgpp, mul, bias, add
+  - lin2ulaw, ulaw2lin, lin2alaw, alaw2lin, lin2adpcm, adpcm2lin
+
+Level, gain, and G.711 functions use numpy when it's installed, falling back
+to typed memoryviews over the fragment.
 """
+import array
+import builtins
 import math
 import struct
-from typing import Final, List, Optional, Tuple, Union
+from typing import Any, Final, List, Optional, Tuple, Union
+
+from .util.numpy_support import get_numpy
 
-BufferType = Union[bytes, bytearray]
+BufferType = Union[bytes, bytearray, memoryview]
 State = Tuple[int, Tuple[Tuple[int, ...], ...]]
 
 # width = (_, 1, 2, _, 4)
@@ -17,6 +26,7 @@ _MAX_VALS: Final = [0, 0x7F, 0x7FFF, 0, 0x7FFFFFFF]
 _MIN_VALS: Final = [0, -0x80, -0x8000, 0, -0x80000000]
 _SIGNED_FORMATS: Final = ["", "b", "h", "", "i"]
 _UNSIGNED_FORMATS: Final = ["", "B", "H", "", "I"]
+_MASKS: Final = [0, 0xFF, 0xFFFF, 0, 0xFFFFFFFF]
 
 
 def check_size(size: int) -> None:
@@ -235,3 +245,552 @@ def ratecv(
             d -= inrate
 
     return result, None
+
+
+# -----------------------------------------------------------------------------
+# Level and gain
+# -----------------------------------------------------------------------------
+
+
+def rms(fragment: BufferType, width: int) -> int:
+    """Root mean square of samples, truncated to an integer."""
+    fragment_length = len(fragment)
+    check_parameters(fragment_length, width)
+    if fragment_length == 0:
+        return 0
+
+    num_samples = fragment_length // width
+    np = get_numpy()
+    if np is not None:
+        samples = np.frombuffer(fragment, dtype=_SIGNED_FORMATS[width]).astype(
+            np.float64
+        )
+        sum_squares = float(np.dot(samples, samples))
+    else:
+        sum_squares = sum(
+            sample * sample for sample in _get_samples(fragment, width, signed=True)
+        )
+
+    return int(math.sqrt(sum_squares / num_samples))
+
+
+def max(fragment: BufferType, width: int) -> int:  # pylint: disable=redefined-builtin
+    """Maximum absolute value of samples."""
+    fragment_length = len(fragment)
+    check_parameters(fragment_length, width)
+    if fragment_length == 0:
+        return 0
+
+    np = get_numpy()
+    if np is not None:
+        samples = np.frombuffer(fragment, dtype=_SIGNED_FORMATS[width])
+        return builtins.max(abs(int(samples.min())), abs(int(samples.max())))
+
+    samples_view = _get_samples(fragment, width, signed=True)
+    return builtins.max(
+        abs(builtins.min(samples_view)), abs(builtins.max(samples_view))
+    )
+
+
+def avgpp(fragment: BufferType, width: int) -> int:
+    """Average of peak-to-peak values between local extremes."""
+    fragment_length = len(fragment)
+    check_parameters(fragment_length, width)
+    if fragment_length <= (width * 2):
+        return 0
+
+    np = get_numpy()
+    if np is not None:
+        return _avgpp_numpy(np, fragment, width)
+
+    samples = _get_samples(fragment, width, signed=True)
+    prev_val = samples[0]
+
+    # No direction until the first change
+    prev_diff: Optional[int] = None
+
+    prev_extreme = 0
+    prev_extreme_valid = False
+    total = 0
+    num_extremes = 0
+    for val in samples[1:]:
+        if val == prev_val:
+            continue
+
+        diff = int(val < prev_val)
+        if prev_diff == (1 - diff):
+            # Direction changed
+            if prev_extreme_valid:
+                total += abs(prev_val - prev_extreme)
+                num_extremes += 1
+
+            prev_extreme_valid = True
+            prev_extreme = prev_val
+
+        prev_val = val
+        prev_diff = diff
+
+    if num_extremes == 0:
+        return 0
+
+    return int(total / num_extremes)
+
+
+def _avgpp_numpy(np: Any, fragment: BufferType, width: int) -> int:
+    samples = np.frombuffer(fragment, dtype=_SIGNED_FORMATS[width]).astype(np.int64)
+
+    # Drop repeated samples, since they can't change direction
+    changed = np.empty(len(samples), dtype=bool)
+    changed[0] = True
+    np.not_equal(samples[1:], samples[:-1], out=changed[1:])
+    values = samples[changed]
+    if len(values) < 2:
+        return 0
+
+    # 1 if decreasing, 0 if increasing
+    diffs = (values[1:] < values[:-1]).astype(np.int64)
+    prev_diffs = np.empty_like(diffs)
+    prev_diffs[0] = -1  # no direction until the first change
+    prev_diffs[1:] = diffs[:-1]
+
+    # Value before each direction change is an extreme
+    extremes = values[:-1][prev_diffs == (1 - diffs)]
+    if len(extremes) < 2:
+        return 0
+
+    peak_to_peak = np.abs(np.diff(extremes)).astype(np.float64)
+    return int(peak_to_peak.sum() / len(peak_to_peak))
+
+
+def mul(fragment: BufferType, width: int, factor: float) -> bytes:
+    """Multiply samples by factor, clipping to the sample range."""
+    fragment_length = len(fragment)
+    check_parameters(fragment_length, width)
+
+    max_val = _MAX_VALS[width]
+    min_val = _MIN_VALS[width]
+
+    np = get_numpy()
+    if np is not None:
+        scaled = np.frombuffer(fragment, dtype=_SIGNED_FORMATS[width]) * float(factor)
+        np.floor(scaled, out=scaled)
+        scaled[scaled > max_val] = max_val
+        scaled[scaled < min_val] = min_val
+        return scaled.astype(_SIGNED_FORMATS[width]).tobytes()
+
+    return array.array(
+        _SIGNED_FORMATS[width],
+        (
+            fbound(sample * factor, min_val, max_val)
+            for sample in _get_samples(fragment, width, signed=True)
+        ),
+    ).tobytes()
+
+
+def bias(  # pylint: disable=redefined-outer-name
+    fragment: BufferType, width: int, bias: int
+) -> bytes:
+    """Add bias to samples, wrapping around on overflow."""
+    if not -0x80000000 <= bias <= 0x7FFFFFFF:
+        # Bias must fit in a C int
+        raise OverflowError("Python int too large to convert to C int")
+
+    fragment_length = len(fragment)
+    check_parameters(fragment_length, width)
+
+    mask = _MASKS[width]
+    bias &= mask
+
+    np = get_numpy()
+    if np is not None:
+        samples = np.frombuffer(fragment, dtype=_UNSIGNED_FORMATS[width])
+        return (samples + samples.dtype.type(bias)).tobytes()
+
+    return array.array(
+        _UNSIGNED_FORMATS[width],
+        (
+            (sample + bias) & mask
+            for sample in _get_samples(fragment, width, signed=False)
+        ),
+    ).tobytes()
+
+
+def add(fragment1: BufferType, fragment2: BufferType, width: int) -> bytes:
+    """Add samples from two fragments, clipping to the sample range."""
+    fragment_length = len(fragment1)
+    check_parameters(fragment_length, width)
+    if fragment_length != len(fragment2):
+        raise ValueError(
+            "Lengths should be the same: "
+            f"len(fragment1)={fragment_length}, len(fragment2)={len(fragment2)}"
+        )
+
+    max_val = _MAX_VALS[width]
+    min_val = _MIN_VALS[width]
+
+    np = get_numpy()
+    if np is not None:
+        samples1 = np.frombuffer(fragment1, dtype=_SIGNED_FORMATS[width])
+        samples2 = np.frombuffer(fragment2, dtype=_SIGNED_FORMATS[width])
+        return (
+            np.clip(samples1.astype(np.int64) + samples2, min_val, max_val)
+            .astype(_SIGNED_FORMATS[width])
+            .tobytes()
+        )
+
+    return array.array(
+        _SIGNED_FORMATS[width],
+        (
+            builtins.min(builtins.max(sample1 + sample2, min_val), max_val)
+            for sample1, sample2 in zip(
+                _get_samples(fragment1, width, signed=True),
+                _get_samples(fragment2, width, signed=True),
+            )
+        ),
+    ).tobytes()
+
+
+# -----------------------------------------------------------------------------
+# G.711 and IMA-ADPCM
+# -----------------------------------------------------------------------------
+
+AdpcmState = Tuple[int, int]
+
+_SEG_AEND: Final = [0x1F, 0x3F, 0x7F, 0xFF, 0x1FF, 0x3FF, 0x7FF, 0xFFF]
+_SEG_UEND: Final = [0x3F, 0x7F, 0xFF, 0x1FF, 0x3FF, 0x7FF, 0xFFF, 0x1FFF]
+_ULAW_BIAS: Final = 0x84
+_ULAW_CLIP: Final = 8159
+
+_ADPCM_INDEX_TABLE: Final = [-1, -1, -1, -1, 2, 4, 6, 8] * 2
+_ADPCM_STEPSIZE_TABLE: Final = [
+    7, 8, 9, 10, 11, 12, 13, 14, 16, 17, 19, 21, 23, 25, 28, 31, 34, 37, 41,
+    45, 50, 55, 60, 66, 73, 80, 88, 97, 107, 118, 130, 143, 157, 173, 190, 209,
+    230, 253, 279, 307, 337, 371, 408, 449, 494, 544, 598, 658, 724, 796, 876,
+    963, 1060, 1166, 1282, 1411, 1552, 1707, 1878, 2066, 2272, 2499, 2749,
+    3024, 3327, 3660, 4026, 4428, 4871, 5358, 5894, 6484, 7132, 7845, 8630,
+    9493, 10442, 11487, 12635, 13899, 15289, 16818, 18500, 20350, 22385,
+    24623, 27086, 29794, 32767,
+]  # fmt: skip
+
+# Lazily built lookup tables.
+# Encoders are indexed by 16-bit samples as unsigned, decoders by code.
+_ULAW_ENCODE: Optional[bytes] = None
+_ULAW_DECODE: Optional[List[int]] = None
+_ALAW_ENCODE: Optional[bytes] = None
+_ALAW_DECODE: Optional[List[int]] = None
+
+
+def lin2ulaw(fragment: BufferType, width: int) -> bytes:
+    """Convert samples to 8-bit u-law (G.711)."""
+    global _ULAW_ENCODE  # pylint: disable=global-statement
+    if _ULAW_ENCODE is None:
+        _ULAW_ENCODE = bytes(
+            _linear2ulaw(_to_signed16(value) >> 2) for value in range(1 << 16)
+        )
+
+    return _encode_table(fragment, width, _ULAW_ENCODE)
+
+
+def ulaw2lin(fragment: BufferType, width: int) -> bytes:
+    """Convert 8-bit u-law (G.711) to samples."""
+    global _ULAW_DECODE  # pylint: disable=global-statement
+    if _ULAW_DECODE is None:
+        _ULAW_DECODE = [_ulaw2linear(code) for code in range(256)]
+
+    return _decode_table(fragment, width, _ULAW_DECODE)
+
+
+def lin2alaw(fragment: BufferType, width: int) -> bytes:
+    """Convert samples to 8-bit A-law (G.711)."""
+    global _ALAW_ENCODE  # pylint: disable=global-statement
+    if _ALAW_ENCODE is None:
+        _ALAW_ENCODE = bytes(
+            _linear2alaw(_to_signed16(value) >> 3) for value in range(1 << 16)
+        )
+
+    return _encode_table(fragment, width, _ALAW_ENCODE)
+
+
+def alaw2lin(fragment: BufferType, width: int) -> bytes:
+    """Convert 8-bit A-law (G.711) to samples."""
+    global _ALAW_DECODE  # pylint: disable=global-statement
+    if _ALAW_DECODE is None:
+        _ALAW_DECODE = [_alaw2linear(code) for code in range(256)]
+
+    return _decode_table(fragment, width, _ALAW_DECODE)
+
+
+def lin2adpcm(
+    fragment: BufferType, width: int, state: Optional[AdpcmState]
+) -> Tuple[bytes, AdpcmState]:
+    """Convert samples to 4-bit IMA-ADPCM.
+
+    Two samples are packed per byte, first sample in the high nibble. The last
+    sample of an odd-length fragment only updates the state.
+    """
+    check_parameters(len(fragment), width)
+    val_pred, index = _check_adpcm_state(state)
+
+    index_table = _ADPCM_INDEX_TABLE
+    step_table = _ADPCM_STEPSIZE_TABLE
+    step = step_table[index]
+    result = bytearray(len(fragment) // width // 2)
+    output_index = 0
+    output_byte = 0
+    is_high_nibble = True
+
+    for val in _get_samples16(fragment, width):
+        # Compute difference with previous value
+        if val < val_pred:
+            diff = val_pred - val
+            sign = 8
+        else:
+            diff = val - val_pred
+            sign = 0
+
+        # Divide and clamp
+        delta = 0
+        vp_diff = step >> 3
+        if diff >= step:
+            delta = 4
+            diff -= step
+            vp_diff += step
+
+        step >>= 1
+        if diff >= step:
+            delta |= 2
+            diff -= step
+            vp_diff += step
+
+        step >>= 1
+        if diff >= step:
+            delta |= 1
+            vp_diff += step
+
+        # Update and clamp previous value
+        if sign:
+            val_pred = builtins.max(-0x8000, val_pred - vp_diff)
+        else:
+            val_pred = builtins.min(0x7FFF, val_pred + vp_diff)
+
+        # Update index and step
+        delta |= sign
+        index = builtins.min(88, builtins.max(0, index + index_table[delta]))
+        step = step_table[index]
+
+        if is_high_nibble:
+            output_byte = delta << 4
+        else:
+            result[output_index] = output_byte | delta
+            output_index += 1
+
+        is_high_nibble = not is_high_nibble
+
+    return bytes(result), (val_pred, index)
+
+
+def adpcm2lin(
+    fragment: BufferType, width: int, state: Optional[AdpcmState]
+) -> Tuple[bytes, AdpcmState]:
+    """Convert 4-bit IMA-ADPCM to samples (two per byte)."""
+    check_size(width)
+    val_pred, index = _check_adpcm_state(state)
+
+    index_table = _ADPCM_INDEX_TABLE
+    step_table = _ADPCM_STEPSIZE_TABLE
+    step = step_table[index]
+    samples = array.array("i", [0]) * (2 * len(fragment))
+    sample_index = 0
+
+    for input_byte in memoryview(fragment).cast("B"):
+        for delta in (input_byte >> 4, input_byte & 0x0F):
+            index = builtins.min(88, builtins.max(0, index + index_table[delta]))
+
+            # Compute difference and new predicted value
+            vp_diff = step >> 3
+            if delta & 4:
+                vp_diff += step
+            if delta & 2:
+                vp_diff += step >> 1
+            if delta & 1:
+                vp_diff += step >> 2
+
+            if delta & 8:
+                val_pred = builtins.max(-0x8000, val_pred - vp_diff)
+            else:
+                val_pred = builtins.min(0x7FFF, val_pred + vp_diff)
+
+            step = step_table[index]
+            samples[sample_index] = val_pred
+            sample_index += 1
+
+    return _from_samples16(samples, width), (val_pred, index)
+
+
+def _check_adpcm_state(state: Optional[AdpcmState]) -> AdpcmState:
+    if state is None:
+        return (0, 0)
+
+    val_pred, index = state
+    if not -0x8000 <= val_pred <= 0x7FFF:
+        raise ValueError(f"Bad state: val_pred={val_pred}")
+
+    if not 0 <= index < len(_ADPCM_STEPSIZE_TABLE):
+        raise ValueError(f"Bad state: index={index}")
+
+    return (val_pred, index)
+
+
+def _encode_table(fragment: BufferType, width: int, table: bytes) -> bytes:
+    """Encode each sample with a table indexed by unsigned 16-bit samples."""
+    check_parameters(len(fragment), width)
+
+    np = get_numpy()
+    if np is not None:
+        samples = np.frombuffer(fragment, dtype=_SIGNED_FORMATS[width])
+        if width == 1:
+            samples16 = samples.astype(np.int16) << 8
+        elif width == 4:
+            samples16 = (samples >> 16).astype(np.int16)
+        else:
+            samples16 = samples
+
+        return np.frombuffer(table, dtype=np.uint8)[samples16.view(np.uint16)].tobytes()
+
+    if width == 2:
+        return bytes(
+            map(table.__getitem__, _get_samples(fragment, width, signed=False))
+        )
+
+    return bytes(table[sample & 0xFFFF] for sample in _get_samples16(fragment, width))
+
+
+def _decode_table(fragment: BufferType, width: int, table: List[int]) -> bytes:
+    """Decode each byte to a 16-bit sample with a table."""
+    check_size(width)
+
+    np = get_numpy()
+    if np is not None:
+        samples16 = np.array(table, dtype=np.int16)[
+            np.frombuffer(fragment, dtype=np.uint8)
+        ]
+        return _from_samples16_numpy(np, samples16, width)
+
+    return _from_samples16(
+        array.array("h", map(table.__getitem__, memoryview(fragment).cast("B"))),
+        width,
+    )
+
+
+def _get_samples16(fragment: BufferType, width: int) -> Any:
+    """Get samples as 16-bit values (like GETSAMPLE32 >> 16 in audioop)."""
+    samples = _get_samples(fragment, width, signed=True)
+    if width == 1:
+        return (sample << 8 for sample in samples)
+
+    if width == 4:
+        return (sample >> 16 for sample in samples)
+
+    return samples
+
+
+def _from_samples16(samples16: "array.array[int]", width: int) -> bytes:
+    """Convert 16-bit values to samples of width."""
+    if width == 1:
+        return array.array(
+            _SIGNED_FORMATS[width], (s >> 8 for s in samples16)
+        ).tobytes()
+
+    if width == 4:
+        return array.array(
+            _SIGNED_FORMATS[width], (s << 16 for s in samples16)
+        ).tobytes()
+
+    return array.array(_SIGNED_FORMATS[width], samples16).tobytes()
+
+
+def _from_samples16_numpy(np: Any, samples16: Any, width: int) -> bytes:
+    if width == 1:
+        return (samples16 >> 8).astype(np.int8).tobytes()
+
+    if width == 4:
+        return (samples16.astype(np.int32) << 16).tobytes()
+
+    return samples16.astype(np.int16).tobytes()
+
+
+def _to_signed16(value: int) -> int:
+    return value - 0x10000 if value >= 0x8000 else value
+
+
+def _search_segment(value: int, table: List[int]) -> int:
+    for segment, end in enumerate(table):
+        if value <= end:
+            return segment
+
+    return len(table)
+
+
+def _linear2ulaw(pcm_val: int) -> int:
+    """Convert 14-bit sample to u-law."""
+    if pcm_val < 0:
+        pcm_val = -pcm_val
+        mask = 0x7F
+    else:
+        mask = 0xFF
+
+    pcm_val = builtins.min(pcm_val, _ULAW_CLIP) + (_ULAW_BIAS >> 2)
+    segment = _search_segment(pcm_val, _SEG_UEND)
+    if segment >= 8:
+        return 0x7F ^ mask
+
+    return ((segment << 4) | ((pcm_val >> (segment + 1)) & 0x0F)) ^ mask
+
+
+def _ulaw2linear(code: int) -> int:
+    """Convert u-law to 16-bit sample."""
+    code = ~code & 0xFF
+    value = (((code & 0x0F) << 3) + _ULAW_BIAS) << ((code & 0x70) >> 4)
+    return (_ULAW_BIAS - value) if (code & 0x80) else (value - _ULAW_BIAS)
+
+
+def _linear2alaw(pcm_val: int) -> int:
+    """Convert 13-bit sample to A-law."""
+    if pcm_val >= 0:
+        mask = 0xD5
+    else:
+        mask = 0x55
+        pcm_val = -pcm_val - 1
+
+    segment = _search_segment(pcm_val, _SEG_AEND)
+    if segment >= 8:
+        return 0x7F ^ mask
+
+    code = segment << 4
+    if segment < 2:
+        code |= (pcm_val >> 1) & 0x0F
+    else:
+        code |= (pcm_val >> segment) & 0x0F
+
+    return code ^ mask
+
+
+def _alaw2linear(code: int) -> int:
+    """Convert A-law to 16-bit sample."""
+    code ^= 0x55
+    value = (code & 0x0F) << 4
+    segment = (code & 0x70) >> 4
+    if segment == 0:
+        value += 8
+    elif segment == 1:
+        value += 0x108
+    else:
+        value = (value + 0x108) << (segment - 1)
+
+    return value if (code & 0x80) else -value
+
+
+def _get_samples(fragment: BufferType, width: int, signed: bool) -> memoryview:
+    """Get view of fragment as native-endian integer samples (no copy)."""
+    sample_format = _SIGNED_FORMATS[width] if signed else _UNSIGNED_FORMATS[width]
+    return memoryview(fragment).cast("B").cast(sample_format)  # type: ignore[call-overload]
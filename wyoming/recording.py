@@ -0,0 +1,232 @@
+"""Recording of event streams with receive timestamps, for replay.
+
+A recording is a file of records appended as events are read or written:
+
+    timestamp (uint64) | direction (uint8) | length (uint32) | event
+
+The timestamp is in nanoseconds since the recording started, and the event
+is encoded as it is sent (header, data, payload). The high bit of direction
+is set when the event's payload was streamed and is missing from the record. An index file next to the
+recording (<path>.idx) has the timestamp and offset of every Nth record, so
+readers can seek by time without decoding the events before it.
+
+Set the recorder of an AsyncEventHandler or AsyncClient to record its events.
+"""
+import io
+import struct
+import time
+from bisect import bisect_left
+from dataclasses import dataclass
+from enum import IntEnum
+from pathlib import Path
+from typing import BinaryIO, Iterator, List, Optional, Tuple, Union
+
+from .event import Event, encode_event, read_event
+
+DEFAULT_INDEX_INTERVAL = 64
+"""Records between index entries."""
+
+INDEX_SUFFIX = ".idx"
+
+_MAGIC = b"WYOMING-RECORDING 1\n"
+_RECORD_HEADER = struct.Struct("<QBI")
+_INDEX_ENTRY = struct.Struct("<QQ")
+_PAYLOAD_OMITTED = 0x80
+
+
+class EventDirection(IntEnum):
+    """Direction of a recorded event."""
+
+    TO_SERVICE = 0
+    """Sent by a client (read by an event handler)."""
+
+    FROM_SERVICE = 1
+    """Sent by a service (read by a client)."""
+
+
+@dataclass
+class RecordedEvent:
+    """Event from a recording."""
+
+    timestamp: float
+    """Seconds since the recording started."""
+
+    direction: EventDirection
+    event: Event
+
+    is_payload_omitted: bool = False
+    """True if the payload was streamed and not recorded."""
+
+
+class EventRecorder:
+    """Writes events with timestamps to a recording."""
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        index_interval: int = DEFAULT_INDEX_INTERVAL,
+    ) -> None:
+        self.path = Path(path)
+        self.index_interval = index_interval
+        self.num_events = 0
+
+        self._file: BinaryIO = open(  # pylint: disable=consider-using-with
+            self.path, "wb"
+        )
+        self._index_file: BinaryIO = open(  # pylint: disable=consider-using-with
+            get_index_path(self.path), "wb"
+        )
+        self._file.write(_MAGIC)
+        self._offset = len(_MAGIC)
+        self._start_ns = time.monotonic_ns()
+
+    def record(
+        self,
+        event: Event,
+        direction: EventDirection,
+        is_payload_omitted: bool = False,
+    ) -> None:
+        """Append an event with the current time.
+
+        Set is_payload_omitted for events whose payload was streamed.
+        """
+        self.record_bytes(encode_event(event), direction, is_payload_omitted)
+
+    def record_bytes(
+        self,
+        event_bytes: bytes,
+        direction: EventDirection,
+        is_payload_omitted: bool = False,
+    ) -> None:
+        """Append a pre-encoded event (see encode_event) with the current time."""
+        timestamp_ns = time.monotonic_ns() - self._start_ns
+        flags = _PAYLOAD_OMITTED if is_payload_omitted else 0
+
+        if (self.num_events % self.index_interval) == 0:
+            self._index_file.write(_INDEX_ENTRY.pack(timestamp_ns, self._offset))
+
+        self._file.write(
+            _RECORD_HEADER.pack(timestamp_ns, direction | flags, len(event_bytes))
+        )
+        self._file.write(event_bytes)
+        self._offset += _RECORD_HEADER.size + len(event_bytes)
+        self.num_events += 1
+
+    def flush(self) -> None:
+        """Write buffered records to disk."""
+        self._file.flush()
+        self._index_file.flush()
+
+    def close(self) -> None:
+        """Flush and close the recording."""
+        self._file.close()
+        self._index_file.close()
+
+    def __enter__(self) -> "EventRecorder":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+
+class RecordingReader:
+    """Reads events from a recording in order, with seeking by time."""
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        self.path = Path(path)
+        self._file: BinaryIO = open(  # pylint: disable=consider-using-with
+            self.path, "rb"
+        )
+        if self._file.read(len(_MAGIC)) != _MAGIC:
+            self._file.close()
+            raise ValueError(f"Not a Wyoming recording: {self.path}")
+
+        # Index is optional (seeking scans from the start without it)
+        self._index_timestamps: List[int] = []
+        self._index_offsets: List[int] = []
+        index_path = get_index_path(self.path)
+        if index_path.exists():
+            index_bytes = index_path.read_bytes()
+            num_entries = len(index_bytes) // _INDEX_ENTRY.size
+            for timestamp_ns, offset in _INDEX_ENTRY.iter_unpack(
+                index_bytes[: num_entries * _INDEX_ENTRY.size]
+            ):
+                self._index_timestamps.append(timestamp_ns)
+                self._index_offsets.append(offset)
+
+    def read(self) -> Optional[RecordedEvent]:
+        """Read the next event or None at the end of the recording."""
+        header = self._read_header()
+        if header is None:
+            return None
+
+        timestamp_ns, direction, length = header
+        event_bytes = self._file.read(length)
+        if len(event_bytes) < length:
+            # Incomplete record
+            return None
+
+        event = read_event(
+            io.BytesIO(event_bytes), max_data_length=length, max_payload_length=length
+        )
+        if event is None:
+            return None
+
+        return RecordedEvent(
+            timestamp=timestamp_ns / 1e9,
+            direction=EventDirection(direction & ~_PAYLOAD_OMITTED),
+            event=event,
+            is_payload_omitted=bool(direction & _PAYLOAD_OMITTED),
+        )
+
+    def seek(self, seconds: float) -> None:
+        """Move to the first event at or after a time (seconds)."""
+        target_ns = int(seconds * 1e9)
+        index = bisect_left(self._index_timestamps, target_ns) - 1
+        self._file.seek(self._index_offsets[index] if index >= 0 else len(_MAGIC))
+
+        # Skip records before the target without decoding them
+        while True:
+            offset = self._file.tell()
+            header = self._read_header()
+            if header is None:
+                break
+
+            timestamp_ns, _direction, length = header
+            if timestamp_ns >= target_ns:
+                break
+
+            self._file.seek(length, io.SEEK_CUR)
+
+        self._file.seek(offset)
+
+    def close(self) -> None:
+        """Close the recording."""
+        self._file.close()
+
+    def __iter__(self) -> Iterator[RecordedEvent]:
+        while True:
+            recorded_event = self.read()
+            if recorded_event is None:
+                break
+
+            yield recorded_event
+
+    def __enter__(self) -> "RecordingReader":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def _read_header(self) -> Optional[Tuple[int, int, int]]:
+        header_bytes = self._file.read(_RECORD_HEADER.size)
+        if len(header_bytes) < _RECORD_HEADER.size:
+            return None
+
+        return _RECORD_HEADER.unpack(header_bytes)
+
+
+def get_index_path(path: Union[str, Path]) -> Path:
+    """Get path of the index file for a recording."""
+    path = Path(path)
+    return path.with_name(path.name + INDEX_SUFFIX)
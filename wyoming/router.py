@@ -0,0 +1,431 @@
+"""Server that routes events to many Wyoming services behind one URI.
+
+Each client session is routed by event type: transcribe goes to asr,
+synthesize to tts, detect to wake, recognize to intent, and transcript to
+handle. Events that follow (audio, etc.) go to the same service, and the
+service's responses are sent back to the client.
+
+Events are read lazily and forwarded byte for byte without decoding their
+data. Describe is answered with the merged info of all services, which is
+cached for --info-refresh seconds or until a service reconnects.
+
+Run with: python3 -m wyoming.router --uri tcp://0.0.0.0:10400 \\
+    --backend asr=tcp://127.0.0.1:10300 --backend tts=tcp://127.0.0.1:10200
+"""
+import argparse
+import asyncio
+import contextlib
+import logging
+import time
+from dataclasses import replace
+from functools import partial
+from typing import Callable, Dict, List, Optional
+
+from . import asr, handle, intent, tts, wake
+from .audio import AudioStart
+from .client import AsyncClient
+from .error import Error
+from .event import Event
+from .info import Describe, Info, InfoCache, InfoDelta, InfoUnchanged
+from .ping import Ping, Pong
+from .server import AsyncEventHandler, AsyncServer
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_ROUTES: Dict[str, str] = {
+    "transcribe": asr.DOMAIN,
+    "synthesize": tts.DOMAIN,
+    "detect": wake.DOMAIN,
+    "recognize": intent.DOMAIN,
+    "transcript": handle.DOMAIN,
+}
+"""Event type -> domain of service that starts handling it."""
+
+DEFAULT_POOL_SIZE = 2
+"""Connections kept open ahead of time for each service."""
+
+DEFAULT_INFO_REFRESH = 60.0
+"""Seconds before the merged info of services is refreshed."""
+
+_INFO_TIMEOUT = 2.0
+
+# Services that take audio after a routed event (audio-start goes to asr otherwise)
+_AUDIO_DOMAINS = {asr.DOMAIN, wake.DOMAIN}
+
+
+class BackendPool:
+    """Connections to a service that are opened ahead of time.
+
+    Each connection is used by one client session and then closed, since
+    services keep state per connection.
+    """
+
+    def __init__(self, uri: str, size: int = DEFAULT_POOL_SIZE) -> None:
+        self.uri = uri
+        self.size = size
+        self._idle: List[AsyncClient] = []
+        self._refill_task: Optional[asyncio.Task] = None
+        self._is_connect_failed = False
+
+        self.on_reconnect: Optional[Callable[[], None]] = None
+        """Called when the service may have restarted."""
+
+    async def acquire(self) -> AsyncClient:
+        """Get a connected client, opening a new connection if none are idle."""
+        while self._idle:
+            client = self._idle.pop()
+            if _is_connected(client):
+                self._start_refill()
+                return client
+
+            # Service closed the connection (e.g., it restarted)
+            await client.disconnect()
+            self._reconnected()
+
+        client = await self._connect()
+        self._start_refill()
+
+        return client
+
+    async def close(self) -> None:
+        """Close idle connections."""
+        if self._refill_task is not None:
+            self._refill_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._refill_task
+
+            self._refill_task = None
+
+        idle = self._idle
+        self._idle = []
+        await asyncio.gather(*(client.disconnect() for client in idle))
+
+    async def _connect(self) -> AsyncClient:
+        client = AsyncClient.from_uri(self.uri)
+        client.lazy_events = True
+
+        try:
+            await client.connect()
+        except Exception:
+            self._is_connect_failed = True
+            raise
+
+        if self._is_connect_failed:
+            self._is_connect_failed = False
+            self._reconnected()
+
+        return client
+
+    def _reconnected(self) -> None:
+        if self.on_reconnect is not None:
+            self.on_reconnect()
+
+    def _start_refill(self) -> None:
+        if (self.size <= 0) or (
+            (self._refill_task is not None) and (not self._refill_task.done())
+        ):
+            return
+
+        self._refill_task = asyncio.create_task(self._refill())
+
+    async def _refill(self) -> None:
+        try:
+            while len(self._idle) < self.size:
+                self._idle.append(await self._connect())
+        except Exception:
+            _LOGGER.exception("Failed to connect to %s", self.uri)
+
+
+class Router:
+    """Routes client sessions to pools of service connections."""
+
+    def __init__(
+        self,
+        backends: Dict[str, str],
+        routes: Optional[Dict[str, str]] = None,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        info_refresh: float = DEFAULT_INFO_REFRESH,
+    ) -> None:
+        self.pools = {
+            domain: BackendPool(uri, size=pool_size) for domain, uri in backends.items()
+        }
+        self.routes = routes if routes is not None else DEFAULT_ROUTES
+        self.info_refresh = info_refresh
+
+        for pool in self.pools.values():
+            pool.on_reconnect = self.invalidate_info
+
+        self._info_cache: Optional[InfoCache] = None
+        self._info_time: Optional[float] = None
+        self._info_lock = asyncio.Lock()
+
+        # domain -> last info from service
+        self._backend_infos: Dict[str, Info] = {}
+
+    def get_domain(self, event_type: str) -> Optional[str]:
+        """Get domain of service that starts handling an event type."""
+        return self.routes.get(event_type)
+
+    async def acquire(self, domain: str) -> Optional[AsyncClient]:
+        """Get a connection to the service for a domain."""
+        pool = self.pools.get(domain)
+        if pool is None:
+            return None
+
+        return await pool.acquire()
+
+    async def get_info(self) -> InfoCache:
+        """Get merged info of all services.
+
+        Services are only asked again after info_refresh seconds, or sooner
+        if one of them reconnects or didn't answer last time.
+        """
+        async with self._info_lock:
+            if (
+                (self._info_cache is not None)
+                and (self._info_time is not None)
+                and ((time.monotonic() - self._info_time) < self.info_refresh)
+            ):
+                return self._info_cache
+
+            self._info_time = time.monotonic()
+            infos = await asyncio.gather(
+                *(self._get_backend_info(domain) for domain in self.pools)
+            )
+
+            merged_info = Info()
+            for domain, info in zip(self.pools, infos):
+                if info is None:
+                    # Try again on next describe
+                    self._backend_infos.pop(domain, None)
+                    self._info_time = None
+                    continue
+
+                self._backend_infos[domain] = info
+                merged_info = merged_info.merge(replace(info, etag=None))
+
+            if self._info_cache is None:
+                self._info_cache = InfoCache(merged_info)
+            elif self._info_cache.info != merged_info:
+                self._info_cache.info = merged_info
+
+            return self._info_cache
+
+    def invalidate_info(self) -> None:
+        """Refresh merged info on next describe."""
+        self._info_time = None
+
+    async def close(self) -> None:
+        await asyncio.gather(*(pool.close() for pool in self.pools.values()))
+
+    async def _get_backend_info(self, domain: str) -> Optional[Info]:
+        try:
+            client = await self.pools[domain].acquire()
+        except OSError:
+            _LOGGER.warning("Failed to connect to %s service", domain)
+            return None
+
+        # Service only needs to send what changed
+        last_info = self._backend_infos.get(domain)
+        etag = last_info.etag if last_info is not None else None
+
+        try:
+            await client.write_event(Describe(etag=etag).event())
+            while True:
+                event = await asyncio.wait_for(client.read_event(), _INFO_TIMEOUT)
+                if event is None:
+                    break
+
+                if Info.is_type(event.type):
+                    return Info.from_event(event)
+
+                if last_info is None:
+                    continue
+
+                if InfoUnchanged.is_type(event.type):
+                    return last_info
+
+                if InfoDelta.is_type(event.type):
+                    return InfoDelta.from_event(event).apply(last_info)
+        except asyncio.TimeoutError:
+            _LOGGER.warning("No info from %s service", domain)
+        except OSError:
+            # Refreshed on next describe
+            _LOGGER.warning("Lost connection to %s service", domain)
+        except ValueError:
+            _LOGGER.warning("Unexpected info delta from %s service", domain)
+        finally:
+            await client.disconnect()
+
+        return None
+
+
+class RouterEventHandler(AsyncEventHandler):
+    """Forwards events from one client to the services it uses."""
+
+    def __init__(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        router: Router,
+    ) -> None:
+        super().__init__(reader, writer)
+
+        self.router = router
+        self.lazy_events = True
+
+        # domain -> connection to service
+        self._clients: Dict[str, AsyncClient] = {}
+        self._forward_tasks: List[asyncio.Task] = []
+        self._domain: Optional[str] = None
+
+    async def handle_event(self, event: Event) -> bool:
+        if Describe.is_type(event.type):
+            info_cache = await self.router.get_info()
+            await self.write_event_bytes(
+                info_cache.get_response_bytes(Describe.from_event(event))
+            )
+            return True
+
+        if Ping.is_type(event.type):
+            await self.write_event(Pong(text=Ping.from_event(event).text).event())
+            return True
+
+        domain = self.router.get_domain(event.type)
+        if (domain is None) and AudioStart.is_type(event.type):
+            if self._domain not in _AUDIO_DOMAINS:
+                domain = asr.DOMAIN
+
+        if domain is not None:
+            self._domain = domain
+
+        if self._domain is None:
+            _LOGGER.debug("Dropping unexpected event: %s", event.type)
+            return True
+
+        client = await self._get_client(self._domain)
+        if client is None:
+            await self.write_event(
+                Error(text=f"No service for {self._domain}", code="no-service").event()
+            )
+            self._domain = None
+            return True
+
+        await client.write_event(event)
+        return True
+
+    async def disconnect(self) -> None:
+        for task in self._forward_tasks:
+            task.cancel()
+
+        await asyncio.gather(*self._forward_tasks, return_exceptions=True)
+        self._forward_tasks.clear()
+
+        clients = list(self._clients.values())
+        self._clients.clear()
+        await asyncio.gather(*(client.disconnect() for client in clients))
+
+    async def _get_client(self, domain: str) -> Optional[AsyncClient]:
+        client = self._clients.get(domain)
+        if client is not None:
+            if _is_connected(client):
+                return client
+
+            # Service closed the connection
+            self._clients.pop(domain, None)
+            await client.disconnect()
+
+        try:
+            client = await self.router.acquire(domain)
+        except OSError:
+            _LOGGER.exception("Failed to connect to %s service", domain)
+            return None
+
+        if client is None:
+            return None
+
+        self._clients[domain] = client
+        self._forward_tasks = [t for t in self._forward_tasks if not t.done()]
+        self._forward_tasks.append(asyncio.create_task(self._forward_responses(client)))
+
+        return client
+
+    async def _forward_responses(self, client: AsyncClient) -> None:
+        """Send events from a service back to the client."""
+        while True:
+            event = await client.read_event()
+            if event is None:
+                break
+
+            await self.write_event(event)
+
+
+def _is_connected(client: AsyncClient) -> bool:
+    reader = client._reader  # pylint: disable=protected-access
+    writer = client._writer  # pylint: disable=protected-access
+    if (reader is None) or (writer is None):
+        return False
+
+    return (not reader.at_eof()) and (not writer.is_closing())
+
+
+# -----------------------------------------------------------------------------
+
+
+async def main() -> None:
+    """Run router server."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--uri", required=True, help="URI of router server")
+    parser.add_argument(
+        "--backend",
+        action="append",
+        default=[],
+        metavar="DOMAIN=URI",
+        help="URI of service for a domain (asr, tts, wake, intent, handle)",
+    )
+    parser.add_argument(
+        "--route",
+        action="append",
+        default=[],
+        metavar="EVENT_TYPE=DOMAIN",
+        help="Route an additional event type to a domain",
+    )
+    parser.add_argument("--pool-size", type=int, default=DEFAULT_POOL_SIZE)
+    parser.add_argument(
+        "--info-refresh",
+        type=float,
+        default=DEFAULT_INFO_REFRESH,
+        help="Seconds before info of services is refreshed",
+    )
+    parser.add_argument("--debug", action="store_true")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.DEBUG if args.debug else logging.INFO)
+
+    backends: Dict[str, str] = {}
+    for backend in args.backend:
+        domain, uri = backend.split("=", maxsplit=1)
+        backends[domain] = uri
+
+    routes = dict(DEFAULT_ROUTES)
+    for route in args.route:
+        event_type, domain = route.split("=", maxsplit=1)
+        routes[event_type] = domain
+
+    router = Router(
+        backends,
+        routes=routes,
+        pool_size=args.pool_size,
+        info_refresh=args.info_refresh,
+    )
+    server = AsyncServer.from_uri(args.uri)
+
+    try:
+        await server.run(partial(RouterEventHandler, router=router))
+    finally:
+        await router.close()
+
+
+if __name__ == "__main__":
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(main())
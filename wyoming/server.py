@@ -1,12 +1,33 @@
 import asyncio
+import logging
 import sys
 from abc import ABC, abstractmethod
 from functools import partial
 from pathlib import Path
-from typing import Callable, Dict, Optional, Union
+from typing import Callable, Dict, Optional, Set, Union, cast
 from urllib.parse import urlparse
 
-from .event import Event, async_get_stdin, async_read_event, async_write_event
+from .event import (
+    DEFAULT_MAX_DATA_LENGTH,
+    DEFAULT_MAX_PAYLOAD_LENGTH,
+    Event,
+    EventTooLargeError,
+    PayloadStream,
+    async_get_stdin,
+    async_read_event,
+    async_read_event_stream,
+    async_write_bytes,
+    async_write_event,
+)
+from .inproc import InprocStreamReader, start_inproc_server, stop_inproc_server
+from .recording import EventDirection, EventRecorder
+from .shm import start_shm_server
+from .udp import DEFAULT_JITTER_MS, UdpServer, get_jitter_ms, start_udp_server
+
+_LOGGER = logging.getLogger(__name__)
+
+# Seconds to wait for event handlers to finish when stopping
+_STOP_TIMEOUT = 5.0
 
 
 class AsyncEventHandler(ABC):
@@ -19,27 +40,107 @@ class AsyncEventHandler(ABC):
         self.writer = writer
         self._is_running = False
 
+        self.max_data_length = DEFAULT_MAX_DATA_LENGTH
+        """Longest event data that will be read."""
+
+        self.max_payload_length = DEFAULT_MAX_PAYLOAD_LENGTH
+        """Longest event payload that will be read into memory."""
+
+        self.stream_payload_length: Optional[int] = None
+        """Payloads at least this long go to handle_event_stream (None = never)."""
+
+        self.lazy_events = False
+        """Read events as LazyEvent (e.g., for forwarding without decoding)."""
+
+        self.recorder: Optional[EventRecorder] = None
+        """Records events that are read and written (see recording.py)."""
+
     @abstractmethod
     async def handle_event(self, event: Event) -> bool:
         """Handle an event. Returning false will disconnect the client."""
         return True
 
+    async def handle_event_stream(self, event: Event, payload: PayloadStream) -> bool:
+        """Handle an event whose payload is read in chunks.
+
+        Only called when stream_payload_length is set. By default, the payload
+        is read into memory and passed to handle_event.
+        """
+        payload_bytes = await payload.read(self.max_payload_length)
+        return await self.handle_event(
+            Event(type=event.type, data=event.data, payload=payload_bytes)
+        )
+
     async def write_event(self, event: Event) -> None:
         """Send an event to the client."""
+        if self.recorder is not None:
+            self.recorder.record(event, EventDirection.FROM_SERVICE)
+
         await async_write_event(event, self.writer)
 
+    async def write_event_bytes(self, event_bytes: bytes) -> None:
+        """Send a pre-encoded event (see encode_event) to the client."""
+        if self.recorder is not None:
+            self.recorder.record_bytes(event_bytes, EventDirection.FROM_SERVICE)
+
+        await async_write_bytes(event_bytes, self.writer)
+
     async def run(self) -> None:
         """Receive events until stopped or handle_event returns false."""
         self._is_running = True
 
         try:
             while self._is_running:
-                event = await async_read_event(self.reader)
-                if event is None:
+                if self.stream_payload_length is None:
+                    event = await async_read_event(
+                        self.reader,
+                        max_data_length=self.max_data_length,
+                        max_payload_length=self.max_payload_length,
+                        lazy=self.lazy_events,
+                    )
+                    if event is None:
+                        break
+
+                    if self.recorder is not None:
+                        self.recorder.record(event, EventDirection.TO_SERVICE)
+
+                    if not (await self.handle_event(event)):
+                        break
+
+                    continue
+
+                result = await async_read_event_stream(
+                    self.reader,
+                    min_stream_length=self.stream_payload_length,
+                    max_data_length=self.max_data_length,
+                    max_payload_length=self.max_payload_length,
+                )
+                if result is None:
                     break
 
-                if not (await self.handle_event(event)):
+                event, payload = result
+                if self.recorder is not None:
+                    # Streamed payloads are not recorded
+                    self.recorder.record(
+                        event,
+                        EventDirection.TO_SERVICE,
+                        is_payload_omitted=payload is not None,
+                    )
+
+                if payload is None:
+                    is_handled = await self.handle_event(event)
+                else:
+                    is_handled = await self.handle_event_stream(event, payload)
+
+                    # Stay in sync with the stream
+                    await payload.skip()
+
+                if not is_handled:
                     break
+        except EventTooLargeError as err:
+            # Rest of the stream can't be read
+            _LOGGER.warning("Disconnecting client: %s", err)
+            self.writer.close()
         finally:
             await self.disconnect()
 
@@ -85,7 +186,24 @@ class AsyncServer(ABC):
         if result.scheme == "stdio":
             return AsyncStdioServer()
 
-        raise ValueError("Only 'stdio://', 'unix://', or 'tcp://' are supported")
+        if result.scheme == "shm":
+            return AsyncShmServer(result.path)
+
+        if result.scheme == "inproc":
+            return AsyncInprocServer(result.netloc or result.path)
+
+        if result.scheme == "udp":
+            if (result.hostname is None) or (result.port is None):
+                raise ValueError("A port must be specified when using a 'udp://' URI")
+
+            return AsyncUdpServer(
+                result.hostname, result.port, jitter_ms=get_jitter_ms(result.query)
+            )
+
+        raise ValueError(
+            "Only 'stdio://', 'unix://', 'tcp://', 'shm://', 'inproc://', "
+            "or 'udp://' are supported"
+        )
 
     async def _handler_callback(
         self,
@@ -96,7 +214,11 @@ class AsyncServer(ABC):
         handler = handler_factory(reader, writer)
         task = asyncio.create_task(handler.run(), name="wyoming event handler")
         self._handlers[task] = handler
-        task.add_done_callback(lambda t: self._handlers.pop(t, None))
+        task.add_done_callback(self._handler_done)
+
+    def _handler_done(self, task: asyncio.Task) -> None:
+        """Called when an event handler finishes."""
+        self._handlers.pop(task, None)
 
     async def start(self, handler_factory: HandlerFactory) -> None:
         """Start server without blocking."""
@@ -165,6 +287,46 @@ class AsyncTcpServer(AsyncServer):
             self._server.close()
 
 
+class AsyncUdpServer(AsyncServer):
+    """Wyoming server with audio chunks over UDP and other events over TCP."""
+
+    def __init__(
+        self, host: str, port: int, jitter_ms: int = DEFAULT_JITTER_MS
+    ) -> None:
+        super().__init__()
+        self.host = host
+        self.port = port
+        self.jitter_ms = jitter_ms
+        self._server: Optional[UdpServer] = None
+
+    async def run(self, handler_factory: HandlerFactory) -> None:
+        """Start server and block while running."""
+        await self.start(handler_factory)
+
+        try:
+            await asyncio.Future()
+        finally:
+            await self.stop()
+
+    async def start(self, handler_factory: HandlerFactory) -> None:
+        """Start server without blocking."""
+        handler_callback = partial(self._handler_callback, handler_factory)
+        self._server = await start_udp_server(
+            handler_callback,  # type: ignore[arg-type]
+            host=self.host,
+            port=self.port,
+            jitter_ms=self.jitter_ms,
+        )
+
+    async def stop(self) -> None:
+        """Try to stop all event handlers."""
+        await super().stop()
+
+        if self._server is not None:
+            self._server.close()
+            self._server = None
+
+
 class AsyncUnixServer(AsyncServer):
     """Wyoming server over a Unix domain socket."""
 
@@ -178,10 +340,7 @@ class AsyncUnixServer(AsyncServer):
         # Need to unlink socket file if it exists
         self.socket_path.unlink(missing_ok=True)
 
-        handler_callback = partial(self._handler_callback, handler_factory)
-        self._server = await asyncio.start_unix_server(
-            handler_callback, path=self.socket_path
-        )
+        self._server = await self._start_server(handler_factory)
 
         try:
             await self._server.serve_forever()
@@ -194,11 +353,7 @@ class AsyncUnixServer(AsyncServer):
         # Need to unlink socket file if it exists
         self.socket_path.unlink(missing_ok=True)
 
-        handler_callback = partial(self._handler_callback, handler_factory)
-        self._server = await asyncio.start_unix_server(
-            handler_callback, path=self.socket_path
-        )
-
+        self._server = await self._start_server(handler_factory)
         await self._server.start_serving()
 
     async def stop(self) -> None:
@@ -209,3 +364,97 @@ class AsyncUnixServer(AsyncServer):
             self._server.close()
 
         self.socket_path.unlink(missing_ok=True)
+
+    async def _start_server(
+        self, handler_factory: HandlerFactory
+    ) -> asyncio.AbstractServer:
+        handler_callback = partial(self._handler_callback, handler_factory)
+        return await asyncio.start_unix_server(handler_callback, path=self.socket_path)
+
+
+class AsyncShmServer(AsyncUnixServer):
+    """Wyoming server over a Unix domain socket, with large payloads in shared memory."""
+
+    def __init__(self, socket_path: Union[str, Path]) -> None:
+        super().__init__(socket_path)
+
+        # Writers of finished handlers that are releasing shared memory
+        self._closing_tasks: Set[asyncio.Task] = set()
+
+    async def stop(self) -> None:
+        """Try to stop all event handlers and release their shared memory."""
+        handler_tasks = list(self._handlers)
+        await super().stop()
+
+        if handler_tasks:
+            await asyncio.wait(handler_tasks, timeout=_STOP_TIMEOUT)
+
+        await asyncio.gather(*self._closing_tasks)
+
+    def _handler_done(self, task: asyncio.Task) -> None:
+        handler = self._handlers.get(task)
+        super()._handler_done(task)
+
+        if handler is None:
+            return
+
+        # Unlink the handler's ring and close rings of the client
+        handler.writer.close()
+        closing_task = asyncio.create_task(_wait_closed(handler.writer))
+        self._closing_tasks.add(closing_task)
+        closing_task.add_done_callback(self._closing_tasks.discard)
+
+    async def _start_server(
+        self, handler_factory: HandlerFactory
+    ) -> asyncio.AbstractServer:
+        handler_callback = partial(self._handler_callback, handler_factory)
+        return await start_shm_server(handler_callback, self.socket_path)
+
+
+class AsyncInprocServer(AsyncServer):
+    """Wyoming server in the same process (events are passed without serialization)."""
+
+    def __init__(self, name: str) -> None:
+        super().__init__()
+        self.name = name
+        self._is_started = False
+
+    async def run(self, handler_factory: HandlerFactory) -> None:
+        """Start server and block while running."""
+        await self.start(handler_factory)
+
+        try:
+            await asyncio.Future()
+        finally:
+            await self.stop()
+
+    async def start(self, handler_factory: HandlerFactory) -> None:
+        """Start server without blocking."""
+        handler_callback = partial(self._handler_callback, handler_factory)
+        start_inproc_server(self.name, handler_callback)  # type: ignore[arg-type]
+        self._is_started = True
+
+    def _handler_done(self, task: asyncio.Task) -> None:
+        handler = self._handlers.get(task)
+        super()._handler_done(task)
+
+        if handler is not None:
+            # Client gets ConnectionResetError if it keeps writing
+            cast(InprocStreamReader, handler.reader).close()
+            handler.writer.close()
+
+    async def stop(self) -> None:
+        """Try to stop all event handlers."""
+        await super().stop()
+
+        if self._is_started:
+            stop_inproc_server(self.name)
+            self._is_started = False
+
+
+async def _wait_closed(writer: asyncio.StreamWriter) -> None:
+    try:
+        await writer.wait_closed()
+    except OSError:
+        # Connection is already gone
+        pass
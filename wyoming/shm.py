@@ -0,0 +1,310 @@
+"""Shared memory transport for services on the same host.
+
+Events are sent over a Unix domain socket as usual, but large payloads (audio)
+are written to a shared memory ring buffer owned by the sender. The event
+header then has "payload_shm": [name, position, length] instead of
+"payload_length", and the receiver copies the payload out of shared memory.
+
+Each writer has its own ring. The reader stores how far it has read at the
+start of the ring, and the writer falls back to sending the payload over the
+socket if the reader is too far behind.
+"""
+import asyncio
+import re
+import secrets
+import struct
+import sys
+import time
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Union
+
+DEFAULT_RING_SIZE = 1024 * 1024
+"""Bytes of payload per ring buffer (about 30 seconds of 16Khz 16-bit mono)."""
+
+DEFAULT_MIN_PAYLOAD_SIZE = 256
+"""Smaller payloads are sent over the socket."""
+
+# Header: read position (written by reader), capacity (written by writer)
+_HEADER = struct.Struct("<QQ")
+_HEADER_SIZE = 64
+_CLOSE_TIMEOUT = 5.0
+
+ShmPayload = Tuple[str, int, int]
+"""Name of shared memory, position in ring, length of payload."""
+
+# Only rings created by Wyoming can be attached
+_NAME_PREFIX = "wyoming_"
+_NAME_PATTERN = re.compile(r"^wyoming_[0-9a-f]+$")
+
+# Names of rings created by this process
+_OWNED_NAMES: Set[str] = set()
+
+
+class SharedMemoryRing:
+    """Ring buffer of payloads in shared memory."""
+
+    def __init__(self, shm: SharedMemory, capacity: int, is_owner: bool) -> None:
+        assert shm.buf is not None
+        self.shm = shm
+        self._buf: memoryview = shm.buf
+        self.capacity = capacity
+        self.is_owner = is_owner
+        self._write_position = 0
+
+    @staticmethod
+    def create(capacity: int = DEFAULT_RING_SIZE) -> "SharedMemoryRing":
+        """Create ring buffer that is written by this process."""
+        shm = SharedMemory(
+            name=f"{_NAME_PREFIX}{secrets.token_hex(8)}",
+            create=True,
+            size=_HEADER_SIZE + capacity,
+        )
+        assert shm.buf is not None
+        _HEADER.pack_into(shm.buf, 0, 0, capacity)
+        _OWNED_NAMES.add(shm.name)
+
+        return SharedMemoryRing(shm, capacity, is_owner=True)
+
+    @staticmethod
+    def attach(name: str) -> "SharedMemoryRing":
+        """Attach to ring buffer created by another process.
+
+        Raises ValueError if the name or ring is invalid.
+        """
+        if (not isinstance(name, str)) or (not _NAME_PATTERN.match(name)):
+            raise ValueError(f"Invalid shared memory name: {name!r}")
+
+        try:
+            if sys.version_info >= (3, 13):
+                # pylint: disable-next=unexpected-keyword-arg
+                shm = SharedMemory(name=name, track=False)
+            else:
+                shm = SharedMemory(name=name)
+
+                if name not in _OWNED_NAMES:
+                    # Don't let the resource tracker unlink memory we don't own
+                    resource_tracker.unregister(
+                        shm._name,  # type: ignore[attr-defined] # pylint: disable=protected-access
+                        "shared_memory",
+                    )
+        except OSError as err:
+            raise ValueError(f"Can't attach shared memory {name}: {err}") from err
+
+        assert shm.buf is not None
+        capacity = 0
+        if shm.size >= _HEADER_SIZE:
+            _read_position, capacity = _HEADER.unpack_from(shm.buf, 0)
+
+        if not 0 < capacity <= (shm.size - _HEADER_SIZE):
+            shm.close()
+            raise ValueError(f"Invalid shared memory capacity: {capacity}")
+
+        return SharedMemoryRing(shm, capacity, is_owner=False)
+
+    @property
+    def name(self) -> str:
+        """Name of shared memory."""
+        return self.shm.name
+
+    @property
+    def read_position(self) -> int:
+        """Total bytes read by the reader."""
+        return _HEADER.unpack_from(self._buf, 0)[0]
+
+    @property
+    def is_empty(self) -> bool:
+        """True if the reader has read all payloads."""
+        return self.read_position >= self._write_position
+
+    def put(self, payload: bytes) -> Optional[ShmPayload]:
+        """Write payload to ring. Returns None if there isn't enough space."""
+        length = len(payload)
+        if length > self.capacity:
+            return None
+
+        position = self._write_position
+        offset = position % self.capacity
+        if (offset + length) > self.capacity:
+            # Payloads are contiguous, so skip to the start
+            position += self.capacity - offset
+            offset = 0
+
+        if (position + length - self.read_position) > self.capacity:
+            # Reader is too far behind
+            return None
+
+        start = _HEADER_SIZE + offset
+        self._buf[start : start + length] = payload
+        self._write_position = position + length
+
+        return (self.name, position, length)
+
+    def get(self, position: int, length: int) -> bytes:
+        """Copy payload out of the ring and release its space to the writer.
+
+        Raises ValueError if the payload isn't inside the ring.
+        """
+        if (
+            (not isinstance(position, int))
+            or (not isinstance(length, int))
+            or (position < 0)
+            or (not 0 <= length <= self.capacity)
+            or (((position % self.capacity) + length) > self.capacity)
+        ):
+            raise ValueError(
+                f"Invalid shared memory payload: position={position}, length={length}"
+            )
+
+        start = _HEADER_SIZE + (position % self.capacity)
+        payload = bytes(self._buf[start : start + length])
+        struct.pack_into("<Q", self._buf, 0, position + length)
+
+        return payload
+
+    def close(self) -> None:
+        """Close shared memory and unlink it if owned."""
+        self.shm.close()
+        if self.is_owner:
+            _OWNED_NAMES.discard(self.name)
+            try:
+                self.shm.unlink()
+            except FileNotFoundError:
+                pass
+
+
+class ShmStreamReader(asyncio.StreamReader):
+    """Stream reader that can read payloads from shared memory."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._rings: Dict[str, SharedMemoryRing] = {}
+
+    def read_shared_payload(self, payload_shm: List[Any]) -> bytes:
+        """Copy payload from a writer's ring buffer.
+
+        Raises ValueError if the payload location is invalid, which ends the
+        read like a malformed event.
+        """
+        if (not isinstance(payload_shm, list)) or (len(payload_shm) != 3):
+            raise ValueError(f"Invalid shared memory payload: {payload_shm!r}")
+
+        name, position, length = payload_shm
+        ring = self._rings.get(name)
+        if ring is None:
+            ring = SharedMemoryRing.attach(name)
+            self._rings[name] = ring
+
+        return ring.get(position, length)
+
+    def close_shared_memory(self) -> None:
+        """Close all attached ring buffers."""
+        for ring in self._rings.values():
+            ring.close()
+
+        self._rings.clear()
+
+
+class ShmStreamWriter(asyncio.StreamWriter):
+    """Stream writer that sends large payloads through shared memory."""
+
+    def __init__(
+        self,
+        transport: asyncio.BaseTransport,
+        protocol: asyncio.BaseProtocol,
+        reader: Optional[ShmStreamReader],
+        loop: asyncio.AbstractEventLoop,
+        ring_size: int = DEFAULT_RING_SIZE,
+        min_payload_size: int = DEFAULT_MIN_PAYLOAD_SIZE,
+    ) -> None:
+        super().__init__(transport, protocol, reader, loop)  # type: ignore[arg-type]
+        self.ring_size = ring_size
+        self.min_payload_size = min_payload_size
+        self._shm_reader = reader
+        self._ring: Optional[SharedMemoryRing] = None
+
+    def share_payload(self, payload: bytes) -> Optional[ShmPayload]:
+        """Put payload in shared memory. Returns None to send it inline."""
+        if len(payload) < self.min_payload_size:
+            return None
+
+        if self._ring is None:
+            self._ring = SharedMemoryRing.create(self.ring_size)
+
+        return self._ring.put(payload)
+
+    def close(self) -> None:
+        super().close()
+
+        if self._shm_reader is not None:
+            self._shm_reader.close_shared_memory()
+
+        if (self._ring is not None) and self._ring.is_empty:
+            self._ring.close()
+            self._ring = None
+
+    async def wait_closed(self) -> None:
+        try:
+            await super().wait_closed()
+        finally:
+            await self._close_ring()
+
+    async def _close_ring(self) -> None:
+        if self._ring is None:
+            return
+
+        # Give the reader time to copy out payloads that are still in flight
+        start_time = time.monotonic()
+        while (not self._ring.is_empty) and (
+            (time.monotonic() - start_time) < _CLOSE_TIMEOUT
+        ):
+            await asyncio.sleep(0.01)
+
+        self._ring.close()
+        self._ring = None
+
+
+async def open_shm_connection(
+    path: Union[str, Path],
+    ring_size: int = DEFAULT_RING_SIZE,
+    **kwargs: Any,
+) -> Tuple[ShmStreamReader, ShmStreamWriter]:
+    """Connect to a shared memory server (like asyncio.open_unix_connection)."""
+    loop = asyncio.get_running_loop()
+    reader = ShmStreamReader(loop=loop)
+    protocol = asyncio.StreamReaderProtocol(reader, loop=loop)
+    transport, _ = await loop.create_unix_connection(
+        lambda: protocol, str(path), **kwargs
+    )
+    writer = ShmStreamWriter(transport, protocol, reader, loop, ring_size=ring_size)
+
+    return reader, writer
+
+
+async def start_shm_server(
+    client_connected_cb: Callable[[ShmStreamReader, ShmStreamWriter], Any],
+    path: Union[str, Path],
+    ring_size: int = DEFAULT_RING_SIZE,
+    **kwargs: Any,
+) -> asyncio.AbstractServer:
+    """Start a shared memory server (like asyncio.start_unix_server)."""
+    loop = asyncio.get_running_loop()
+
+    def protocol_factory() -> asyncio.StreamReaderProtocol:
+        reader = ShmStreamReader(loop=loop)
+        protocol: Optional[asyncio.StreamReaderProtocol] = None
+
+        def connected_cb(reader: ShmStreamReader, writer: asyncio.StreamWriter) -> Any:
+            assert protocol is not None
+            shm_writer = ShmStreamWriter(
+                writer.transport, protocol, reader, loop, ring_size=ring_size
+            )
+            return client_connected_cb(reader, shm_writer)
+
+        protocol = asyncio.StreamReaderProtocol(
+            reader, connected_cb, loop=loop  # type: ignore[arg-type]
+        )
+        return protocol
+
+    return await loop.create_unix_server(protocol_factory, str(path), **kwargs)
@@ -0,0 +1,615 @@
+"""Low-latency transport that sends audio chunks as UDP datagrams.
+
+Each connection has a TCP control channel for all events except audio chunks,
+which are sent as datagrams to the same port. Late audio is worth less than
+lost audio (e.g., for wake word detection), so a lost datagram never stalls
+the stream like it would over TCP.
+
+After connecting, the server sends a "udp-session" event with a random
+session id. Every datagram starts with the session id, a sequence number, and
+the number of events sent over the control channel before it, followed by
+the encoded audio chunk event. The client's datagrams tell the
+server where to send its own audio chunks.
+
+The receiver reorders datagrams in a jitter buffer, and fills in lost audio
+with silence. Events on the control channel have the number of datagrams sent
+before them in their header ("udp_sequence"), so audio and other events are
+received in the order they were sent.
+"""
+import asyncio
+import io
+import secrets
+import struct
+from collections import deque
+from functools import partial
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs
+
+from .audio import AudioChunk
+from .event import (
+    DEFAULT_MAX_DATA_LENGTH,
+    DEFAULT_MAX_PAYLOAD_LENGTH,
+    Event,
+    async_read_event,
+    async_read_sequenced_event,
+    async_write_event,
+    async_write_sequenced_event,
+    encode_event,
+    read_event,
+)
+
+DEFAULT_JITTER_MS = 60
+"""Maximum time to wait for a late datagram before filling in silence."""
+
+DEFAULT_MAX_GAP = 50
+"""Most missing chunks in a row that are replaced with silence."""
+
+DEFAULT_MAX_DATAGRAM_SIZE = 8192
+"""Larger audio chunks are sent over the control channel."""
+
+_SESSION_TYPE = "udp-session"
+
+_SESSION_SIZE = 8
+
+# Datagrams sent after connecting so the server learns the client's address
+_HELLO_COUNT = 3
+_HELLO_INTERVAL = 0.05
+
+# Header: session id, sequence number, control events sent before
+_DATAGRAM_HEADER = struct.Struct(f"!{_SESSION_SIZE}sQQ")
+
+Address = Any
+ConnectedCallback = Callable[["UdpStreamReader", "UdpStreamWriter"], Any]
+
+
+class JitterBuffer:
+    """Puts sequenced audio chunk events back in order.
+
+    Chunks that arrive in order are released immediately. When one is missing,
+    later chunks are held for up to max_delay_ms before the missing chunk is
+    replaced with silence. Chunks that arrive after that are dropped.
+
+    Gaps longer than max_gap chunks (e.g., a jump in sequence numbers) are
+    skipped without silence, resyncing to the next chunk.
+
+    Other events from datagrams keep their place in the order, but only audio
+    chunks are used as the format of silence.
+    """
+
+    def __init__(
+        self, max_delay_ms: int = DEFAULT_JITTER_MS, max_gap: int = DEFAULT_MAX_GAP
+    ) -> None:
+        self.max_delay = max_delay_ms / 1000
+        self.max_gap = max_gap
+        self.next_sequence = 0
+
+        self.num_lost = 0
+        """Chunks replaced with silence or skipped."""
+
+        self.num_late = 0
+        """Chunks dropped because they arrived too late."""
+
+        # sequence -> (arrival time, event)
+        self._packets: Dict[int, Tuple[float, Event]] = {}
+        self._last_chunk: Optional[AudioChunk] = None
+
+    def put(self, sequence: int, event: Event, now: float) -> bool:
+        """Add chunk that arrived at time now. Returns False if it was dropped."""
+        if (sequence < self.next_sequence) or (sequence in self._packets):
+            self.num_late += 1
+            return False
+
+        self._packets[sequence] = (now, event)
+        return True
+
+    def get(
+        self, now: float, until_sequence: Optional[int] = None
+    ) -> List[Tuple[int, Event]]:
+        """Get (sequence, chunk) pairs that are ready at time now.
+
+        Missing chunks before until_sequence are replaced with silence without
+        waiting.
+        """
+        events: List[Tuple[int, Event]] = []
+        while self._packets or (
+            (until_sequence is not None) and (self.next_sequence < until_sequence)
+        ):
+            sequence = self.next_sequence
+            packet = self._packets.pop(sequence, None)
+            if packet is not None:
+                self.next_sequence += 1
+                self._last_chunk = _get_audio_chunk(packet[1]) or self._last_chunk
+                events.append((sequence, packet[1]))
+                continue
+
+            if (until_sequence is None) or (self.next_sequence >= until_sequence):
+                deadline = self.get_deadline()
+                if (deadline is None) or (now < deadline):
+                    break
+
+            gap_end = min(self._packets) if self._packets else until_sequence
+            assert gap_end is not None
+            if (gap_end - sequence) > self.max_gap:
+                # Resync instead of filling in the whole gap
+                self.num_lost += gap_end - sequence
+                self.next_sequence = gap_end
+                continue
+
+            silence_event = self._conceal()
+            if silence_event is not None:
+                events.append((sequence, silence_event))
+
+        return events
+
+    def flush(self) -> List[Tuple[int, Event]]:
+        """Get all remaining chunks, filling in any gaps."""
+        if not self._packets:
+            return []
+
+        return self.get(0, until_sequence=max(self._packets) + 1)
+
+    def get_deadline(self) -> Optional[float]:
+        """Time when the next missing chunk will be replaced with silence."""
+        if not self._packets:
+            return None
+
+        return min(arrival for arrival, _event in self._packets.values()) + (
+            self.max_delay
+        )
+
+    def _conceal(self) -> Optional[Event]:
+        """Skip the next chunk, returning silence in its place."""
+        self.next_sequence += 1
+        self.num_lost += 1
+
+        template = self._last_chunk
+        if template is None:
+            for sequence in sorted(self._packets):
+                template = _get_audio_chunk(self._packets[sequence][1])
+                if template is not None:
+                    break
+
+        if template is None:
+            # Nothing to copy the audio format from
+            return None
+
+        timestamp: Optional[int] = None
+        if template.timestamp is not None:
+            timestamp = template.timestamp + template.milliseconds
+
+        silence = AudioChunk(
+            rate=template.rate,
+            width=template.width,
+            channels=template.channels,
+            audio=bytes(len(template.audio)),
+            timestamp=timestamp,
+            sample_format=template.sample_format,
+        )
+        self._last_chunk = silence
+
+        return silence.event()
+
+
+def _get_audio_chunk(event: Event) -> Optional[AudioChunk]:
+    """Get audio chunk from event, or None if it's another event or malformed."""
+    if not AudioChunk.is_type(event.type):
+        return None
+
+    try:
+        chunk = AudioChunk.from_event(event)
+        if min(chunk.rate, chunk.width, chunk.channels) <= 0:
+            return None
+    except (KeyError, TypeError, ValueError):
+        return None
+
+    return chunk
+
+
+class UdpStreamReader:
+    """Receives events from the control channel and audio datagrams in order."""
+
+    def __init__(
+        self,
+        reader: asyncio.StreamReader,
+        jitter_ms: int = DEFAULT_JITTER_MS,
+        on_eof: Optional[Callable[[], None]] = None,
+    ) -> None:
+        self.reader = reader
+        self.jitter_buffer = JitterBuffer(jitter_ms)
+        self._on_eof = on_eof
+        self._loop = asyncio.get_running_loop()
+        self._ready: Deque[Event] = deque()
+        self._ready_changed = asyncio.Event()
+
+        # Control events waiting for audio: (udp sequence, arrival, event)
+        self._held: Deque[Tuple[int, float, Event]] = deque()
+        self._num_control = 0
+
+        # Audio waiting for control events: (sequence, control count, event)
+        self._audio: Deque[Tuple[int, int, Event]] = deque()
+        self._control_counts: Dict[int, int] = {}
+        self._last_control_count = 0
+
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._control_task: Optional[asyncio.Task] = None
+        self._is_eof = False
+
+        # Limits for the control channel (from the last get_event)
+        self._max_data_length = DEFAULT_MAX_DATA_LENGTH
+        self._max_payload_length = DEFAULT_MAX_PAYLOAD_LENGTH
+
+        # Error that ended the control channel
+        self._error: Optional[Exception] = None
+
+    async def get_event(
+        self,
+        max_data_length: int = DEFAULT_MAX_DATA_LENGTH,
+        max_payload_length: int = DEFAULT_MAX_PAYLOAD_LENGTH,
+    ) -> Optional[Event]:
+        """Get next event or None at end of stream.
+
+        Events on the control channel are read ahead with the most recent
+        limits. An error from the control channel (e.g., EventTooLargeError)
+        is raised after the events before it.
+        """
+        self._max_data_length = max_data_length
+        self._max_payload_length = max_payload_length
+
+        if self._control_task is None:
+            self._control_task = asyncio.create_task(self._read_control())
+
+        while not self._ready:
+            if self._is_eof:
+                if self._error is not None:
+                    raise self._error
+
+                return None
+
+            self._ready_changed.clear()
+            await self._ready_changed.wait()
+
+        return self._ready.popleft()
+
+    def datagram_received(self, data: bytes) -> None:
+        """Add audio datagram."""
+        if self._is_eof:
+            return
+
+        _session, sequence, control_count = _DATAGRAM_HEADER.unpack_from(data)
+        event = read_event(io.BytesIO(data[_DATAGRAM_HEADER.size :]))
+        if event is None:
+            return
+
+        if self.jitter_buffer.put(sequence, event, self._loop.time()):
+            self._control_counts[sequence] = control_count
+            self._update()
+
+    def feed_eof(self) -> None:
+        self.reader.feed_eof()
+
+    def at_eof(self) -> bool:
+        return self._is_eof and (not self._ready)
+
+    async def _read_control(self) -> None:
+        try:
+            while True:
+                result = await async_read_sequenced_event(
+                    self.reader,
+                    max_data_length=self._max_data_length,
+                    max_payload_length=self._max_payload_length,
+                )
+                if result is None:
+                    break
+
+                event, udp_sequence = result
+                self._held.append((udp_sequence, self._loop.time(), event))
+                self._update()
+        except Exception as err:
+            # Raised from get_event, like errors from a TCP stream
+            self._error = err
+        finally:
+            # Release everything that's left
+            self._update(is_final=True)
+            self._is_eof = True
+            self._ready_changed.set()
+
+            if self._timer is not None:
+                self._timer.cancel()
+
+            if self._on_eof is not None:
+                self._on_eof()
+
+    def _update(self, is_final: bool = False) -> None:
+        """Release events that are ready and schedule the next check."""
+        now = self._loop.time()
+        max_delay = self.jitter_buffer.max_delay
+
+        until_sequence: Optional[int] = None
+        if self._held and (is_final or ((now - self._held[0][1]) >= max_delay)):
+            # Stop waiting for audio sent before this control event
+            until_sequence = self._held[0][0]
+
+        audio_events = self.jitter_buffer.get(now, until_sequence)
+        if is_final:
+            audio_events.extend(self.jitter_buffer.flush())
+
+        for sequence, event in audio_events:
+            control_count = self._control_counts.pop(sequence, self._last_control_count)
+            self._last_control_count = control_count
+            self._audio.append((sequence, control_count, event))
+
+        # Merge audio and control events in the order they were sent
+        while True:
+            if self._audio and (
+                (self._audio[0][1] <= self._num_control)
+                or (is_final and (not self._held))
+            ):
+                self._ready.append(self._audio.popleft()[2])
+                continue
+
+            if self._held:
+                if self._audio:
+                    next_sequence = self._audio[0][0]
+                else:
+                    next_sequence = self.jitter_buffer.next_sequence
+
+                if is_final or (self._held[0][0] <= next_sequence):
+                    self._ready.append(self._held.popleft()[2])
+                    self._num_control += 1
+                    continue
+
+            break
+
+        if self._ready:
+            self._ready_changed.set()
+
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        if is_final:
+            return
+
+        deadlines = [self.jitter_buffer.get_deadline()]
+        if self._held:
+            deadlines.append(self._held[0][1] + max_delay)
+
+        next_deadline = min((d for d in deadlines if d is not None), default=None)
+        if next_deadline is not None:
+            self._timer = self._loop.call_at(next_deadline, self._update)
+
+
+class UdpStreamWriter:
+    """Sends audio chunks as datagrams and other events over the control channel."""
+
+    def __init__(
+        self,
+        writer: asyncio.StreamWriter,
+        session: bytes,
+        transport: asyncio.DatagramTransport,
+        address: Optional[Address] = None,
+        is_owner: bool = False,
+        max_datagram_size: int = DEFAULT_MAX_DATAGRAM_SIZE,
+    ) -> None:
+        self.writer = writer
+        self.session = session
+        self.transport = transport
+        self.max_datagram_size = max_datagram_size
+
+        self.address = address
+        """Where to send datagrams (None for a connected transport)."""
+
+        self.can_send_datagrams = is_owner
+        """False until the peer's address is known."""
+
+        self._is_owner = is_owner
+        self._sequence = 0
+        self._num_control = 0
+
+    async def put_event(self, event: Event) -> None:
+        """Send event as a datagram if it's an audio chunk, otherwise over TCP."""
+        if self.can_send_datagrams and AudioChunk.is_type(event.type):
+            datagram = _DATAGRAM_HEADER.pack(
+                self.session, self._sequence, self._num_control
+            ) + encode_event(event)
+            if len(datagram) <= self.max_datagram_size:
+                self.transport.sendto(datagram, self.address)
+                self._sequence += 1
+                return
+
+        self._num_control += 1
+        await async_write_sequenced_event(event, self.writer, self._sequence)
+
+    def write(self, data: bytes) -> None:
+        """Write encoded events to the control channel."""
+        self.writer.write(data)
+
+    async def drain(self) -> None:
+        await self.writer.drain()
+
+    def close(self) -> None:
+        self.writer.close()
+
+        if self._is_owner:
+            self.transport.close()
+
+    def is_closing(self) -> bool:
+        return self.writer.is_closing()
+
+    async def wait_closed(self) -> None:
+        await self.writer.wait_closed()
+
+
+class _DatagramProtocol(asyncio.DatagramProtocol):
+    def __init__(self, datagram_received: Callable[[bytes, Address], None]) -> None:
+        self._datagram_received = datagram_received
+
+    def datagram_received(self, data: bytes, addr: Address) -> None:
+        if len(data) >= _DATAGRAM_HEADER.size:
+            self._datagram_received(data, addr)
+
+
+def get_jitter_ms(query: str) -> int:
+    """Get jitter_ms from a URI query string (e.g., udp://host:port?jitter_ms=100)."""
+    values = parse_qs(query).get("jitter_ms")
+    if not values:
+        return DEFAULT_JITTER_MS
+
+    jitter_ms = int(values[-1])
+    if jitter_ms < 0:
+        raise ValueError(f"jitter_ms must be at least 0: {jitter_ms}")
+
+    return jitter_ms
+
+
+async def open_udp_connection(
+    host: str,
+    port: int,
+    jitter_ms: int = DEFAULT_JITTER_MS,
+    max_datagram_size: int = DEFAULT_MAX_DATAGRAM_SIZE,
+) -> Tuple[UdpStreamReader, UdpStreamWriter]:
+    """Connect to a UDP server."""
+    tcp_reader, tcp_writer = await asyncio.open_connection(host=host, port=port)
+
+    session_event = await async_read_event(tcp_reader)
+    if (session_event is None) or (session_event.type != _SESSION_TYPE):
+        tcp_writer.close()
+        raise ConnectionError("Expected UDP session from server")
+
+    session = bytes.fromhex(session_event.data["session"])
+    reader = UdpStreamReader(tcp_reader, jitter_ms=jitter_ms)
+
+    def datagram_received(data: bytes, _addr: Address) -> None:
+        if data[:_SESSION_SIZE] == session:
+            reader.datagram_received(data)
+
+    loop = asyncio.get_running_loop()
+    transport, _protocol = await loop.create_datagram_endpoint(
+        lambda: _DatagramProtocol(datagram_received),
+        remote_addr=tcp_writer.get_extra_info("peername")[:2],
+    )
+    writer = UdpStreamWriter(
+        tcp_writer,
+        session,
+        transport,
+        is_owner=True,
+        max_datagram_size=max_datagram_size,
+    )
+
+    # Tell the server where to send datagrams (repeated in case one is lost)
+    hello_datagram = _DATAGRAM_HEADER.pack(session, 0, 0)
+    for hello_index in range(_HELLO_COUNT):
+        loop.call_later(
+            hello_index * _HELLO_INTERVAL, _send_datagram, transport, hello_datagram
+        )
+
+    return reader, writer
+
+
+def _send_datagram(transport: asyncio.DatagramTransport, datagram: bytes) -> None:
+    if not transport.is_closing():
+        transport.sendto(datagram)
+
+
+class UdpServer:
+    """Accepts control connections over TCP and audio datagrams over UDP."""
+
+    def __init__(
+        self,
+        client_connected_cb: ConnectedCallback,
+        jitter_ms: int = DEFAULT_JITTER_MS,
+        max_datagram_size: int = DEFAULT_MAX_DATAGRAM_SIZE,
+    ) -> None:
+        self.client_connected_cb = client_connected_cb
+        self.jitter_ms = jitter_ms
+        self.max_datagram_size = max_datagram_size
+
+        self.tcp_server: Optional[asyncio.AbstractServer] = None
+        self.transport: Optional[asyncio.DatagramTransport] = None
+
+        # session id -> (reader, writer)
+        self._sessions: Dict[bytes, Tuple[UdpStreamReader, UdpStreamWriter]] = {}
+
+    async def start(self, host: str, port: int) -> None:
+        """Listen on TCP and UDP port."""
+        loop = asyncio.get_running_loop()
+        self.tcp_server = await asyncio.start_server(
+            self._client_connected, host=host, port=port
+        )
+
+        # Use the same port for datagrams (in case it was 0)
+        port = self.tcp_server.sockets[0].getsockname()[1]
+        self.transport, _protocol = await loop.create_datagram_endpoint(
+            lambda: _DatagramProtocol(self._datagram_received),
+            local_addr=(host, port),
+        )
+
+    def close(self) -> None:
+        if self.tcp_server is not None:
+            self.tcp_server.close()
+
+        if self.transport is not None:
+            self.transport.close()
+
+        self._sessions.clear()
+
+    async def _client_connected(
+        self, tcp_reader: asyncio.StreamReader, tcp_writer: asyncio.StreamWriter
+    ) -> None:
+        assert self.transport is not None
+
+        session = secrets.token_bytes(_SESSION_SIZE)
+        await async_write_event(
+            Event(_SESSION_TYPE, {"session": session.hex()}), tcp_writer
+        )
+
+        reader = UdpStreamReader(
+            tcp_reader,
+            jitter_ms=self.jitter_ms,
+            on_eof=partial(self._remove_session, session),
+        )
+        writer = UdpStreamWriter(
+            tcp_writer,
+            session,
+            self.transport,
+            max_datagram_size=self.max_datagram_size,
+        )
+        self._sessions[session] = (reader, writer)
+
+        result = self.client_connected_cb(reader, writer)
+        if asyncio.iscoroutine(result):
+            await result
+
+    def _remove_session(self, session: bytes) -> None:
+        self._sessions.pop(session, None)
+
+    def _datagram_received(self, data: bytes, addr: Address) -> None:
+        session, _sequence, _control_count = _DATAGRAM_HEADER.unpack_from(data)
+        reader_writer = self._sessions.get(session)
+        if reader_writer is None:
+            return
+
+        reader, writer = reader_writer
+
+        # Send datagrams back to wherever they're coming from
+        writer.address = addr
+        writer.can_send_datagrams = True
+
+        if len(data) > _DATAGRAM_HEADER.size:
+            reader.datagram_received(data)
+
+
+async def start_udp_server(
+    client_connected_cb: ConnectedCallback,
+    host: str,
+    port: int,
+    jitter_ms: int = DEFAULT_JITTER_MS,
+    max_datagram_size: int = DEFAULT_MAX_DATAGRAM_SIZE,
+) -> UdpServer:
+    """Start a UDP server (like asyncio.start_server)."""
+    server = UdpServer(
+        client_connected_cb, jitter_ms=jitter_ms, max_datagram_size=max_datagram_size
+    )
+    await server.start(host, port)
+
+    return server
@@ -1,70 +1,288 @@
-"""Implement a tiny subset of dataclasses_json for config."""
+"""Implement a tiny subset of dataclasses_json for config.
+
+Decoders and encoders are compiled once per dataclass on first use and cached,
+so from_dict/to_dict don't have to inspect fields and type hints on every call.
+"""
+import copy
 from collections.abc import Mapping, Sequence
-from dataclasses import asdict, fields, is_dataclass
-from typing import Any, Dict, Type
+from dataclasses import fields, is_dataclass
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+    get_args,
+    get_origin,
+    get_type_hints,
+)
+
+try:
+    # Python 3.10+ (str | None)
+    from types import UnionType
+
+    _UNION_TYPES: Tuple[Any, ...] = (Union, UnionType)
+except ImportError:
+    _UNION_TYPES = (Union,)
+
+ValueCodec = Callable[[Any], Any]
+Decoder = Callable[[Dict[str, Any]], Any]
+Encoder = Callable[[Any], Dict[str, Any]]
+
+_NONE_TYPE = type(None)
+_PRIMITIVE_TYPES = (str, int, float, bool, _NONE_TYPE)
+
+# dataclass -> compiled function
+_DECODERS: Dict[Type, Decoder] = {}
+_ENCODERS: Dict[Type, Encoder] = {}
 
 
 class DataClassJsonMixin:
     """Adds from_dict to dataclass."""
 
+    __slots__ = ()
+
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> Any:
         """Parse dataclasses recursively."""
-        kwargs: Dict[str, Any] = {}
+        return get_decoder(cls)(data)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Alias for asdict."""
+        return get_encoder(type(self))(self)
+
+
+def get_decoder(cls: Type) -> Decoder:
+    """Get cached dict -> dataclass decoder, compiling it if necessary."""
+    decoder = _DECODERS.get(cls)
+    if decoder is None:
+        # Placeholder for fields that refer back to cls
+        _DECODERS[cls] = _get_lazy_decoder(cls)
+        try:
+            decoder = _compile_decoder(cls)
+        finally:
+            _DECODERS.pop(cls)
+
+        _DECODERS[cls] = decoder
+
+    return decoder
+
+
+def get_encoder(cls: Type) -> Encoder:
+    """Get cached dataclass -> dict encoder, compiling it if necessary."""
+    encoder = _ENCODERS.get(cls)
+    if encoder is None:
+        encoder = _compile_encoder(cls)
+        _ENCODERS[cls] = encoder
+
+    return encoder
 
-        cls_fields = {field.name: field for field in fields(cls)}
+
+# -----------------------------------------------------------------------------
+
+
+def _get_field_types(cls: Type) -> List[Tuple[str, Any]]:
+    """Get (name, type) of each field with forward references resolved."""
+    try:
+        hints = get_type_hints(cls)
+    except (NameError, TypeError):
+        # Unresolvable forward reference
+        hints = {}
+
+    return [(field.name, hints.get(field.name, field.type)) for field in fields(cls)]
+
+
+def _get_lazy_decoder(cls: Type) -> Decoder:
+    """Create function that calls the decoder of cls once it's compiled."""
+
+    def decode(data: Dict[str, Any]) -> Any:
+        return _DECODERS[cls](data)
+
+    return decode
+
+
+def _compile_decoder(cls: Type) -> Decoder:
+    """Create function that decodes a dict into an instance of cls."""
+    field_types = _get_field_types(cls)
+    field_decoders: Dict[str, Optional[ValueCodec]] = {
+        name: _compile_value_decoder(field_type) for name, field_type in field_types
+    }
+    optional_names = [
+        name for name, field_type in field_types if _is_optional(field_type)
+    ]
+
+    def decode(data: Dict[str, Any]) -> Any:
+        kwargs: Dict[str, Any] = {}
         for key, value in data.items():
-            if key not in cls_fields:
+            if key not in field_decoders:
                 # Skip unknown fields
                 continue
 
-            field = cls_fields[key]
-            if is_dataclass(field.type):
-                assert issubclass(field.type, DataClassJsonMixin), field.type
-                kwargs[key] = field.type.from_dict(value)
+            value_decoder = field_decoders[key]
+            if (value_decoder is None) or (value is None):
+                kwargs[key] = value
             else:
-                kwargs[key] = _decode(value, field.type)
+                kwargs[key] = value_decoder(value)
 
         # Fill in optional fields with None
-        for field in cls_fields.values():
-            if (field.name not in kwargs) and _is_optional(field.type):
-                kwargs[field.name] = None
+        for name in optional_names:
+            if name not in kwargs:
+                kwargs[name] = None
 
         return cls(**kwargs)
 
-    def to_dict(self) -> Dict[str, Any]:
-        """Alias for asdict."""
-        return asdict(self)
+    return decode
+
+
+def _compile_value_decoder(target_type: Any) -> Optional[ValueCodec]:
+    """Create function that decodes a (not None) value of target_type.
+
+    Returns None if the value can be used as-is.
+    """
+    if isinstance(target_type, type) and is_dataclass(target_type):
+        return get_decoder(target_type)
+
+    origin = get_origin(target_type)
+    args = get_args(target_type)
 
+    if origin in _UNION_TYPES:
+        if _NONE_TYPE in args:
+            # Optional[T]
+            return _compile_value_decoder(args[0])
+
+        return None
+
+    if (origin is list) and args:
+        # List[T]
+        item_decoder = _compile_value_decoder(args[0])
+        if item_decoder is None:
+            return _copy_list
+
+        return lambda value: [
+            item_decoder(item) if item is not None else None  # type: ignore[misc]
+            for item in value
+        ]
+
+    if (origin is dict) and (len(args) > 1):
+        # Dict[str, T]
+        value_decoder = _compile_value_decoder(args[1])
+        if value_decoder is None:
+            return _copy_dict
+
+        return lambda value: {
+            map_key: (
+                value_decoder(map_value)  # type: ignore[misc]
+                if map_value is not None
+                else None
+            )
+            for map_key, map_value in value.items()
+        }
+
+    return None
+
+
+def _compile_encoder(cls: Type) -> Encoder:
+    """Create function that encodes an instance of cls into a dict."""
+    field_encoders = [
+        (name, _compile_value_encoder(field_type))
+        for name, field_type in _get_field_types(cls)
+    ]
+
+    def encode(obj: Any) -> Dict[str, Any]:
+        result: Dict[str, Any] = {}
+        for name, value_encoder in field_encoders:
+            value = getattr(obj, name)
+            if (value_encoder is None) or (value is None):
+                result[name] = value
+            else:
+                result[name] = value_encoder(value)
+
+        return result
+
+    return encode
+
+
+def _compile_value_encoder(target_type: Any) -> Optional[ValueCodec]:
+    """Create function that encodes a (not None) value of target_type.
+
+    Returns None if the value can be used as-is.
+    """
+    if target_type in _PRIMITIVE_TYPES:
+        return None
 
-def _decode(value: Any, target_type: Type) -> Any:
-    """Decode value using (possibly generic) type."""
     if is_dataclass(target_type):
-        assert issubclass(target_type, DataClassJsonMixin), target_type
-        return target_type.from_dict(value) if value is not None else None
+        # Value may be a subclass with more fields
+        return _encode_dataclass
+
+    origin = get_origin(target_type)
+    args = get_args(target_type)
 
-    if hasattr(target_type, "__args__"):
+    if (origin in _UNION_TYPES) and (_NONE_TYPE in args) and (len(args) == 2):
         # Optional[T]
-        if type(None) in target_type.__args__:
-            optional_type = target_type.__args__[0]
-            return _decode(value, optional_type)
+        return _compile_value_encoder(args[0])
 
+    if (origin is list) and args:
         # List[T]
-        if isinstance(value, Sequence):
-            list_type = target_type.__args__[0]
-            return [_decode(item, list_type) for item in value]
+        item_encoder = _compile_value_encoder(args[0])
+        if item_encoder is None:
+            return _copy_list
 
-        # Dict[str, T]
-        if isinstance(value, Mapping):
-            value_type = target_type.__args__[1]
-            return {
-                map_key: _decode(map_value, value_type)
-                for map_key, map_value in value.items()
-            }
+        return lambda value: [
+            item_encoder(item) if item is not None else None  # type: ignore[misc]
+            for item in value
+        ]
+
+    # Any, Dict[str, Any], etc.
+    return _encode_any
+
+
+def _encode_dataclass(obj: Any) -> Dict[str, Any]:
+    return get_encoder(type(obj))(obj)
+
+
+def _encode_any(value: Any) -> Any:
+    """Encode value whose type is only known at runtime (like asdict)."""
+    if isinstance(value, _PRIMITIVE_TYPES):
+        return value
+
+    if is_dataclass(value) and (not isinstance(value, type)):
+        return _encode_dataclass(value)
+
+    if isinstance(value, tuple) and hasattr(value, "_fields"):
+        # namedtuple
+        return type(value)(*(_encode_any(item) for item in value))
+
+    if isinstance(value, (list, tuple)):
+        return type(value)(_encode_any(item) for item in value)
+
+    if isinstance(value, dict):
+        return type(value)(
+            (_encode_any(map_key), _encode_any(map_value))
+            for map_key, map_value in value.items()
+        )
+
+    return copy.deepcopy(value)
+
+
+def _copy_list(value: Any) -> Any:
+    if isinstance(value, Sequence) and (not isinstance(value, (str, bytes))):
+        return list(value)
+
+    return value
+
+
+def _copy_dict(value: Any) -> Any:
+    if isinstance(value, Mapping):
+        return dict(value)
 
     return value
 
 
-def _is_optional(target_type: Type):
+def _is_optional(target_type: Any) -> bool:
     """True if type is Optional"""
-    return hasattr(target_type, "__args__") and (type(None) in target_type.__args__)
+    return (get_origin(target_type) in _UNION_TYPES) and (
+        _NONE_TYPE in get_args(target_type)
+    )
@@ -0,0 +1,52 @@
+"""Add __slots__ to dataclasses (like slots=True in Python 3.10+)."""
+from dataclasses import fields
+from typing import Any, Set, TypeVar
+
+_T = TypeVar("_T")
+
+
+def add_slots(cls: _T) -> _T:
+    """Recreate a dataclass with __slots__ for its own fields.
+
+    Apply after @dataclass. Base classes should also define __slots__, or
+    instances will still have a __dict__.
+
+    Works on Python 3.8+ and only adds slots for fields that aren't already
+    slots in a base class. A __weakref__ slot is added unless a base class
+    already supports weak references.
+    """
+    dataclass_cls: Any = cls
+    if "__slots__" in dataclass_cls.__dict__:
+        raise TypeError(f"{dataclass_cls.__name__} already specifies __slots__")
+
+    inherited_slots: Set[str] = set()
+    for base_cls in dataclass_cls.__mro__[1:]:
+        inherited_slots.update(getattr(base_cls, "__slots__", ()))
+
+    field_names = tuple(
+        field.name
+        for field in fields(dataclass_cls)
+        if field.name not in inherited_slots
+    )
+
+    if not any(base_cls.__weakrefoffset__ for base_cls in dataclass_cls.__bases__):
+        # Keep weak references working
+        field_names += ("__weakref__",)
+
+    cls_dict = dict(dataclass_cls.__dict__)
+    cls_dict["__slots__"] = field_names
+    for field_name in field_names:
+        # Remove default values (already captured in __init__)
+        cls_dict.pop(field_name, None)
+
+    cls_dict.pop("__dict__", None)
+    cls_dict.pop("__weakref__", None)
+
+    qualname = getattr(dataclass_cls, "__qualname__", None)
+    slots_cls = type(dataclass_cls)(
+        dataclass_cls.__name__, dataclass_cls.__bases__, cls_dict
+    )
+    if qualname is not None:
+        slots_cls.__qualname__ = qualname
+
+    return slots_cls
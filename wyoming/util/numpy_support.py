@@ -0,0 +1,18 @@
+"""Optional numpy support."""
+from functools import lru_cache
+from typing import Any, Optional
+
+
+@lru_cache(maxsize=None)
+def get_numpy() -> Optional[Any]:
+    """Get numpy module or None if it's not installed.
+
+    The import is only tried once, so code without numpy doesn't pay for a
+    failed import on every call.
+    """
+    try:
+        import numpy  # pylint: disable=import-outside-toplevel
+    except ImportError:
+        return None
+
+    return numpy
@@ -1,14 +1,25 @@
 """Voice activity detection."""
+import math
 from dataclasses import dataclass
-from typing import Optional
+from typing import List, Optional, Sequence, Tuple, Union
 
+from .audio import AudioChunk, AudioChunkConverter, AudioRechunker
 from .event import Event, Eventable
+from .util.dataclasses_slots import add_slots
+from .util.numpy_support import get_numpy
+
+try:
+    # Use built-in audioop until it's removed in Python 3.13
+    import audioop  # pylint: disable=deprecated-module
+except ImportError:
+    from . import pyaudioop as audioop  # type: ignore[no-redef]
 
 DOMAIN = "vad"
 _STARTED_TYPE = "voice-started"
 _STOPPED_TYPE = "voice-stopped"
 
 
+@add_slots
 @dataclass
 class VoiceStarted(Eventable):
     """User has started speaking."""
@@ -31,6 +42,7 @@ class VoiceStarted(Eventable):
         return VoiceStarted(timestamp=event.data.get("timestamp"))
 
 
+@add_slots
 @dataclass
 class VoiceStopped(Eventable):
     """User has stopped speaking."""
@@ -51,3 +63,203 @@ class VoiceStopped(Eventable):
     @staticmethod
     def from_event(event: Event) -> "VoiceStopped":
         return VoiceStopped(timestamp=event.data.get("timestamp"))
+
+
+# -----------------------------------------------------------------------------
+
+_WIDTH = 2
+_MAX_ENERGY = float(1 << 30)  # (2^15)^2
+_MIN_ENERGY_DB = -100.0
+
+
+class EnergyVad:
+    """Lightweight voice activity detector using frame energy and zero crossings.
+
+    A frame is speech when its energy is threshold_db above an adaptive noise
+    floor (and above min_energy_db), unless its zero-crossing rate is too high
+    for speech (broadband noise like fans or hiss).
+
+    VoiceStarted is emitted after activation_ms of consecutive speech and is
+    timestamped at the start of the speech, minus pre_roll_ms. VoiceStopped
+    is emitted after hangover_ms of non-speech and is timestamped at the end
+    of the last speech frame.
+
+    Pair with an AudioRingBuffer to get the audio since VoiceStarted.
+    """
+
+    def __init__(
+        self,
+        frame_ms: int = 10,
+        threshold_db: float = 9.0,
+        min_energy_db: float = -55.0,
+        max_zero_crossing_rate: float = 0.45,
+        activation_ms: int = 60,
+        hangover_ms: int = 300,
+        pre_roll_ms: int = 0,
+        noise_adapt_ms: int = 1000,
+    ) -> None:
+        if frame_ms < 1:
+            raise ValueError("frame_ms must be at least 1")
+
+        self.frame_ms = frame_ms
+        self.threshold_db = threshold_db
+        self.min_energy_db = min_energy_db
+        self.max_zero_crossing_rate = max_zero_crossing_rate
+        self.pre_roll_ms = pre_roll_ms
+
+        self._activation_frames = max(1, math.ceil(activation_ms / frame_ms))
+        self._hangover_frames = max(1, math.ceil(hangover_ms / frame_ms))
+
+        # Noise floor rises slowly, falls quickly, and barely moves during speech
+        self._noise_rise = min(1.0, frame_ms / max(1, noise_adapt_ms))
+        self._noise_fall = min(1.0, self._noise_rise * 10)
+        self._noise_speech = self._noise_rise / 10
+
+        self._converter = AudioChunkConverter(width=_WIDTH, channels=1)
+        self._rechunker: Optional[AudioRechunker] = None
+        self._rate = 0
+
+        self.noise_floor_db: Optional[float] = None
+        self.is_speech = False
+        self._speech_frames = 0
+        self._speech_start = 0
+        self._silence_frames = 0
+        self._speech_end = 0
+
+    def process(self, chunk: AudioChunk) -> List[Union[VoiceStarted, VoiceStopped]]:
+        """Add audio chunk and return any voice started/stopped events."""
+        chunk = self._converter.convert(chunk)
+        if (self._rechunker is None) or (chunk.rate != self._rate):
+            self._rate = chunk.rate
+            self._rechunker = AudioRechunker(
+                max(1, (chunk.rate * self.frame_ms) // 1000)
+            )
+
+        frames = self._rechunker.process(chunk)
+        if not frames:
+            return []
+
+        events: List[Union[VoiceStarted, VoiceStopped]] = []
+        for frame, (energy_db, zero_crossing_rate) in zip(
+            frames, _get_frame_features([frame.audio for frame in frames])
+        ):
+            event = self._process_frame(
+                frame.timestamp or 0, energy_db, zero_crossing_rate
+            )
+            if event is not None:
+                events.append(event)
+
+        return events
+
+    def flush(self) -> Optional[VoiceStopped]:
+        """End of audio. Returns VoiceStopped if speech was in progress."""
+        voice_stopped: Optional[VoiceStopped] = None
+        if self.is_speech:
+            voice_stopped = VoiceStopped(timestamp=self._speech_end)
+
+        self.reset(keep_noise_floor=True)
+
+        return voice_stopped
+
+    def reset(self, keep_noise_floor: bool = False) -> None:
+        """Reset detector state for a new audio stream."""
+        if self._rechunker is not None:
+            self._rechunker.reset()
+
+        if not keep_noise_floor:
+            self.noise_floor_db = None
+
+        self.is_speech = False
+        self._speech_frames = 0
+        self._silence_frames = 0
+
+    def _process_frame(
+        self, timestamp: int, energy_db: float, zero_crossing_rate: float
+    ) -> Optional[Union[VoiceStarted, VoiceStopped]]:
+        if self.noise_floor_db is None:
+            self.noise_floor_db = energy_db
+
+        is_speech_frame = (
+            (energy_db >= self.min_energy_db)
+            and (energy_db >= (self.noise_floor_db + self.threshold_db))
+            and (zero_crossing_rate <= self.max_zero_crossing_rate)
+        )
+
+        # Adapt noise floor
+        if energy_db < self.noise_floor_db:
+            rate = self._noise_fall
+        elif is_speech_frame:
+            rate = self._noise_speech
+        else:
+            rate = self._noise_rise
+
+        self.noise_floor_db += rate * (energy_db - self.noise_floor_db)
+
+        if is_speech_frame:
+            self._silence_frames = 0
+            self._speech_end = timestamp + self.frame_ms
+            if self._speech_frames == 0:
+                self._speech_start = timestamp
+
+            self._speech_frames += 1
+            if (not self.is_speech) and (
+                self._speech_frames >= self._activation_frames
+            ):
+                self.is_speech = True
+                return VoiceStarted(
+                    timestamp=max(0, self._speech_start - self.pre_roll_ms)
+                )
+
+            return None
+
+        self._speech_frames = 0
+        if self.is_speech:
+            self._silence_frames += 1
+            if self._silence_frames >= self._hangover_frames:
+                self.is_speech = False
+                self._silence_frames = 0
+                return VoiceStopped(timestamp=self._speech_end)
+
+        return None
+
+
+def _get_frame_features(frames: Sequence[bytes]) -> List[Tuple[float, float]]:
+    """Get (energy in dBFS, zero-crossing rate) of equal-size 16-bit mono frames."""
+    np = get_numpy()
+    if np is None:
+        return [_get_features(frame) for frame in frames]
+
+    samples = (
+        np.frombuffer(b"".join(frames), dtype="<i2")
+        .reshape((len(frames), -1))
+        .astype(np.float32)
+    )
+    energy = np.einsum("ij,ij->i", samples, samples) / samples.shape[1]
+    energy_db = 10 * np.log10(
+        np.maximum(energy / _MAX_ENERGY, 10 ** (_MIN_ENERGY_DB / 10))
+    )
+
+    signs = np.signbit(samples)
+    zero_crossing_rate = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1) / max(
+        1, samples.shape[1] - 1
+    )
+
+    return list(zip(energy_db.tolist(), zero_crossing_rate.tolist()))
+
+
+def _get_features(frame: bytes) -> Tuple[float, float]:
+    """Get (energy in dBFS, zero-crossing rate) of a 16-bit mono frame."""
+    rms = audioop.rms(frame, _WIDTH)
+    energy_db = (
+        20 * math.log10(rms / math.sqrt(_MAX_ENERGY)) if rms > 0 else _MIN_ENERGY_DB
+    )
+
+    samples = memoryview(frame).cast("B").cast("h")
+    num_crossings = 0
+    is_negative = samples[0] < 0
+    for sample in samples:
+        if (sample < 0) != is_negative:
+            num_crossings += 1
+            is_negative = not is_negative
+
+    return energy_db, num_crossings / max(1, len(samples) - 1)
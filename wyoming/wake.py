@@ -9,6 +9,7 @@ from typing import List, Optional
 from .audio import AudioChunk, AudioChunkConverter
 from .client import AsyncClient
 from .event import Event, Eventable
+from .util.dataclasses_slots import add_slots
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -18,6 +19,7 @@ _DETECT_TYPE = "detect"
 _NOT_DETECTED_TYPE = "not-detected"
 
 
+@add_slots
 @dataclass
 class Detection(Eventable):
     """Wake word was detected."""
@@ -55,6 +57,7 @@ class Detection(Eventable):
         )
 
 
+@add_slots
 @dataclass
 class Detect(Eventable):
     """Wake word detection request.
@@ -78,6 +81,7 @@ class Detect(Eventable):
         return Detect(names=data.get("names"))
 
 
+@add_slots
 @dataclass
 class NotDetected(Eventable):
     """Audio stream ended before wake word was detected."""